@@ -71,6 +71,15 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # the game upgrades databases on its own connection, see
+    # src.core.db.schema_version
+    connection = config.attributes.get("connection", None)
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
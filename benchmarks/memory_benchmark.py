@@ -0,0 +1,133 @@
+"""
+Memory use of a long headless game.
+
+    python -m benchmarks.memory_benchmark --seasons 30
+    python -m benchmarks.memory_benchmark --expunge-interval 0
+
+Plays the given number of seasons on a fresh database, sampling the
+process RSS and the writer session's identity map size after every season.
+Samples are written as JSON, the run fails (exit code 1) when RSS grows by
+more than --max-growth MB between the first and the last season.
+"""
+
+import argparse
+import gc
+import logging
+from os import makedirs
+from os.path import join
+import resource
+import sys
+
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+from .run_benchmarks import OUTPUT_DIR, SIZES, save_json
+
+
+def rss_mb():
+    """
+    Resident set size of this process in MB, the peak where /proc is not
+    available
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_seasons(
+    seasons: int,
+    size: str = "small",
+    expunge_interval: int | None = 8,
+    output_dir: str = OUTPUT_DIR,
+):
+    """
+    Per season samples of (season, rss MB, identity map size) for a game of
+    *seasons* seasons
+    """
+    makedirs(output_dir, exist_ok=True)
+    engine = WorldStateEngine(
+        db_path=join(output_dir, f"memory_{size}.db"),
+        world_definition=SIZES[size](),
+        expunge_interval=expunge_interval,
+    )
+    samples = []
+    try:
+        while engine.state != WorldState.AwaitingContinue:
+            engine.advance_game()
+
+        for season in range(1, seasons + 1):
+            engine.advance_to_post_season()
+            # post season and new season setup
+            engine.advance_game()
+            engine.advance_game()
+
+            gc.collect()
+            sample = {
+                "season": season,
+                "rss_mb": round(rss_mb(), 1),
+                "identity_map": len(engine.game_worker.worker.session.identity_map),
+            }
+            samples.append(sample)
+            print(
+                f"season {season:3d}  rss {sample['rss_mb']:7.1f} MB  "
+                f"identity map {sample['identity_map']:6d}",
+                flush=True,
+            )
+    finally:
+        engine.game_worker.close()
+    return samples
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Track memory over a long game")
+    parser.add_argument("--seasons", type=int, default=30)
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument(
+        "--expunge-interval",
+        type=int,
+        default=8,
+        help="state transitions between identity map clears, 0 never clears",
+    )
+    parser.add_argument("--output", default=join(OUTPUT_DIR, "memory.json"))
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=None,
+        help="MB of RSS growth from the first to the last season that fails",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    samples = run_seasons(
+        args.seasons, args.size, expunge_interval=args.expunge_interval or None
+    )
+    growth = samples[-1]["rss_mb"] - samples[0]["rss_mb"]
+    save_json(
+        {
+            "size": args.size,
+            "expunge_interval": args.expunge_interval or None,
+            "rss_growth_mb": round(growth, 1),
+            "samples": samples,
+        },
+        args.output,
+    )
+    print(f"RSS growth {growth:.1f} MB, samples written to {args.output}")
+
+    if args.max_growth is not None and growth > args.max_growth:
+        print(f"RSS grew by more than {args.max_growth} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
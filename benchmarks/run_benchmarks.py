@@ -0,0 +1,309 @@
+"""
+Benchmarks of the game's database heavy operations at several world sizes.
+
+    python -m benchmarks.run_benchmarks --sizes small medium
+    python -m benchmarks.run_benchmarks --update-baseline
+
+Each size runs the cases in order against one fresh database: create_db,
+new_season, matchweek, full_season, league_tables, club_analysis,
+club_analysis_rows and rollover. Results are written as JSON and compared with the stored
+baseline, the run fails (exit code 1) when a case is slower than its
+baseline by more than the threshold. --repeat runs each size several
+times keeping each case's fastest time, steadier on a noisy machine.
+
+Baselines are only comparable on the machine that recorded them, refresh
+with --update-baseline after an intended change or on a new machine.
+"""
+
+import argparse
+from datetime import datetime
+import json
+import logging
+from os import makedirs
+from os.path import dirname, join
+import platform
+import sqlite3
+import subprocess
+import sys
+from time import perf_counter
+
+import sqlalchemy
+from sqlalchemy import select
+
+from src.core.db.league_db_functions import get_league_table_data
+from src.core.db.models import ClubDB, LeagueDB
+from src.core.workers.club_worker import ClubAnalysisWorker, analyse_club_squads
+from src.core.world_definition import WorldDefinition
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+BENCHMARKS_DIR = dirname(__file__)
+BASELINE_PATH = join(BENCHMARKS_DIR, "baseline.json")
+OUTPUT_DIR = "var/benchmarks"
+
+# fractional slow down over the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+# differences below this many seconds are timer noise, never regressions
+NOISE_FLOOR = 0.02
+
+# repeats of the quick read only cases, the fastest run is kept
+READ_REPEATS = 3
+# clubs analysed by the club_analysis case
+ANALYSED_CLUBS = 20
+
+SIZES = {
+    "small": WorldDefinition.load,
+    "medium": lambda: WorldDefinition.pyramid_for_clubs(1000),
+    "large": lambda: WorldDefinition.pyramid_for_clubs(5000),
+}
+DEFAULT_SIZES = ["small", "medium"]
+
+
+def timed(funct: callable, repeats: int = 1):
+    """
+    Fastest wall time in seconds of *repeats* calls of *funct*
+    """
+    best = None
+    for _ in range(repeats):
+        start = perf_counter()
+        funct()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def advance_to_first_fixtures(engine: WorldStateEngine):
+    while engine.state != WorldState.ProcessingFixtures:
+        engine.advance_game()
+
+
+def league_tables(engine: WorldStateEngine):
+    worker = engine.game_worker.worker
+    season = worker.get_current_season()
+    worker.get_season_league_standings(season)
+    # the per league ORM table the club and league pages show
+    league = worker.session.scalars(select(LeagueDB).order_by(LeagueDB.id)).first()
+    get_league_table_data(league, season)
+
+
+def club_analysis(engine: WorldStateEngine):
+    worker = engine.game_worker.worker
+    season = worker.get_current_season()
+    clubs = worker.session.scalars(
+        select(ClubDB).order_by(ClubDB.id).limit(ANALYSED_CLUBS)
+    ).all()
+    for club in clubs:
+        ClubAnalysisWorker(club).analyse(season=season)
+
+
+def club_analysis_rows(engine: WorldStateEngine):
+    worker = engine.game_worker.worker
+    club_ids = worker.session.scalars(
+        select(ClubDB.id).order_by(ClubDB.id).limit(ANALYSED_CLUBS)
+    ).all()
+    analyse_club_squads(worker, club_ids)
+
+
+def rollover(engine: WorldStateEngine):
+    engine.game_worker.process_end_of_season()
+    engine.game_worker.do_new_season()
+
+
+def run_size(size: str, output_dir: str = OUTPUT_DIR):
+    """
+    Timings in seconds of every case for the *size* world, the new_season
+    and full_season cases leave the engine ready for the next case
+    """
+    world = SIZES[size]()
+    engine = WorldStateEngine(
+        db_path=join(output_dir, f"bench_{size}.db"), world_definition=world
+    )
+    game_worker = engine.game_worker
+    timings = {"clubs": world.total_clubs, "leagues": world.league_count}
+
+    try:
+        timings["create_db"] = timed(
+            lambda: game_worker.create_new_database(delete_existing=True)
+        )
+        timings["new_season"] = timed(game_worker.do_new_season)
+        engine.state = WorldState.AwaitingContinue
+
+        advance_to_first_fixtures(engine)
+        timings["matchweek"] = timed(engine.advance_to_new_week)
+        timings["full_season"] = timed(engine.advance_to_post_season)
+
+        timings["league_tables"] = timed(
+            lambda: league_tables(engine), repeats=READ_REPEATS
+        )
+        timings["club_analysis"] = timed(
+            lambda: club_analysis(engine), repeats=READ_REPEATS
+        )
+
+        timings["club_analysis_rows"] = timed(
+            lambda: club_analysis_rows(engine), repeats=READ_REPEATS
+        )
+
+        timings["rollover"] = timed(lambda: rollover(engine))
+        engine.state = WorldState.AwaitingContinue
+    finally:
+        game_worker.close()
+    return timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: list[str], repeat: int = 1, output_dir: str = OUTPUT_DIR):
+    makedirs(output_dir, exist_ok=True)
+    results = {}
+    for size in sizes:
+        for run in range(repeat):
+            print(f"Running {size} world ({run + 1}/{repeat})...", flush=True)
+            timings = run_size(size, output_dir)
+            if size in results:
+                timings = {k: min(v, results[size][k]) for k, v in timings.items()}
+            results[size] = timings
+        print(format_timings(size, results[size]), flush=True)
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def format_timings(size: str, timings: dict):
+    cases = "  ".join(
+        f"{k}: {v:.3f}s" for k, v in timings.items() if k not in ("clubs", "leagues")
+    )
+    return f"{size:>6} {timings['clubs']:6d} clubs  {cases}"
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Regressions of *results* against *baseline*, a list of (size, case,
+    baseline seconds, seconds, ratio). Cases missing from either are
+    skipped, sizes whose world changed are not compared.
+    """
+    regressions = []
+    for size, timings in results["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if not base:
+            continue
+        if base.get("clubs") != timings["clubs"]:
+            logging.warning(f"{size} world size changed since the baseline, skipped")
+            continue
+
+        for case, seconds in timings.items():
+            if case in ("clubs", "leagues") or case not in base:
+                continue
+            base_seconds = base[case]
+            ratio = seconds / base_seconds if base_seconds else float("inf")
+            if ratio > 1 + threshold and seconds - base_seconds > NOISE_FLOOR:
+                regressions.append((size, case, base_seconds, seconds, ratio))
+    return regressions
+
+
+def load_json(path: str):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_json(data: dict, path: str):
+    makedirs(dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game benchmarks")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(SIZES),
+        default=DEFAULT_SIZES,
+        help="world sizes to run",
+    )
+    parser.add_argument(
+        "--output",
+        default=join(OUTPUT_DIR, "results.json"),
+        help="path of the JSON results",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="runs of each size, the fastest time of each case is kept",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fractional slow down over the baseline that fails the run",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="merge these results into the baseline instead of comparing",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run_benchmarks(args.sizes, args.repeat)
+    save_json(results, args.output)
+    print(f"Results written to {args.output}")
+
+    baseline = load_json(args.baseline)
+    if args.update_baseline:
+        if baseline:
+            # keep the sizes that were not run this time
+            baseline["results"].update(results["results"])
+            baseline["meta"] = results["meta"]
+        else:
+            baseline = results
+        save_json(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --update-baseline")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for size, case, base_seconds, seconds, ratio in regressions:
+        print(
+            f"REGRESSION {size} {case}: {seconds:.3f}s vs baseline "
+            f"{base_seconds:.3f}s ({ratio:.2f}x)"
+        )
+    if regressions:
+        return 1
+    print(f"No regressions over {args.threshold:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
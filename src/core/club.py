@@ -1,93 +1,281 @@
-CLUB_NAMES = [
-    "Red Lions",
-    "AFC Tigers",
-    "The Eagles",
+from random import Random
+
+
+TOWNS = [
+    "Southampton",
+    "Westham",
+    "Everton",
+    "Fulham",
+    "Brentford",
+    "Luton",
+    "Aston",
+    "Wolverhampton",
+    "Ipswich",
+    "Leicester",
+    "Leeds",
+    "Sheffield",
+    "Nottingham",
+    "Derby",
+    "Coventry",
+    "Stoke",
+    "Sunderland",
+    "Norwich",
+    "Bristol",
+    "Reading",
+    "Oxford",
+    "Cambridge",
+    "Exeter",
+    "Plymouth",
+    "Swindon",
+    "Portsmouth",
+    "Brighton",
+    "Crawley",
+    "Gillingham",
+    "Colchester",
+    "Peterborough",
+    "Northampton",
+    "Lincoln",
+    "Hull",
+    "York",
+    "Bradford",
+    "Huddersfield",
+    "Barnsley",
+    "Rotherham",
+    "Doncaster",
+    "Wigan",
+    "Bolton",
+    "Preston",
+    "Blackpool",
+    "Burnley",
+    "Carlisle",
+    "Newcastle",
+    "Middlesbrough",
+    "Hartlepool",
+    "Darlington",
+    "Chester",
+    "Shrewsbury",
+    "Walsall",
+    "Burton",
+    "Mansfield",
+    "Chesterfield",
+    "Grimsby",
+    "Scunthorpe",
+    "Cheltenham",
+    "Gloucester",
+    "Hereford",
+    "Worcester",
+    "Yeovil",
+    "Torquay",
+    "Bournemouth",
+    "Salisbury",
+    "Maidstone",
+    "Dover",
+    "Margate",
+    "Stevenage",
+    "Watford",
+    "Barnet",
+    "Wycombe",
+    "Milton",
+    "Kettering",
+    "Corby",
+    "Halifax",
+    "Harrogate",
+    "Morecambe",
+    "Accrington",
+]
+
+# components of generated town names, e.g. Ash + ford
+TOWN_PREFIXES = [
+    "Ash",
+    "Black",
+    "Brad",
+    "Bright",
+    "Broad",
+    "Brook",
+    "Burn",
+    "Castle",
+    "Chip",
+    "Clay",
+    "Cold",
+    "Crow",
+    "Dun",
+    "East",
+    "Elm",
+    "Fair",
+    "Fern",
+    "Glen",
+    "Green",
+    "Hart",
+    "Hazel",
+    "High",
+    "Holm",
+    "King",
+    "Lang",
+    "Lee",
+    "Long",
+    "Marl",
+    "Mill",
+    "New",
+    "North",
+    "Oak",
+    "Red",
+    "Rock",
+    "Rose",
+    "Salt",
+    "Sand",
+    "Shep",
+    "South",
+    "Stan",
+    "Stone",
+    "Thorn",
+    "Wake",
+    "Well",
+    "West",
+    "White",
+    "Whit",
+    "Wick",
+    "Wil",
+    "Wind",
+]
+TOWN_SUFFIXES = [
+    "borough",
+    "bridge",
+    "bury",
+    "by",
+    "caster",
+    "combe",
+    "dale",
+    "field",
+    "ford",
+    "gate",
+    "ham",
+    "hampton",
+    "hill",
+    "ley",
+    "minster",
+    "mouth",
+    "pool",
+    "port",
+    "stead",
+    "ton",
+    "well",
+    "wich",
+    "wick",
+    "worth",
+]
+
+CLUB_PREFIXES = ["AFC", "Real", "Sporting", "Racing", "Inter", "Dynamo"]
+CLUB_SUFFIXES = [
+    "Albion",
+    "Athletic",
+    "City",
+    "County",
+    "FC",
+    "Rangers",
+    "Rovers",
+    "Town",
+    "United",
+    "Villa",
+    "Wanderers",
+    "Wednesday",
+]
+NICKNAMES = [
+    "Bullets",
+    "Corsairs",
+    "Defenders",
+    "Eagles",
+    "Elite",
+    "Falcons",
+    "Flyers",
+    "Hawks",
+    "Italics",
+    "Lancers",
+    "Legends",
+    "Lions",
+    "Navigators",
+    "Nobles",
+    "Panthers",
+    "Pilgrims",
+    "Rams",
+    "Ravens",
+    "Saints",
+    "Snipers",
+    "Stags",
+    "Steel",
+    "Strikers",
+    "Surge",
+    "Tigers",
+    "Victors",
+    "Vikings",
+    "Warriors",
     "Wolves",
-    "Black Cats",
-    "White Bulls",
-    "Silverstone",
-    "Dragonflies FC",
-    "Purple Dragons",
-    "Urban Rats",
-    "Hawkshill Rovers",
-    "Mountain Valley",
-    "Riverside",
-    "Forest FC",
-    "Club Dolphins",
-    "The Falcons",
-    "Dark Valley",
-    "The Iguanas",
-    "The Coyotes",
-    "Prairie Dogs FC",
-    "Moongoose United",
-    "The Stallions",
-    "Redwood Rangers",
-    "Trentishoe",
-    "Cedar City FC",
-    "Maple Leafs",
-    "Oakwood Wanderers",
-    "Pine Hill FC",
-    "Birchwood United",
-    "Willowbrook",
-    "Ashford Athletic",
-    "Elm City FC",
-    "Hawthorn Rovers",
-    "Sycamore Stars",
-    "Chestnut Champions",
-    "Poplar FC",
-    "Cypress City",
-    "Magnolia United",
-    "Sequoia Strikers",
-    "Juniper Jets",
-    "Dogwood Dynamos",
-    "Palm Beach FC",
-    "Baobab Battalion",
-    "Acacia Aces",
-    "Eucalyptus Eagles",
-    "Fir Fighters",
-    "Hemlock Heroes",
-    "Larch Legends",
-    "Yew Youth",
-    "Olive Olympians",
-    "Cedarwood Cyclones",
-    "Hickory Hawks",
-    "Tamarack Titans",
-    "Aspen Avengers",
-    "Banyan Bears",
-    "Catalpa Crusaders",
-    "Ginkgo Giants",
-    "City Spartans",
-    "Metro Mariners",
-    "Urban United",
-    "Suburbia SC",
-    "Downtown Dynamos",
-    "Uptown United",
-    "Central City FC",
-    "Boston Devils",
-    "Newcastle Nomads",
-    "Liverpool Legends",
-    "Manchester Mavericks",
-    "Arsenal Attackers",
-    "Chelsea Chargers",
-    "Tottenham Titans",
-    "Brighton Blaze",
-    "Southampton Snipers",
-    "Westham Warriors",
-    "Everton Elite",
-    "Fulham Flyers",
-    "Crystal Palace Panthers",
-    "Brentford Bullets",
-    "Luton Lions",
-    "Aston Villa Victors",
-    "Wolverhampton Wanderers",
-    "Ipswich Italics",
-    "Leicester Legends",
-    "Leeds Lancers",
-    "Sheffield Steel",
-    "Nottingham Nobles",
-    "Derby Defenders",
-    "Coventry Corsairs",
-    "Stoke Strikers",
-    "Sunderland Surge",
-    "Norwich Navigators",
 ]
+
+
+class ClubNameGenerator:
+    """
+    Generates unique club names from component pools: a town, either a
+    fixed one or built from a prefix and suffix, combined with a club
+    suffix, a nickname (preferring one with the town's initial) or a club
+    prefix.
+
+    Names already handed out are kept in a set so every name is unique for
+    the generator, names are deterministic for a given seed.
+    """
+
+    # random attempts for an unused name before falling back to numbering
+    MAX_ATTEMPTS = 20
+
+    def __init__(self, seed: int | None = None, used: set[str] | None = None):
+        self._random = Random(seed)
+        self._used = set(used) if used else set()
+        self._nicknames = {}
+        for nickname in NICKNAMES:
+            self._nicknames.setdefault(nickname[0], []).append(nickname)
+
+    @property
+    def used(self):
+        return self._used
+
+    def _town(self):
+        if self._random.random() < 0.3:
+            return self._random.choice(TOWNS)
+        return self._random.choice(TOWN_PREFIXES) + self._random.choice(TOWN_SUFFIXES)
+
+    def _candidate(self):
+        town = self._town()
+        pattern = self._random.random()
+        if pattern < 0.45:
+            return f"{town} {self._random.choice(CLUB_SUFFIXES)}"
+        if pattern < 0.9:
+            nicknames = self._nicknames.get(town[0])
+            if not nicknames or self._random.random() < 0.25:
+                nicknames = NICKNAMES
+            return f"{town} {self._random.choice(nicknames)}"
+        return f"{self._random.choice(CLUB_PREFIXES)} {town}"
+
+    def _numbered(self, name: str):
+        number = 2
+        while f"{name} {number}" in self._used:
+            number += 1
+        return f"{name} {number}"
+
+    def next_name(self):
+        for _ in range(self.MAX_ATTEMPTS):
+            name = self._candidate()
+            if name not in self._used:
+                break
+        else:
+            name = self._numbered(name)
+        self._used.add(name)
+        return name
+
+    def batch(self, count: int):
+        return [self.next_name() for _ in range(count)]
+
+
+def club_names(count: int, seed: int | None = None):
+    """
+    *count* unique generated club names, the same names for the same seed
+    """
+    return ClubNameGenerator(seed).batch(count)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Future
+import logging
+from queue import Queue
+from threading import Thread, current_thread
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+
+from src.core.world_state_engine import WorldStateEngine
+
+from .models import ClubDB, ContractDB
+from .league_db_functions import get_league_table_rows
+from .utils import create_read_session
+
+
+class GameWorkerThread:
+    """
+    Runs a WorldStateEngine on a dedicated thread, the only thread that
+    uses its database session.
+
+    Requests are queued and run one at a time in order, each returning a
+    concurrent.futures.Future. The coroutine methods wrap those futures so
+    asyncio callers can await them, and callers on other threads (e.g. the
+    GUI) can attach done callbacks instead of blocking.
+    """
+
+    def __init__(
+        self, engine: WorldStateEngine | None = None, name: str = "game-worker"
+    ):
+        self._engine = engine
+        self._requests: Queue = Queue()
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def is_running(self):
+        return self._thread.is_alive()
+
+    def in_worker_thread(self):
+        return current_thread() is self._thread
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            future, funct, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(funct(*args, **kwargs))
+            except BaseException as e:
+                logging.exception(f"Game worker request {funct} failed")
+                future.set_exception(e)
+
+    def submit(self, funct: callable, *args, **kwargs) -> Future:
+        """
+        Queue *funct* to run on the worker thread
+        """
+        future = Future()
+        if self.in_worker_thread():
+            # already on the worker, run now rather than deadlock waiting
+            try:
+                future.set_result(funct(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        if not self.is_running:
+            raise RuntimeError("Game worker thread is stopped")
+        self._requests.put((future, funct, args, kwargs))
+        return future
+
+    def call(self, funct: callable, *args, **kwargs):
+        """
+        Run *funct* on the worker thread and wait for its result
+        """
+        return self.submit(funct, *args, **kwargs).result()
+
+    async def run(self, funct: callable, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(funct, *args, **kwargs))
+
+    def stop(self, wait: bool = True):
+        """
+        Close the engine's session and stop the thread once queued
+        requests are done
+        """
+        if not self.is_running:
+            return
+        self.submit(self._close_engine)
+        self._requests.put(None)
+        if wait and not self.in_worker_thread():
+            self._thread.join()
+
+    def _close_engine(self):
+        if self._engine:
+            self._engine.game_worker.close()
+
+    def _set_engine(self, engine: WorldStateEngine | None):
+        self._close_engine()
+        self._engine = engine
+        return engine
+
+    def set_engine(self, engine: WorldStateEngine | None) -> Future:
+        return self.submit(self._set_engine, engine)
+
+    def _require_engine(self):
+        if self._engine is None:
+            raise RuntimeError("No State Engine")
+        return self._engine
+
+    def _advance_game(self):
+        engine = self._require_engine()
+        engine.advance_game()
+        return engine.state
+
+    def _advance_to_post_season(self):
+        engine = self._require_engine()
+        engine.advance_to_post_season()
+        return engine.state
+
+    def _advance_to_new_week(self):
+        engine = self._require_engine()
+        engine.advance_to_new_week()
+        return engine.state
+
+    def _get_league_table(self, league_id: int, season_id: int | None = None):
+        worker = self._require_engine().game_worker.worker
+        if season_id is None:
+            season_id = worker.get_current_season().id
+        return get_league_table_rows(worker.session, league_id, season_id)
+
+    def _get_club(self, club_id: int):
+        # load into a short lived read session, on the database's shared read
+        # engine, so the returned club is detached and never lazy loads
+        # through the worker's session
+        session = create_read_session(self._require_engine().game_worker.worker.db_path)
+        try:
+            return session.scalars(
+                select(ClubDB)
+                .where(ClubDB.id == club_id)
+                .options(selectinload(ClubDB.contracts).selectinload(ContractDB.person))
+            ).first()
+        finally:
+            session.close()
+
+    async def advance_game(self):
+        return await self.run(self._advance_game)
+
+    async def advance_to_post_season(self):
+        return await self.run(self._advance_to_post_season)
+
+    async def advance_to_new_week(self):
+        return await self.run(self._advance_to_new_week)
+
+    async def get_league_table(self, league_id: int, season_id: int | None = None):
+        """
+        Ranked StandingRow standings of a league, the current season by
+        default
+        """
+        return await self.run(self._get_league_table, league_id, season_id)
+
+    async def get_club(self, club_id: int):
+        """
+        Club with its contracts and contracted people loaded, detached from
+        any session
+        """
+        return await self.run(self._get_club, club_id)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from random import randint, random
+from typing import NamedTuple
+
+
+from sqlalchemy import delete, func, select, update
+
+from src.core.game_types import ContractType
+from src.core.world_time import WEEKS_IN_YEAR
+
+from src.core.db.models import ContractDB, PersonDB, PlayerDB, SeasonDB, WorldDB
+
+
+# Contract expiry dates are absolute game weeks: week 1 of the first season
+# is game week 1, so a contract of N years signed at game week W expires at
+# game week W + N * WEEKS_IN_YEAR.
+
+# players this old or older are released when their contract expires
+RELEASE_AGE = 33
+# chance a younger player's expiring contract is renewed
+RENEWAL_CHANCE = 0.75
+# releases stop at this many contracted players, the rest are renewed
+MIN_SQUAD_SIZE = 11
+
+
+class ContractChanges(NamedTuple):
+    renewed: list[int]
+    released: list[int]
+    # clubs whose squads lost players
+    club_ids: list[int]
+
+
+def contract_length():
+    return WEEKS_IN_YEAR * randint(1, 4)
+
+
+def game_week(session):
+    """
+    Absolute game week of the world's current season and week, 0 before
+    the first season
+    """
+    first_year = select(func.min(SeasonDB.year)).scalar_subquery()
+    row = session.execute(
+        select(SeasonDB.year - first_year, WorldDB.current_week).join(
+            SeasonDB, SeasonDB.id == WorldDB.season_id
+        )
+    ).first()
+    if row is None:
+        return 0
+    seasons_played, week_num = row
+    return seasons_played * WEEKS_IN_YEAR + week_num
+
+
+def due_contracts_select(week: int):
+    """
+    Contracts expiring by game *week*, a range scan of the expiry_date
+    index, as (person_id, club_id, contract_type, age) rows
+    """
+    return (
+        select(
+            ContractDB.person_id,
+            ContractDB.club_id,
+            ContractDB.contract_type,
+            PersonDB.age,
+        )
+        .join(PersonDB, PersonDB.id == ContractDB.person_id)
+        .where(ContractDB.expiry_date <= week)
+        .order_by(ContractDB.expiry_date, ContractDB.person_id)
+    )
+
+
+def free_agents_select():
+    """
+    Players without a contract, as (person_id, position, ability, age) rows
+    """
+    return (
+        select(PlayerDB.person_id, PlayerDB.position, PlayerDB.ability, PersonDB.age)
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .outerjoin(ContractDB, ContractDB.person_id == PlayerDB.person_id)
+        .where(ContractDB.person_id.is_(None))
+        .where(PlayerDB.retired.is_(False))
+    )
+
+
+def _squad_sizes(session, club_ids):
+    return dict(
+        session.execute(
+            select(ContractDB.club_id, func.count(ContractDB.person_id))
+            .where(ContractDB.club_id.in_(club_ids))
+            .where(ContractDB.contract_type == ContractType.Player_Contract)
+            .group_by(ContractDB.club_id)
+        ).all()
+    )
+
+
+def process_expired_contracts(session, week: int):
+    """
+    Renew or release the contracts expiring by game *week* with one bulk
+    update and one bulk delete, left uncommitted in the caller's
+    transaction. Released players lose their contract and join the free
+    agents. Staff contracts are always renewed.
+    """
+    due = session.execute(due_contracts_select(week)).all()
+    if not due:
+        return ContractChanges([], [], [])
+
+    squad_sizes = _squad_sizes(session, {club_id for _, club_id, _, _ in due})
+    renewed, released, club_ids = [], [], set()
+    for person_id, club_id, contract_type, age in due:
+        release = contract_type == ContractType.Player_Contract and (
+            age >= RELEASE_AGE or random() >= RENEWAL_CHANCE
+        )
+        if release and squad_sizes.get(club_id, 0) > MIN_SQUAD_SIZE:
+            squad_sizes[club_id] -= 1
+            released.append(person_id)
+            club_ids.add(club_id)
+        else:
+            renewed.append(person_id)
+
+    if renewed:
+        # bulk update by primary key, one executemany
+        session.execute(
+            update(ContractDB),
+            [
+                {"person_id": person_id, "expiry_date": week + contract_length()}
+                for person_id in renewed
+            ],
+        )
+    if released:
+        session.execute(delete(ContractDB).where(ContractDB.person_id.in_(released)))
+    return ContractChanges(renewed, released, sorted(club_ids))
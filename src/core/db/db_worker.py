@@ -1,9 +1,22 @@
 from __future__ import annotations
 import logging
-from os.path import exists
-from os import mkdir
-from random import shuffle, randint, seed as rnd_seed
-from sqlalchemy import select, desc, asc
+from os.path import exists, dirname
+from os import makedirs
+from random import shuffle, seed as rnd_seed
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    func,
+    case,
+    literal,
+    union_all,
+    desc,
+    asc,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import contains_eager
 
 
 from src.core.utils import random_seed
@@ -15,12 +28,15 @@ from src.core.game_types import (
     ContractType,
     CompetitionType,
     MatchFormation,
+    MatchEventType,
 )
 
 from src.core.world_time import WEEKS_IN_YEAR
 
 from src.core.ability import random_ability
-from src.core.club import CLUB_NAMES
+from src.core.player_development import initial_potentials
+from src.core.club import club_names
+from src.core.world_definition import WorldDefinition
 from src.core.people import PersonFactory
 from src.core.db.models import (
     WeekDB,
@@ -38,28 +54,62 @@ from src.core.db.models import (
     FixtureDB,
     ResultDB,
     WorldDB,
+    MatchEventDB,
+    MatchEventSummaryDB,
+    PlayerSeasonStatsDB,
+    club_fixtures_select,
+    club_results_select,
 )
 
 
 from src.core.utils import timer
 
+from .contract_db_functions import (
+    contract_length,
+    game_week,
+    process_expired_contracts,
+)
+from .development_db_functions import develop_players
+from .transfer_db_functions import run_transfer_window
+from .youth_db_functions import youth_intake
+from .staff_db_functions import club_modifiers, update_club_modifiers
 from .league_db_functions import (
-    league_30_fixtures,
     create_league_fixtures,
-    get_league_table_data,
+    league_fixture_weeks,
+    league_standings_select,
+)
+from .read_models import (
+    fixture_rows,
+    fixture_rows_select,
+    squad_rows,
+    squad_rows_select,
+    standing_rows,
 )
-from .utils import create_session, create_tables
+from .utils import create_session, create_read_session, create_tables, insert_people
 
 
 class DatabaseWorker:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_only: bool = False):
         self._db_path = db_path
+        # read only workers use the shared read engine and cannot write
+        self._read_only = read_only
         self._session = None
 
+    @property
+    def db_path(self):
+        return self._db_path
+
+    @property
+    def read_only(self):
+        return self._read_only
+
     @property
     def session(self):
         if self._session is None:
-            self._session = create_session(self._db_path)
+            if self._read_only:
+                self._session = create_read_session(self._db_path)
+            else:
+                self._session = create_session(self._db_path)
         return self._session
 
     def close_session(self):
@@ -67,6 +117,14 @@ class DatabaseWorker:
             self._session.close()
             self._session = None
 
+    def refresh(self):
+        """
+        End the current read transaction so the next query sees the latest
+        commit, loaded objects are expired and reload on access
+        """
+        if self._session:
+            self._session.rollback()
+
     def get_seasons(self):
         return self.session.scalars(select(SeasonDB).order_by(asc(SeasonDB.year))).all()
 
@@ -95,6 +153,46 @@ class DatabaseWorker:
             world.current_week += 1
             self.session.commit()
 
+    def get_game_week(self):
+        return game_week(self.session)
+
+    def process_expired_contracts(self):
+        """
+        Renew or release the contracts due this week, uncommitted
+        """
+        return process_expired_contracts(self.session, self.get_game_week())
+
+    def develop_players(self):
+        """
+        End of season ability changes and retirements, uncommitted
+        """
+        return develop_players(self.session)
+
+    def youth_intake(self):
+        """
+        Every club's new youth players with their contracts, uncommitted
+        """
+        return youth_intake(self.session, self.get_game_week())
+
+    def run_transfer_window(self):
+        """
+        Fill every club's squad gaps from free agents and other clubs'
+        surplus players, uncommitted
+        """
+        return run_transfer_window(self.session, self.get_game_week())
+
+    def update_club_modifiers(self):
+        """
+        Aggregate every club's staff into its modifiers, uncommitted
+        """
+        return update_club_modifiers(self.session, self.get_game_week())
+
+    def get_club_modifiers(self, club_ids):
+        """
+        Precomputed staff modifiers as {club_id: ClubModifiers}
+        """
+        return club_modifiers(self.session, club_ids)
+
     def get_clubs(self):
         return self.session.scalars(select(ClubDB)).all()
 
@@ -156,22 +254,89 @@ class DatabaseWorker:
                 select(FixtureDB)
                 .where(FixtureDB.season_id == world.season_id)
                 .where(FixtureDB.season_week == world.current_week)
-                .where(FixtureDB.result == None)
+                .where(FixtureDB.played == False)
             ).all()
         return []
 
     def get_results_for_current_week(self):
         world = self.get_world()
         if world:
-            fixtures = self.session.scalars(
-                select(FixtureDB)
+            return self.session.scalars(
+                select(ResultDB)
+                .join(ResultDB.fixture)
+                .options(contains_eager(ResultDB.fixture))
                 .where(FixtureDB.season_id == world.season_id)
                 .where(FixtureDB.season_week == world.current_week)
-                .where(FixtureDB.result != None)
+                .where(FixtureDB.played == True)
             ).all()
-            return [f.result for f in fixtures]
         return []
 
+    def get_current_week_fixture_rows(self, played: bool | None = False):
+        """
+        The current week's fixtures as FixtureRow read models, unplayed ones
+        by default
+        """
+        world = self.get_world()
+        if world:
+            return fixture_rows(
+                self.session,
+                fixture_rows_select(world.season_id, world.current_week, played),
+            )
+        return []
+
+    def current_week_fixture_rows_select(self, played: bool | None = None):
+        """
+        Statement for the current week's fixtures as plain rows of (id,
+        short_name, competition_round, home_club, home_score, away_score,
+        away_club, played) in a stable order, for paging through with
+        limit/offset. *played* filters fixtures or results, None is both.
+        The columns are picked from fixture_rows_select so the joins and
+        ordering are shared with the FixtureRow read models.
+        """
+        world = self.get_world()
+        stmt = fixture_rows_select(
+            world.season_id if world else None,
+            world.current_week if world else None,
+            played,
+        )
+        columns = stmt.selected_columns
+        return stmt.with_only_columns(
+            columns.id,
+            columns.competition,
+            columns.competition_round,
+            columns.home_club,
+            columns.home_score,
+            columns.away_score,
+            columns.away_club,
+            columns.played,
+        )
+
+    def club_rows_select(self):
+        """
+        Statement for (id, name) of every club ordered by id
+        """
+        return select(ClubDB.id, ClubDB.name).order_by(asc(ClubDB.id))
+
+    def club_fixtures(
+        self,
+        club_id: int,
+        season_id: int | None = None,
+        competition_id: int | None = None,
+    ):
+        return self.session.scalars(
+            club_fixtures_select(club_id, season_id, competition_id)
+        ).all()
+
+    def club_results(
+        self,
+        club_id: int,
+        season_id: int | None = None,
+        competition_id: int | None = None,
+    ):
+        return self.session.scalars(
+            club_results_select(club_id, season_id, competition_id)
+        ).all()
+
     def get_clubs_not_in_leagues_for_season(self, season: SeasonDB | None = None):
         season = season or self.get_current_season()
         league_ids = self.session.scalars(select(LeagueDB.id)).all()
@@ -199,42 +364,91 @@ class DatabaseWorker:
         ).all()
         return registrations
 
-    def get_next_season_league_registrations(self):
-        promoted_count = 3
-        relegated_count = 3
-        current_season = self.get_current_season()
-        all_leagues = self.get_leagues_from_competitions()
-
-        changes = dict()
-        for ix, league in enumerate(all_leagues):
-            league_data = get_league_table_data(league, current_season)
-            if ix > 0:
-                # Promote from league
-                for p in league_data[0:promoted_count]:
-                    changes[p["club"].id] = all_leagues[ix - 1].id
+    def get_league_groups(self):
+        return self.session.scalars(select(LeagueGroupDB)).all()
 
-            # Relegate from league
-            league_below = all_leagues[ix + 1] if ix < len(all_leagues) - 1 else None
+    def get_league_group_standings(self, league_group: LeagueGroupDB, season: SeasonDB):
+        league_ids = [lg.id for lg in league_group.leagues]
+        return self.session.execute(
+            league_standings_select(season.id, league_ids)
+        ).all()
 
-            for r in league_data[-relegated_count:]:
-                changes[r["club"].id] = league_below.id if league_below else None
+    def get_season_league_standings(self, season: SeasonDB):
+        """
+        Standings of every league for *season* from a single ranked query,
+        grouped by competition id
+        """
+        league_ids = self.session.scalars(select(LeagueDB.id)).all()
+        standings = {}
+        for row in standing_rows(
+            self.session, league_standings_select(season.id, league_ids)
+        ):
+            standings.setdefault(row.competition_id, []).append(row)
+        return standings
+
+    def get_non_league_club_ids(self, season: SeasonDB):
+        """
+        Ids of clubs not registered in any league for *season* grouped by
+        their league group id. Clubs from saves created before league
+        groups were assigned are under None.
+        """
+        club_ids = {}
+        for club_id, league_group_id in self.session.execute(
+            select(ClubDB.id, ClubDB.league_group_id).where(
+                ~ClubDB.id.in_(
+                    select(CompetitionRegisterDB.club_id)
+                    .where(CompetitionRegisterDB.season_id == season.id)
+                    .where(
+                        CompetitionRegisterDB.competition_id.in_(select(LeagueDB.id))
+                    )
+                )
+            )
+        ):
+            club_ids.setdefault(league_group_id, []).append(club_id)
+        return club_ids
 
-            if league_below is None:
-                new_clubs = self.get_clubs_not_in_leagues_for_season()
-                shuffle(new_clubs)
-                for p in new_clubs[0:promoted_count]:
-                    changes[p.id] = league.id
+    def get_next_season_league_registrations(self):
+        """
+        Next season's (club_id, league_id) registrations after promotion and
+        relegation, worked out from one ranked standings query for all
+        leagues using each league's promotion and relegation places. Clubs
+        relegated from a group's bottom league drop out and are replaced by
+        the group's clubs not currently in a league.
+        """
+        current_season = self.get_current_season()
+        standings = self.get_season_league_standings(current_season)
+        non_league_ids = self.get_non_league_club_ids(current_season)
+        ungrouped_ids = non_league_ids.get(None, [])
+        shuffle(ungrouped_ids)
 
         new_registrations = []
-        for club_id, new_league_id in changes.items():
-            if new_league_id is not None:
-                new_registrations.append((club_id, new_league_id))
+        for league_group in self.get_league_groups():
+            leagues = sorted(league_group.leagues, key=lambda lg: lg.league_ranking)
+            if not leagues:
+                continue
+
+            for ix, league in enumerate(leagues):
+                for row in standings.get(league.id, []):
+                    if ix > 0 and row.position <= league.promotion_places:
+                        new_league_id = leagues[ix - 1].id
+                    elif row.position > row.league_size - league.relegation_places:
+                        new_league_id = (
+                            leagues[ix + 1].id if ix < len(leagues) - 1 else None
+                        )
+                    else:
+                        new_league_id = row.competition_id
+
+                    if new_league_id is not None:
+                        new_registrations.append((row.club_id, new_league_id))
+
+            new_club_ids = list(non_league_ids.get(league_group.id, []))
+            shuffle(new_club_ids)
+            new_club_ids += ungrouped_ids
+            for club_id in new_club_ids[: leagues[-1].relegation_places]:
+                if club_id in ungrouped_ids:
+                    ungrouped_ids.remove(club_id)
+                new_registrations.append((club_id, leagues[-1].id))
 
-        for reg in self.get_league_registrations_for_current_season():
-            if reg.club_id in changes.keys():
-                pass
-            else:
-                new_registrations.append((reg.club_id, reg.competition_id))
         return new_registrations
 
     @timer
@@ -248,21 +462,322 @@ class DatabaseWorker:
         self.session.commit()
         return new_season
 
+    @staticmethod
+    def _set_fixture_result(fixture, score):
+        fixture.played = True
+        fixture.home_score, fixture.away_score = score
+        # attach the fixture so the result stays readable once detached
+        return ResultDB(
+            id=fixture.id, home_score=score[0], away_score=score[1], fixture=fixture
+        )
+
     def add_result(self, fixture, score):
-        result = ResultDB(id=fixture.id, home_score=score[0], away_score=score[1])
+        result = self._set_fixture_result(fixture, score)
         self.session.add(result)
         self.session.commit()
         return result
 
     def add_results(self, fixtures_and_scores):
         all_results = [
-            ResultDB(id=fs[0].id, home_score=fs[1][0], away_score=fs[1][1])
-            for fs in fixtures_and_scores
+            self._set_fixture_result(fixture, score)
+            for fixture, score in fixtures_and_scores
         ]
         self.session.add_all(all_results)
         self.session.commit()
         return all_results
 
+    def get_club_squads(self, club_ids):
+        """
+        Squads for the given clubs as {club_id: [(person_id, position, ability)]}
+        read as plain column tuples
+        """
+        squads = {club_id: [] for club_id in club_ids}
+        rows = self.session.execute(
+            select(
+                ContractDB.club_id,
+                PlayerDB.person_id,
+                PlayerDB.position,
+                PlayerDB.ability,
+            )
+            .join(PlayerDB, PlayerDB.person_id == ContractDB.person_id)
+            .where(ContractDB.club_id.in_(club_ids))
+        ).all()
+        for club_id, person_id, position, ability in rows:
+            squads[club_id].append((person_id, position, ability))
+        return squads
+
+    def get_squad_rows(self, club_ids):
+        """
+        Contracted players of the given clubs as SquadPlayerRow read models,
+        {club_id: [SquadPlayerRow]}
+        """
+        squads = {club_id: [] for club_id in club_ids}
+        for row in squad_rows(self.session, squad_rows_select(club_ids)):
+            squads[row.club_id].append(row)
+        return squads
+
+    def get_club_formations(self, club_ids):
+        """
+        Preferred formation of each club's manager as {club_id: MatchFormation}
+        """
+        rows = self.session.execute(
+            select(ContractDB.club_id, StaffDB.prefered_formation)
+            .join(StaffDB, StaffDB.person_id == ContractDB.person_id)
+            .where(StaffDB.role == StaffRole.Manager)
+            .where(ContractDB.club_id.in_(club_ids))
+        ).all()
+        return {club_id: formation for club_id, formation in rows}
+
+    def add_match_events(self, events):
+        """
+        Bulk insert match events, a list of dicts keyed by MatchEventDB columns,
+        as a single executemany
+        """
+        if events:
+            self.session.execute(insert(MatchEventDB), events)
+            self._upsert_player_season_stats(events)
+            self.session.commit()
+        return len(events)
+
+    def _upsert_player_season_stats(self, events):
+        totals = dict()
+        for e in events:
+            key = (e["person_id"], e["season_id"], e["competition_id"])
+            row = totals.get(key)
+            if row is None:
+                row = totals[key] = {
+                    "person_id": e["person_id"],
+                    "season_id": e["season_id"],
+                    "competition_id": e["competition_id"],
+                    "club_id": e["club_id"],
+                    "appearances": 0,
+                    "goals": 0,
+                    "assists": 0,
+                    "rating_total": 0,
+                }
+            if e["event_type"] == MatchEventType.Appearance.value:
+                row["appearances"] += 1
+                row["rating_total"] += e["value"] or 0
+            elif e["event_type"] == MatchEventType.Goal.value:
+                row["goals"] += 1
+            elif e["event_type"] == MatchEventType.Assist.value:
+                row["assists"] += 1
+
+        stmt = sqlite_insert(PlayerSeasonStatsDB)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["person_id", "season_id", "competition_id"],
+            set_={
+                "club_id": stmt.excluded.club_id,
+                "appearances": PlayerSeasonStatsDB.appearances
+                + stmt.excluded.appearances,
+                "goals": PlayerSeasonStatsDB.goals + stmt.excluded.goals,
+                "assists": PlayerSeasonStatsDB.assists + stmt.excluded.assists,
+                "rating_total": PlayerSeasonStatsDB.rating_total
+                + stmt.excluded.rating_total,
+            },
+        )
+        self.session.execute(stmt, list(totals.values()))
+
+    def get_fixture_events(self, fixture_id: int):
+        return self.session.execute(
+            select(
+                MatchEventDB.event_type,
+                MatchEventDB.minute,
+                MatchEventDB.club_id,
+                MatchEventDB.person_id,
+                MatchEventDB.value,
+            )
+            .where(MatchEventDB.fixture_id == fixture_id)
+            .order_by(MatchEventDB.minute, MatchEventDB.id)
+        ).all()
+
+    def get_player_season_events(self, person_id: int, season_id: int):
+        return self.session.execute(
+            select(
+                MatchEventDB.fixture_id,
+                MatchEventDB.competition_id,
+                MatchEventDB.event_type,
+                MatchEventDB.minute,
+                MatchEventDB.value,
+            )
+            .where(MatchEventDB.person_id == person_id)
+            .where(MatchEventDB.season_id == season_id)
+            .order_by(MatchEventDB.fixture_id, MatchEventDB.minute)
+        ).all()
+
+    def get_top_scorers(self, season_id: int, competition_id: int, limit: int = 10):
+        return self.session.scalars(
+            select(PlayerSeasonStatsDB)
+            .where(PlayerSeasonStatsDB.season_id == season_id)
+            .where(PlayerSeasonStatsDB.competition_id == competition_id)
+            .order_by(
+                desc(PlayerSeasonStatsDB.goals), asc(PlayerSeasonStatsDB.person_id)
+            )
+            .limit(limit)
+        ).all()
+
+    def get_club_player_stats(self, club_id: int, season_id: int):
+        return self.session.scalars(
+            select(PlayerSeasonStatsDB)
+            .where(PlayerSeasonStatsDB.club_id == club_id)
+            .where(PlayerSeasonStatsDB.season_id == season_id)
+        ).all()
+
+    def _player_season_stats_from_events(self, season_id: int | None = None):
+        """
+        Aggregate player_season_stats rows from the raw match events plus the
+        summaries of any pruned seasons
+        """
+        events = select(
+            MatchEventDB.person_id,
+            MatchEventDB.season_id,
+            MatchEventDB.competition_id,
+            MatchEventDB.club_id,
+            MatchEventDB.event_type,
+            literal(1).label("count"),
+            func.coalesce(MatchEventDB.value, 0).label("value_total"),
+        )
+        summaries = select(
+            MatchEventSummaryDB.person_id,
+            MatchEventSummaryDB.season_id,
+            MatchEventSummaryDB.competition_id,
+            MatchEventSummaryDB.club_id,
+            MatchEventSummaryDB.event_type,
+            MatchEventSummaryDB.count,
+            MatchEventSummaryDB.value_total,
+        )
+        if season_id is not None:
+            events = events.where(MatchEventDB.season_id == season_id)
+            summaries = summaries.where(MatchEventSummaryDB.season_id == season_id)
+        src = union_all(events, summaries).subquery()
+
+        def total(event_type, column):
+            return func.sum(
+                case((src.c.event_type == event_type.value, column), else_=0)
+            )
+
+        return select(
+            src.c.person_id,
+            src.c.season_id,
+            src.c.competition_id,
+            # club_id is not part of the consistency check, rebuilt rows keep
+            # the highest club id if a player appeared for more than one club
+            func.max(src.c.club_id).label("club_id"),
+            total(MatchEventType.Appearance, src.c.count).label("appearances"),
+            total(MatchEventType.Goal, src.c.count).label("goals"),
+            total(MatchEventType.Assist, src.c.count).label("assists"),
+            total(MatchEventType.Appearance, src.c.value_total).label("rating_total"),
+        ).group_by(src.c.person_id, src.c.season_id, src.c.competition_id)
+
+    @timer
+    def rebuild_player_season_stats(self, season_id: int | None = None):
+        """
+        Replace player_season_stats with aggregates rebuilt from match events
+        """
+        stmt = delete(PlayerSeasonStatsDB)
+        if season_id is not None:
+            stmt = stmt.where(PlayerSeasonStatsDB.season_id == season_id)
+        self.session.execute(stmt)
+        self.session.execute(
+            insert(PlayerSeasonStatsDB).from_select(
+                [
+                    "person_id",
+                    "season_id",
+                    "competition_id",
+                    "club_id",
+                    "appearances",
+                    "goals",
+                    "assists",
+                    "rating_total",
+                ],
+                self._player_season_stats_from_events(season_id),
+            )
+        )
+        self.session.commit()
+        self.session.expire_all()
+
+    def check_player_season_stats(self, season_id: int | None = None):
+        """
+        Compare player_season_stats against the match events, returns the
+        (person_id, season_id, competition_id) keys that do not match
+        """
+        columns = ["appearances", "goals", "assists", "rating_total"]
+        expected = {
+            (r.person_id, r.season_id, r.competition_id): tuple(
+                getattr(r, c) for c in columns
+            )
+            for r in self.session.execute(
+                self._player_season_stats_from_events(season_id)
+            )
+        }
+        stmt = select(
+            PlayerSeasonStatsDB.person_id,
+            PlayerSeasonStatsDB.season_id,
+            PlayerSeasonStatsDB.competition_id,
+            *[getattr(PlayerSeasonStatsDB, c) for c in columns],
+        )
+        if season_id is not None:
+            stmt = stmt.where(PlayerSeasonStatsDB.season_id == season_id)
+        actual = {tuple(r[:3]): tuple(r[3:]) for r in self.session.execute(stmt)}
+
+        return sorted(
+            key
+            for key in expected.keys() | actual.keys()
+            if expected.get(key) != actual.get(key)
+        )
+
+    @timer
+    def prune_match_events(self, keep_seasons: int):
+        """
+        Summarise and delete the match events of all but the latest
+        *keep_seasons* seasons
+        """
+        season_ids = self.session.scalars(
+            select(SeasonDB.id).order_by(desc(SeasonDB.year)).offset(keep_seasons)
+        ).all()
+        if not season_ids:
+            return 0
+
+        summary = (
+            select(
+                MatchEventDB.season_id,
+                MatchEventDB.competition_id,
+                MatchEventDB.person_id,
+                MatchEventDB.club_id,
+                MatchEventDB.event_type,
+                func.count(),
+                func.coalesce(func.sum(MatchEventDB.value), 0),
+            )
+            .where(MatchEventDB.season_id.in_(season_ids))
+            .group_by(
+                MatchEventDB.season_id,
+                MatchEventDB.competition_id,
+                MatchEventDB.person_id,
+                MatchEventDB.club_id,
+                MatchEventDB.event_type,
+            )
+        )
+        self.session.execute(
+            insert(MatchEventSummaryDB).from_select(
+                [
+                    "season_id",
+                    "competition_id",
+                    "person_id",
+                    "club_id",
+                    "event_type",
+                    "count",
+                    "value_total",
+                ],
+                summary,
+            )
+        )
+        removed = self.session.execute(
+            delete(MatchEventDB).where(MatchEventDB.season_id.in_(season_ids))
+        ).rowcount
+        self.session.commit()
+        logging.info(f"Pruned {removed} match events from {len(season_ids)} seasons")
+        return removed
+
     # @timer
     def do_post_season_setup(self):
         logging.info("Post Season Setup...")
@@ -273,44 +788,47 @@ class DatabaseWorker:
             # new season set up
             next_season_registrations = self.get_next_season_league_registrations()
         else:
-            # First season set up
+            # First season set up, fill each group's leagues from its clubs
             do_age_increase = False
-            club_copy = list(self.get_clubs())
-            shuffle(club_copy)
-
             next_season_registrations = []
-            for league in self.get_leagues():
-                for _ in range(league.required_teams):
-                    next_season_registrations.append((club_copy.pop(0).id, league.id))
+            for league_group in self.get_league_groups():
+                club_ids = list(
+                    self.session.scalars(
+                        select(ClubDB.id).where(
+                            ClubDB.league_group_id == league_group.id
+                        )
+                    ).all()
+                )
+                shuffle(club_ids)
+                for league in sorted(
+                    league_group.leagues, key=lambda lg: lg.league_ranking
+                ):
+                    for _ in range(league.required_teams):
+                        next_season_registrations.append((club_ids.pop(), league.id))
 
         # create next season
         next_season = self.create_next_season()
 
-        new_regs = list()
-        for reg in next_season_registrations:
-            if reg[1] is None:
-                continue
-            new_regs.append(
-                CompetitionRegisterDB(
-                    season_id=next_season.id,
-                    competition_id=reg[1],
-                    club_id=reg[0],
-                )
-            )
-
+        new_regs = [
+            {
+                "season_id": next_season.id,
+                "competition_id": league_id,
+                "club_id": club_id,
+            }
+            for club_id, league_id in next_season_registrations
+            if league_id is not None
+        ]
         if new_regs:
-            self.session.add_all(new_regs)
+            self.session.execute(insert(CompetitionRegisterDB), new_regs)
             self.session.commit()
 
-        # self.session.flush()
-
         self.close_session()
 
-        clubs_for_cup = []
-        for lg in self.get_leagues():
-            lg_clubs = lg.get_clubs_for_season(next_season)
-            logging.info(f"adding {lg.required_teams} from {lg.name} for Cups # teams = {len(lg_clubs)}")
-            clubs_for_cup = clubs_for_cup + lg_clubs
+        clubs_for_cup = self.session.scalars(
+            select(CompetitionRegisterDB.club_id)
+            .where(CompetitionRegisterDB.season_id == next_season.id)
+            .where(CompetitionRegisterDB.competition_id.in_(select(LeagueDB.id)))
+        ).all()
 
         if clubs_for_cup:
             logging.info(f"Do cup registration #teams: {len(clubs_for_cup)}")
@@ -318,22 +836,22 @@ class DatabaseWorker:
             for cup in self.get_cups():
                 club_copy = list(clubs_for_cup)
                 shuffle(club_copy)
-
-                for club in club_copy:
-                    reg = CompetitionRegisterDB(
-                        season_id=next_season.id, competition_id=cup.id, club_id=club.id
-                    )
-                    cup_regs.append(reg)
+                cup_regs.extend(
+                    {
+                        "season_id": next_season.id,
+                        "competition_id": cup.id,
+                        "club_id": club_id,
+                    }
+                    for club_id in club_copy
+                )
 
             if cup_regs:
-                self.session.add_all(cup_regs)
+                self.session.execute(insert(CompetitionRegisterDB), cup_regs)
                 self.session.commit()
 
         if do_age_increase:
             logging.info("Processing age increase...")
-            people = self.get_people()
-            for p in people:
-                p.age += 1
+            self.session.execute(update(PersonDB).values(age=PersonDB.age + 1))
             self.session.commit()
 
 
@@ -350,37 +868,39 @@ class DatabaseWorker:
         else:
             raise RuntimeError(f"Expected World({world}) and season({current_season})")
 
-        # get all leagues
-        for league in self.session.scalars(select(LeagueDB)).all():
-            logging.info(f"Create fixtures for {league}")
-
-            # get registered teams
-            league_clubs = league.get_clubs_for_season(season=current_season)
-
-            fixtures = create_league_fixtures(league_clubs, True)
-            fixture_objects = []
+        league_clubs = {}
+        for competition_id, club_id in self.session.execute(
+            select(CompetitionRegisterDB.competition_id, CompetitionRegisterDB.club_id)
+            .where(CompetitionRegisterDB.season_id == current_season.id)
+            .where(CompetitionRegisterDB.competition_id.in_(select(LeagueDB.id)))
+            .order_by(asc(CompetitionRegisterDB.id))
+        ):
+            league_clubs.setdefault(competition_id, []).append(club_id)
+
+        fixture_rows = []
+        for league_id, club_ids in league_clubs.items():
+            fixtures = create_league_fixtures(club_ids, True)
+            weeks = league_fixture_weeks(len(fixtures))
             for ix, r_fixtures in enumerate(fixtures):
                 for f in r_fixtures:
-                    fixture = FixtureDB(
-                        home_club_id=f[1].id,
-                        away_club_id=f[2].id,
-                        competition_id=league.id,
-                        competition_round=f[0],
-                        season_id=current_season.id,
-                        season_week=league_30_fixtures[ix],
+                    fixture_rows.append(
+                        {
+                            "home_club_id": f[1],
+                            "away_club_id": f[2],
+                            "competition_id": league_id,
+                            "competition_round": f[0],
+                            "season_id": current_season.id,
+                            "season_week": weeks[ix],
+                        }
                     )
-                    fixture_objects.append(fixture)
 
-            self.session.add_all(fixture_objects)
+        if fixture_rows:
+            self.session.execute(insert(FixtureDB), fixture_rows)
             self.session.commit()
 
-            logging.info(
-                f"#Num Rounds {len(fixtures)} #Num Fixtures: {sum([len(f) for f in fixtures])}"
-            )
-
-
-def contract_expiry():
-    return WEEKS_IN_YEAR * randint(1, 4)
+        logging.info(
+            f"#Num Leagues {len(league_clubs)} #Num Fixtures: {len(fixture_rows)}"
+        )
 
 
 class DatabaseCreator(DatabaseWorker):
@@ -388,10 +908,20 @@ class DatabaseCreator(DatabaseWorker):
     Database setup worker
     """
 
-    def __init__(self, db_path: str, delete_existing: bool = True):
+    def __init__(
+        self,
+        db_path: str,
+        delete_existing: bool = True,
+        world_definition: WorldDefinition | None = None,
+    ):
         super().__init__(db_path=db_path)
         self._delete_existsing = delete_existing
         self._game_seed = random_seed()
+        self._world_definition = world_definition or WorldDefinition.load()
+
+    @property
+    def world_definition(self):
+        return self._world_definition
 
     def _pre_populate_db(self):
         logging.info("Pre-populate DB with static data")
@@ -421,8 +951,9 @@ class DatabaseCreator(DatabaseWorker):
         logging.info(
             f"Create New Database '{self._db_path}', delete existing: {self._delete_existsing}, seed:{hex(self._game_seed)}"
         )
-        if not exists("var/"):
-            mkdir("var/")
+        db_dir = dirname(self._db_path)
+        if db_dir and not exists(db_dir):
+            makedirs(db_dir)
         create_tables(self._db_path, self._delete_existsing)
 
         self._pre_populate_db()
@@ -439,6 +970,7 @@ class DatabaseCreator(DatabaseWorker):
         num_players = self._create_players(num_clubs=num_clubs)
         num_staff_reg = self._allocate_staff()
         num_player_reg = self._allocate_players()
+        self.update_club_modifiers()
 
         self.do_post_season_setup()
         comp_reg = len(self.get_compition_registrations(self.get_current_season()))
@@ -449,47 +981,64 @@ class DatabaseCreator(DatabaseWorker):
             f", # Comp Reg: {comp_reg}"
         )
 
+    def _count(self, stmt):
+        return self.session.scalar(select(func.count()).select_from(stmt.subquery()))
+
     @timer
     def _create_db_clubs(self):
-        names = list(CLUB_NAMES)
-        logging.info(f"Creating {len(CLUB_NAMES)} clubs")
+        definition = self.world_definition
+        names = club_names(definition.total_clubs, seed=self._game_seed)
+        logging.info(f"Creating {len(names)} clubs")
 
         shuffle(names)
-        clubs = [ClubDB(name=name) for name in names]
-        self.session.add_all(clubs)
+        league_groups = self.session.scalars(
+            select(LeagueGroupDB).order_by(asc(LeagueGroupDB.id))
+        ).all()
+        clubs = []
+        for league_group, group_def in zip(league_groups, definition.league_groups):
+            for _ in range(group_def.total_clubs):
+                clubs.append({"name": names.pop(), "league_group_id": league_group.id})
+        self.session.execute(insert(ClubDB), clubs)
         self.session.commit()
 
-        return len(self.session.scalars(select(ClubDB)).all())
+        return self._count(select(ClubDB.id))
 
     @timer
     def _create_db_competitions(self):
-        logging.info("Creating competitions")
-
-        league_group = LeagueGroupDB(name="Test FA")
-        self.session.add(league_group)
-        self.session.commit()
-
-        self.session.add(
-            LeagueDB(
-                name="Premier League",
-                short_name="PL",
-                league_group_id=league_group.id,
-                league_ranking=1,
-                required_teams=16,
-            )
+        definition = self.world_definition
+        logging.info(
+            f"Creating competitions for '{definition.name}': "
+            f"{len(definition.league_groups)} league groups, "
+            f"{definition.league_count} leagues, {len(definition.cups)} cups"
         )
-        self.session.add(
-            LeagueDB(
-                name="Championship",
-                short_name="CH",
-                league_group_id=league_group.id,
-                league_ranking=2,
-                required_teams=16,
+
+        for group_def in definition.league_groups:
+            league_group = LeagueGroupDB(name=group_def.name)
+            self.session.add(league_group)
+            self.session.flush()
+
+            self.session.add_all(
+                [
+                    LeagueDB(
+                        name=league_def.name,
+                        short_name=league_def.short_name,
+                        league_group_id=league_group.id,
+                        league_ranking=ix + 1,
+                        required_teams=league_def.teams,
+                        promotion_places=league_def.promotion_places,
+                        relegation_places=league_def.relegation_places,
+                    )
+                    for ix, league_def in enumerate(group_def.leagues)
+                ]
             )
+        self.session.add_all(
+            [CupDB(name=cup.name, short_name=cup.short_name) for cup in definition.cups]
         )
-        self.session.add(CupDB(name="League Cup", short_name="LC"))
         self.session.commit()
 
+    def _insert_people(self, people):
+        return insert_people(self.session, people)
+
     @timer
     def _create_staff(self, num_clubs: int):
         counts = [
@@ -501,206 +1050,133 @@ class DatabaseCreator(DatabaseWorker):
         for count_data in counts:
             logging.info(f"Creating {count_data[1]} x {count_data[0].name}s...")
 
-        all_persons = []
-        all_staff = []
-        for count_data in counts:
-            for _ in range(count_data[1]):
-                staff = PersonFactory.random_staff()
-                person = PersonDB(
-                    first_name=staff.name.first_name,
-                    last_name=staff.name.last_name,
-                    age=staff.age,
-                    personality=staff.personality,
-                )
-                all_persons.append(person)
-                db_staff = StaffDB(
-                    person_id=person.id,  # This will be set after flush
-                    role=count_data[0],
-                    reputation_type=ReputationLevel.random(),
-                    ability=random_ability(),
-                    prefered_formation=MatchFormation.random()
-                )
-                all_staff.append((person, db_staff))
-        self.session.add_all(all_persons)
-        self.session.flush()  # Flush to get IDs
-        for person, db_staff in all_staff:
-            db_staff.person_id = person.id
-            self.session.add(db_staff)
+        roles = []
+        for role, count in counts:
+            roles.extend([role] * count)
+        person_ids = self._insert_people([PersonFactory.random_staff() for _ in roles])
+        self.session.execute(
+            insert(StaffDB),
+            [
+                {
+                    "person_id": person_id,
+                    "role": role,
+                    "reputation_type": ReputationLevel.random(),
+                    "ability": random_ability(),
+                    "prefered_formation": MatchFormation.random(),
+                }
+                for person_id, role in zip(person_ids, roles)
+            ],
+        )
         self.session.commit()
 
-        return len(self.session.scalars(select(StaffDB)).all())
+        return self._count(select(StaffDB.person_id))
 
     @timer
     def _create_players(self, num_clubs: int):
         num_players = 15 * num_clubs * 2
         logging.info(f"Creating {num_players} players...")
 
-        all_persons = []
-        all_players = []
-        for _ in range(num_players):
-            player = PersonFactory.random_player()
-            person = PersonDB(
-                first_name=player.name.first_name,
-                last_name=player.name.last_name,
-                age=player.age,
-                personality=player.personality,
-            )
-            all_persons.append(person)
-            player_db = PlayerDB(
-                person_id=person.id,  # Will be set after flush
-                position=Position.random(),
-                ability=random_ability(),
-            )
-            all_players.append((person, player_db))
-        self.session.add_all(all_persons)
-        self.session.flush()
-        for person, player_db in all_players:
-            player_db.person_id = person.id
-            self.session.add(player_db)
+        people = [PersonFactory.random_player() for _ in range(num_players)]
+        person_ids = self._insert_people(people)
+        abilities = [random_ability() for _ in person_ids]
+        potentials = initial_potentials([p.age for p in people], abilities)
+        self.session.execute(
+            insert(PlayerDB),
+            [
+                {
+                    "person_id": person_id,
+                    "position": Position.random(),
+                    "ability": ability,
+                    "potential": round(potential, 2),
+                }
+                for person_id, ability, potential in zip(
+                    person_ids, abilities, potentials.tolist()
+                )
+            ],
+        )
         self.session.commit()
-        return len(self.session.scalars(select(PlayerDB)).all())
+        return self._count(select(PlayerDB.person_id))
+
+    def _contracts(self, club_ids, person_ids, per_club, contract_type):
+        """
+        Contract rows giving each club *per_club* people from the shuffled
+        *person_ids*, which are consumed from the end of the list
+        """
+        contracts = []
+        for _ in range(per_club):
+            shuffle(club_ids)
+            for club_id in club_ids:
+                contracts.append(
+                    {
+                        "person_id": person_ids.pop(),
+                        "club_id": club_id,
+                        "expiry_date": contract_length(),
+                        "wage": 100,
+                        "contract_type": contract_type,
+                    }
+                )
+        return contracts
 
     @timer
     def _allocate_staff(self):
         logging.info("Allocating Staff...")
-        clubs = self.session.scalars(select(ClubDB)).all()
-
-        managers = self.session.scalars(
-            select(StaffDB).where(StaffDB.role == StaffRole.Manager)
-        ).all()
-        coaches = self.session.scalars(
-            select(StaffDB).where(StaffDB.role == StaffRole.Coach)
-        ).all()
-        scouts = self.session.scalars(
-            select(StaffDB).where(StaffDB.role == StaffRole.Scout)
-        ).all()
-        physios = self.session.scalars(
-            select(StaffDB).where(StaffDB.role == StaffRole.Physio)
-        ).all()
-
-        shuffle(clubs)
-        shuffle(managers)
+        club_ids = list(self.session.scalars(select(ClubDB.id)).all())
 
         contracts = []
-        for club in clubs:
-            manager = managers.pop(0)
-            contract = ContractDB(
-                person_id=manager.person_id,
-                club_id=club.id,
-                expiry_date=contract_expiry(),
-                wage=100,
-                contract_type=ContractType.Staff_Contract,
+        for role, per_club in [
+            (StaffRole.Manager, 1),
+            (StaffRole.Coach, 2),
+            (StaffRole.Scout, 2),
+            (StaffRole.Physio, 1),
+        ]:
+            staff_ids = list(
+                self.session.scalars(
+                    select(StaffDB.person_id).where(StaffDB.role == role)
+                ).all()
             )
-            contracts.append(contract)
-
-        shuffle(clubs)
-        shuffle(coaches)
-
-        for ix, club in enumerate(clubs):
-            for _ in range(2):
-                coach = coaches.pop(0)
-                contract = ContractDB(
-                    person_id=coach.person_id,
-                    club_id=club.id,
-                    expiry_date=contract_expiry(),
-                    wage=100,
-                    contract_type=ContractType.Staff_Contract,
+            shuffle(staff_ids)
+            contracts.extend(
+                self._contracts(
+                    club_ids, staff_ids, per_club, ContractType.Staff_Contract
                 )
-                contracts.append(contract)
-
-        shuffle(clubs)
-        shuffle(scouts)
-        for ix, club in enumerate(clubs):
-            for _ in range(2):
-                scout = scouts.pop(0)
-                contract = ContractDB(
-                    person_id=scout.person_id,
-                    club_id=club.id,
-                    expiry_date=contract_expiry(),
-                    wage=100,
-                    contract_type=ContractType.Staff_Contract,
-                )
-                contracts.append(contract)
-
-        shuffle(clubs)
-        shuffle(physios)
-
-        for club in clubs:
-            physio = physios.pop(0)
-            contract = ContractDB(
-                person_id=physio.person_id,
-                club_id=club.id,
-                expiry_date=contract_expiry(),
-                wage=100,
-                contract_type=ContractType.Staff_Contract,
             )
-            contracts.append(contract)
-        self.session.add_all(contracts)
+        self.session.execute(insert(ContractDB), contracts)
         self.session.commit()
 
-        return len(
-            self.session.scalars(
-                select(ContractDB).where(
-                    ContractDB.contract_type == ContractType.Staff_Contract
-                )
-            ).all()
+        return self._count(
+            select(ContractDB.person_id).where(
+                ContractDB.contract_type == ContractType.Staff_Contract
+            )
         )
 
     @timer
     def _allocate_players(self):
         logging.info("Allocating Players...")
-        clubs = self.session.scalars(select(ClubDB)).all()
-
-        goalkeepers = self.session.scalars(
-            select(PlayerDB).where(PlayerDB.position == Position.Goalkeeper)
-        ).all()
-        defenders = self.session.scalars(
-            select(PlayerDB).where(PlayerDB.position == Position.Defender)
-        ).all()
-        midfielders = self.session.scalars(
-            select(PlayerDB).where(PlayerDB.position == Position.Midfielder)
-        ).all()
-        attackers = self.session.scalars(
-            select(PlayerDB).where(PlayerDB.position == Position.Attacker)
-        ).all()
+        club_ids = list(self.session.scalars(select(ClubDB.id)).all())
 
         contracts = []
-        shuffle(clubs)
-        shuffle(goalkeepers)
-        for _ in range(3):
-            shuffle(clubs)
-            for club in clubs:
-                gk = goalkeepers.pop(0)
-                contract = ContractDB(
-                    person_id=gk.person_id,
-                    club_id=club.id,
-                    expiry_date=contract_expiry(),
-                    wage=100,
-                    contract_type=ContractType.Player_Contract,
+        for position, per_club in [
+            (Position.Goalkeeper, 3),
+            (Position.Defender, 4),
+            (Position.Midfielder, 4),
+            (Position.Attacker, 4),
+        ]:
+            player_ids = list(
+                self.session.scalars(
+                    select(PlayerDB.person_id).where(PlayerDB.position == position)
+                ).all()
+            )
+            shuffle(player_ids)
+            contracts.extend(
+                self._contracts(
+                    club_ids, player_ids, per_club, ContractType.Player_Contract
                 )
-                contracts.append(contract)
-
-        for plist in [defenders, midfielders, attackers]:
-            for _ in range(4):
-                shuffle(clubs)
-                shuffle(plist)
-                for club in clubs:
-                    player = plist.pop(0)
-                    contract = ContractDB(
-                        person_id=player.person_id,
-                        club_id=club.id,
-                        expiry_date=contract_expiry(),
-                        wage=100,
-                        contract_type=ContractType.Player_Contract,
-                    )
-                    contracts.append(contract)
-        self.session.add_all(contracts)
+            )
+        self.session.execute(insert(ContractDB), contracts)
         self.session.commit()
 
-        return len(
-            self.session.scalars(
-                select(ContractDB).where(
-                    ContractDB.contract_type == ContractType.Player_Contract
-                )
-            ).all()
+        return self._count(
+            select(ContractDB.person_id).where(
+                ContractDB.contract_type == ContractType.Player_Contract
+            )
         )
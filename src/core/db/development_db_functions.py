@@ -0,0 +1,87 @@
+from __future__ import annotations
+from random import getrandbits
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import delete, func, select, update
+
+from src.core.player_development import develop, initial_potentials
+
+from src.core.db.models import ClubModifierDB, ContractDB, PersonDB, PlayerDB
+
+
+class SeasonDevelopment(NamedTuple):
+    developed: int
+    retired: list[int]
+    # clubs whose squads lost retiring players
+    club_ids: list[int]
+
+
+def active_players_select():
+    """
+    (person_id, age, ability, potential, development) rows of the players
+    not retired, development is their club's precomputed staff modifier,
+    neutral for free agents
+    """
+    return (
+        select(
+            PlayerDB.person_id,
+            PersonDB.age,
+            PlayerDB.ability,
+            PlayerDB.potential,
+            func.coalesce(ClubModifierDB.development, 1.0),
+        )
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .outerjoin(ContractDB, ContractDB.person_id == PlayerDB.person_id)
+        .outerjoin(ClubModifierDB, ClubModifierDB.club_id == ContractDB.club_id)
+        .where(PlayerDB.retired.is_(False))
+    )
+
+
+def develop_players(session):
+    """
+    End of season development of every active player, run after the age
+    increase, at the rate of their club's staff modifier. Abilities,
+    potentials and retirements are computed in one NumPy pass and written
+    back with one executemany, retiring players' contracts are removed,
+    all left uncommitted.
+    """
+    rows = session.execute(active_players_select()).all()
+    if not rows:
+        return SeasonDevelopment(0, [], [])
+
+    person_ids, ages, abilities, potentials, modifiers = zip(*rows)
+    ages = np.array(ages, dtype=float)
+    abilities = np.array(abilities, dtype=float)
+    potentials = np.array([np.nan if p is None else p for p in potentials], dtype=float)
+    # players never developed before are put on the curve at last season's age
+    missing = np.isnan(potentials)
+    potentials[missing] = initial_potentials(ages[missing] - 1, abilities[missing])
+
+    rng = np.random.default_rng(getrandbits(64))
+    abilities, potentials, retired = develop(
+        ages, abilities, potentials, rng, modifiers=np.array(modifiers, dtype=float)
+    )
+
+    session.execute(
+        update(PlayerDB),
+        [
+            {"person_id": p, "ability": a, "potential": round(pot, 2), "retired": r}
+            for p, a, pot, r in zip(
+                person_ids, abilities.tolist(), potentials.tolist(), retired.tolist()
+            )
+        ],
+    )
+
+    retired_ids = [p for p, r in zip(person_ids, retired.tolist()) if r]
+    club_ids = []
+    if retired_ids:
+        retiring = select(PlayerDB.person_id).where(PlayerDB.retired.is_(True))
+        club_ids = session.scalars(
+            select(ContractDB.club_id)
+            .distinct()
+            .where(ContractDB.person_id.in_(retiring))
+            .where(ContractDB.club_id.is_not(None))
+        ).all()
+        session.execute(delete(ContractDB).where(ContractDB.person_id.in_(retiring)))
+    return SeasonDevelopment(len(person_ids), retired_ids, sorted(club_ids))
@@ -1,34 +1,48 @@
 from __future__ import annotations
+from contextlib import contextmanager
 from enum import Enum, auto, unique
 import logging
+from os.path import dirname, exists, join
 from random import randint
 
 
 from src.core.world_time import WEEKS_IN_YEAR
+from src.core.match_events import create_match_events, select_team, team_strength
+from src.core.world_definition import WorldDefinition
+from src.core.metrics import GAME_WORKER_METRIC, LatencyMetrics, measured
 
-from .league_db_functions import get_league_table_data
 from .db_worker import DatabaseWorker, DatabaseCreator
+from .season_archive import SeasonArchiver
+from .save_slots import SaveSlots, TableHydration
+from .schema_version import ensure_schema
+from .staff_db_functions import NEUTRAL_MODIFIERS
 
 
-def create_score():
+def create_score(home_strength: float = 1.0, away_strength: float = 1.0):
+    """
+    Random goals for each side, up to max_goals for evenly matched sides,
+    the stronger side's range grows with its share of the total strength
+    """
     min_goals, max_goals = 0, 5
-    return randint(min_goals, max_goals), randint(min_goals, max_goals)
+    total = home_strength + away_strength
+    home_max = round(2 * max_goals * home_strength / total) if total else max_goals
+    return randint(min_goals, home_max), randint(min_goals, 2 * max_goals - home_max)
 
 
-def league_table_text(league_data):
+def league_table_text(standings):
     league_table_text = ["", ("-" * 80), "League Table"]
 
-    for ld in league_data:
+    for row in standings:
         text = [
-            ld["club"].name.ljust(30),
-            str(ld["ply"]).center(3),
-            str(ld["w"]).center(3),
-            str(ld["d"]).center(3),
-            str(ld["l"]).center(3),
-            str(ld["gf"]).center(3),
-            str(ld["ga"]).center(3),
-            str(ld["gd"]).center(3),
-            str(ld["pts"]).center(3),
+            row.name.ljust(30),
+            str(row.ply).center(3),
+            str(row.w).center(3),
+            str(row.d).center(3),
+            str(row.l).center(3),
+            str(row.gf).center(3),
+            str(row.ga).center(3),
+            str(row.gd).center(3),
+            str(row.pts).center(3),
         ]
         league_table_text.append(f"{'|'.join(text)}")
     league_table_text.append(("-" * 80))
@@ -37,19 +51,58 @@ def league_table_text(league_data):
 
 class GameDBWorker:
     DEFAULT_DB_PATH = "var/football.db"
+    # seasons of match events kept by new games, older ones are summarised
+    DEFAULT_EVENT_RETENTION = 3
+    # seasons new games keep in the live database, older ones are archived
+    DEFAULT_ARCHIVE_AFTER = 5
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        event_retention: int | None = None,
+        archive_after: int | None = None,
+        world_definition: WorldDefinition | None = None,
+        metrics: LatencyMetrics | None = None,
+        expunge_interval: int | None = 8,
+        saves_dir: str | None = None,
+    ):
         self._db_path = db_path or self.DEFAULT_DB_PATH
+        # save slot snapshots, next to the working database by default
+        self._saves_dir = saves_dir or self.saves_dir_for(self._db_path)
+        # tables of a lazily loaded slot still to be filled
+        self._hydration: TableHydration | None = None
+        # competition structure for new databases, None loads the default world
+        self._world_definition = world_definition
+        # number of seasons of match events to keep, None keeps everything
+        self._event_retention = event_retention
+        # number of seasons kept in the live database before older seasons
+        # are moved to archive files, None never archives
+        self._archive_after = archive_after
         # keep a single worker instance so that sessions stay alive when
         # objects returned by the API are still being used by the caller.
         self._worker: DatabaseWorker | None = None
+        # read only worker for views and reports, never blocks the writer
+        self._read_worker: DatabaseWorker | None = None
+        # latency of the game worker methods, shared with the state engine
+        self._metrics = metrics if metrics is not None else LatencyMetrics()
+        # units of work between clearing the writer session's identity map,
+        # None never clears it
+        self._expunge_interval = expunge_interval
+        self._units_since_expunge = 0
 
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @measured(GAME_WORKER_METRIC)
     def create_new_database(self, delete_existing: bool = True):
         logging.info(
             f"Creating new database at {self._db_path}, delete existing: {delete_existing}"
         )
         DatabaseCreator(
-            db_path=self._db_path, delete_existing=delete_existing
+            db_path=self._db_path,
+            delete_existing=delete_existing,
+            world_definition=self._world_definition,
         ).create_db()
 
     @property
@@ -58,33 +111,281 @@ class GameDBWorker:
             self._worker = DatabaseWorker(db_path=self._db_path)
         return self._worker
 
+    @property
+    def read_worker(self):
+        if self._read_worker is None:
+            self._read_worker = DatabaseWorker(db_path=self._db_path, read_only=True)
+        return self._read_worker
+
+    @staticmethod
+    def saves_dir_for(db_path: str):
+        return join(dirname(db_path), "saves")
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    @property
+    def save_slots(self):
+        return SaveSlots(self._saves_dir)
+
+    def ensure_hydrated(self):
+        """
+        Fill the tables a lazy load deferred, before anything uses them. If
+        they fail to load the database the load replaced is restored and
+        the sessions are closed so they reopen on it.
+        """
+        if self._hydration is not None:
+            hydration, self._hydration = self._hydration, None
+            try:
+                hydration.finish()
+            except Exception:
+                self.close()
+                raise
+
+    @measured(GAME_WORKER_METRIC)
+    def check_schema(self):
+        """
+        Check the working database's schema revision before resuming it,
+        running any migrations added since it was last played
+        """
+        if not exists(self._db_path):
+            raise FileNotFoundError(f"No game database at {self._db_path}")
+        ensure_schema(self.worker.session.connection())
+        self.worker.session.commit()
+
+    @measured(GAME_WORKER_METRIC)
+    def save_game(self, slot: str, state: str | None = None):
+        """
+        Snapshot the working database to *slot*, writing only the tables
+        that changed since the slot was last saved
+        """
+        self.ensure_hydrated()
+        if self._worker:
+            self._worker.session.commit()
+        return self.save_slots.save(slot, self._db_path, state=state)
+
+    @measured(GAME_WORKER_METRIC)
+    def load_game(self, slot: str, lazy: bool = True):
+        """
+        Replace the working database with *slot*, with *lazy* the deferred
+        tables are filled by ensure_hydrated(). Returns the slot's SlotInfo.
+        """
+        self.close()
+        self._hydration = self.save_slots.load(slot, self._db_path, lazy=lazy)
+        if self._hydration.done:
+            self._hydration = None
+            return self.save_slots.get_slot(slot)
+        return self._hydration.info
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Scope of one engine state transition on the writer session. Work
+        left in the transaction is committed on exit or rolled back if the
+        transition fails, so a failure cannot leave the session unusable,
+        and every expunge_interval units the identity map is cleared so
+        nothing loaded over a long game stays attached.
+
+        Transitions are not atomic: many DatabaseWorker methods, e.g.
+        advance_week, add_results and do_post_season_setup, commit their
+        own writes, and season archiving commits before it attaches the
+        archive. The rollback only undoes what is still uncommitted when a
+        transition fails.
+
+        Entities returned from inside the unit may be detached afterwards,
+        only their loaded attributes are safe to read.
+        """
+        try:
+            yield self.worker
+            if self._worker and self._worker.session.in_transaction():
+                self._worker.session.commit()
+        except BaseException:
+            if self._worker:
+                self._worker.session.rollback()
+            raise
+        finally:
+            self._units_since_expunge += 1
+            if (
+                self._expunge_interval is not None
+                and self._units_since_expunge >= self._expunge_interval
+            ):
+                self.expunge_all()
+
+    def expunge_all(self):
+        """
+        Detach every entity from the writer session
+        """
+        self._units_since_expunge = 0
+        if self._worker:
+            self._worker.session.expunge_all()
+
     def close(self):
-        """Close any open session held by the cached worker."""
+        """Close any open session held by the cached workers."""
         if self._worker:
             self._worker.close_session()
             self._worker = None
+        if self._read_worker:
+            self._read_worker.close_session()
+            self._read_worker = None
 
+    @measured(GAME_WORKER_METRIC)
     def do_new_season(self):
         logging.info("Do new season setup...")
         self.worker.do_new_season()
 
+    @measured(GAME_WORKER_METRIC)
+    def process_contracts(self):
+        changes = self.worker.process_expired_contracts()
+        if changes.renewed or changes.released:
+            logging.info(
+                f"Contracts: {len(changes.renewed)} renewed, "
+                f"{len(changes.released)} released"
+            )
+        return changes
+
+    @measured(GAME_WORKER_METRIC)
+    def run_transfer_window(self):
+        window = self.worker.run_transfer_window()
+        logging.info(
+            f"Transfer window: {len(window.signed)} free agents signed, "
+            f"{len(window.transferred)} transfers"
+        )
+        return window
+
+    @measured(GAME_WORKER_METRIC)
     def process_end_of_season(self):
         logging.info("Process End of Season...")
         current_season = self.worker.get_current_season()
 
-        for league in self.worker.get_leagues_from_competitions():
-            league_data = get_league_table_data(league, current_season)
+        standings = self.worker.get_season_league_standings(current_season)
+        for league_data in standings.values():
             logging.info(f"{'\n'.join(league_table_text(league_data))}")
 
         self.worker.do_post_season_setup()
+        development = self.worker.develop_players()
+        logging.info(
+            f"Developed {development.developed} players, "
+            f"{len(development.retired)} retired"
+        )
+        intake = self.worker.youth_intake()
+        logging.info(f"Youth intake: {len(intake.person_ids)} players")
+
+        if self._event_retention is not None:
+            self.worker.prune_match_events(keep_seasons=self._event_retention)
+
+        if self._archive_after is not None:
+            self.archiver.archive_old_seasons(keep_seasons=self._archive_after)
+        return sorted(set(development.club_ids) | set(intake.club_ids))
+
+    @property
+    def archiver(self):
+        return SeasonArchiver(self.worker)
 
+    @measured(GAME_WORKER_METRIC)
+    def add_match_events(self, fixtures_and_scores):
+        """
+        Generate the events for a matchweek's results and write them with a
+        single bulk insert
+        """
+        return self.worker.add_match_events(
+            self.create_match_events(fixtures_and_scores)
+        )
+
+    def _match_teams(self, fixtures):
+        """
+        {club_id: team} of the clubs playing *fixtures*, squads and
+        formations read in one query each
+        """
+        club_ids = set()
+        for fixture in fixtures:
+            club_ids.update([fixture.home_club_id, fixture.away_club_id])
+        squads = self.worker.get_club_squads(club_ids)
+        formations = self.worker.get_club_formations(club_ids)
+        return {
+            club_id: select_team(squad, formations.get(club_id))
+            for club_id, squad in squads.items()
+        }
+
+    @measured(GAME_WORKER_METRIC)
+    def simulate_matches(self, fixtures):
+        """
+        Scores and events of *fixtures*, teams are as strong as their
+        players' average ability times the club's precomputed staff
+        modifier. Returns (fixtures_and_scores, events), only reads from
+        the database.
+        """
+        teams = self._match_teams(fixtures)
+        modifiers = self.worker.get_club_modifiers(list(teams))
+        strengths = {
+            club_id: team_strength(team)
+            * modifiers.get(club_id, NEUTRAL_MODIFIERS).match_strength
+            for club_id, team in teams.items()
+        }
+        fixtures_and_scores = [
+            (
+                fixture,
+                create_score(
+                    strengths[fixture.home_club_id], strengths[fixture.away_club_id]
+                ),
+            )
+            for fixture in fixtures
+        ]
+        return fixtures_and_scores, self._match_events(teams, fixtures_and_scores)
+
+    @measured(GAME_WORKER_METRIC)
+    def create_match_events(self, fixtures_and_scores):
+        """
+        Events for a matchweek's results as MatchEventDB column dicts, only
+        reads from the database
+        """
+        teams = self._match_teams(fixture for fixture, _ in fixtures_and_scores)
+        return self._match_events(teams, fixtures_and_scores)
+
+    @staticmethod
+    def _match_events(teams, fixtures_and_scores):
+        events = []
+        for fixture, score in fixtures_and_scores:
+            club_ids = (fixture.home_club_id, fixture.away_club_id)
+            for side, event_type, minute, person_id, value in create_match_events(
+                teams[club_ids[0]], teams[club_ids[1]], score
+            ):
+                events.append(
+                    {
+                        "fixture_id": fixture.id,
+                        "season_id": fixture.season_id,
+                        "competition_id": fixture.competition_id,
+                        "club_id": club_ids[side],
+                        "person_id": person_id,
+                        "event_type": event_type.value,
+                        "minute": minute,
+                        "value": value,
+                    }
+                )
+        return events
+
+    @measured(GAME_WORKER_METRIC)
+    def update_club_modifiers(self):
+        return self.worker.update_club_modifiers()
+
+    @measured(GAME_WORKER_METRIC)
     def current_date(self):
         current_season = self.worker.get_current_season()
         current_week = self.worker.get_week(self.worker.get_current_week())
         return current_season, current_week
 
+    @measured(GAME_WORKER_METRIC)
     def current_fixtures(self):
         return self.worker.get_fixtures_for_current_week()
 
+    @measured(GAME_WORKER_METRIC)
+    def current_fixture_rows(self):
+        """
+        The current week's unplayed fixtures as FixtureRow read models, for
+        read only callers that do not need the ORM entities
+        """
+        return self.worker.get_current_week_fixture_rows()
+
+    @measured(GAME_WORKER_METRIC)
     def current_results(self):
         return self.worker.get_results_for_current_week()
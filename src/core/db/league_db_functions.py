@@ -3,13 +3,20 @@ from random import shuffle, randint
 from typing import List
 
 
+from sqlalchemy import select, func, case, and_, union_all, desc, asc
+from sqlalchemy.orm import object_session
+
+
 from src.core.world_time import WEEKS_IN_YEAR
 
 from src.core.db.models import (
     SeasonDB,
     ClubDB,
     LeagueDB,
+    FixtureDB,
+    CompetitionRegisterDB,
 )
+from src.core.db.read_models import standing_rows
 
 
 def contract_expiry():
@@ -50,6 +57,26 @@ league_30_fixtures = [
 ]
 
 
+# regular season weeks available for league rounds
+LEAGUE_FIRST_WEEK, LEAGUE_LAST_WEEK = 6, 48
+
+
+def league_fixture_weeks(num_rounds: int):
+    """
+    Season week of each of *num_rounds* league rounds, the usual 30 round
+    calendar for 16 team leagues otherwise spread evenly over the season
+    """
+    if num_rounds == len(league_30_fixtures):
+        return list(league_30_fixtures)
+    available = LEAGUE_LAST_WEEK - LEAGUE_FIRST_WEEK + 1
+    if num_rounds > available:
+        raise ValueError(f"{num_rounds} rounds do not fit in {available} weeks")
+    if num_rounds <= 1:
+        return [LEAGUE_FIRST_WEEK] * num_rounds
+    step = (available - 1) / (num_rounds - 1)
+    return [LEAGUE_FIRST_WEEK + int(ix * step) for ix in range(num_rounds)]
+
+
 def create_league_fixtures(clubs: List, reverse_fixtures: bool = False):
     club_count = len(clubs)
     fixtures = []
@@ -93,7 +120,10 @@ def create_league_fixtures(clubs: List, reverse_fixtures: bool = False):
     return fixtures
 
 
-def create_league_table_data(club: ClubDB, results: List):
+def create_league_table_data(club: ClubDB, fixtures: List):
+    """
+    League table row for a club from its played fixtures
+    """
     data = {
         "club": club,
         "ply": 0,
@@ -106,34 +136,24 @@ def create_league_table_data(club: ClubDB, results: List):
         "pts": 0,
     }
 
-    for result in results:
-        fixture = result.fixture
+    for fixture in fixtures:
         if fixture.home_club_id == club.id:
-            home = True
+            scored, conceded = fixture.home_score, fixture.away_score
         elif fixture.away_club_id == club.id:
-            home = False
+            scored, conceded = fixture.away_score, fixture.home_score
         else:
             raise RuntimeError(f"{club.name} not in fixture: {fixture}")
 
         data["ply"] += 1
+        data["gf"] += scored
+        data["ga"] += conceded
 
-        if result.home_score == result.away_score:
+        if scored == conceded:
             data["d"] += 1
-            data["gf"] += result.home_score
-            data["ga"] += result.away_score
+        elif scored > conceded:
+            data["w"] += 1
         else:
-            if result.home_score > result.away_score:
-                if home:
-                    data["w"] += 1
-                else:
-                    data["l"] += 1
-            else:
-                if home:
-                    data["l"] += 1
-                else:
-                    data["w"] += 1
-            data["gf"] += result.home_score
-            data["ga"] += result.away_score
+            data["l"] += 1
 
     data["gd"] = data["gf"] - data["ga"]
     data["pts"] = (data["w"] * 3) + data["d"]
@@ -142,10 +162,120 @@ def create_league_table_data(club: ClubDB, results: List):
 
 def get_league_table_data(league: LeagueDB, current_season: SeasonDB):
     clubs = league.get_clubs_for_season(season=current_season)
-    league_data = list()
-    for club in clubs:
-        results = club.results(competition=league, season=current_season)
-        league_data.append(create_league_table_data(club, results))
 
+    # one scan of the league's played fixtures rather than a query per club
+    club_fixtures = {club.id: [] for club in clubs}
+    for fixture in object_session(league).scalars(
+        select(FixtureDB)
+        .where(FixtureDB.competition_id == league.id)
+        .where(FixtureDB.season_id == current_season.id)
+        .where(FixtureDB.played == True)
+    ):
+        for club_id in (fixture.home_club_id, fixture.away_club_id):
+            if club_id in club_fixtures:
+                club_fixtures[club_id].append(fixture)
+
+    league_data = [
+        create_league_table_data(club, club_fixtures[club.id]) for club in clubs
+    ]
     league_data.sort(key=lambda d: (-d["pts"], -d["gf"], -d["gd"], d["club"].name))
     return league_data
+
+
+def get_league_table_rows(session, league_id: int, season_id: int):
+    """
+    Standings of a league as StandingRow read models ranked in SQL, the
+    lightweight variant of get_league_table_data
+    """
+    return standing_rows(session, league_standings_select(season_id, [league_id]))
+
+
+def league_standings_select(season_id: int, league_ids: List[int]):
+    """
+    Standings of several leagues in one statement, ranked in SQL with the
+    same ordering as get_league_table_data.
+
+    Rows are (competition_id, club_id, name, ply, w, d, l, gf, ga, gd, pts,
+    position, league_size) ordered by competition and position.
+    """
+    played = and_(
+        FixtureDB.season_id == season_id,
+        FixtureDB.competition_id.in_(league_ids),
+        FixtureDB.played == True,
+    )
+    sides = union_all(
+        select(
+            FixtureDB.competition_id,
+            FixtureDB.home_club_id.label("club_id"),
+            FixtureDB.home_score.label("gf"),
+            FixtureDB.away_score.label("ga"),
+        ).where(played),
+        select(
+            FixtureDB.competition_id,
+            FixtureDB.away_club_id.label("club_id"),
+            FixtureDB.away_score.label("gf"),
+            FixtureDB.home_score.label("ga"),
+        ).where(played),
+    ).subquery()
+
+    totals = (
+        select(
+            sides.c.competition_id,
+            sides.c.club_id,
+            func.count().label("ply"),
+            func.sum(case((sides.c.gf > sides.c.ga, 1), else_=0)).label("w"),
+            func.sum(case((sides.c.gf == sides.c.ga, 1), else_=0)).label("d"),
+            func.sum(case((sides.c.gf < sides.c.ga, 1), else_=0)).label("l"),
+            func.sum(sides.c.gf).label("gf"),
+            func.sum(sides.c.ga).label("ga"),
+        )
+        .group_by(sides.c.competition_id, sides.c.club_id)
+        .subquery()
+    )
+
+    def total(column):
+        return func.coalesce(column, 0)
+
+    pts = total(totals.c.w) * 3 + total(totals.c.d)
+    gd = total(totals.c.gf) - total(totals.c.ga)
+    table = (
+        select(
+            CompetitionRegisterDB.competition_id,
+            CompetitionRegisterDB.club_id,
+            ClubDB.name,
+            total(totals.c.ply).label("ply"),
+            total(totals.c.w).label("w"),
+            total(totals.c.d).label("d"),
+            total(totals.c.l).label("l"),
+            total(totals.c.gf).label("gf"),
+            total(totals.c.ga).label("ga"),
+            gd.label("gd"),
+            pts.label("pts"),
+            func.row_number()
+            .over(
+                partition_by=CompetitionRegisterDB.competition_id,
+                order_by=[
+                    desc(pts),
+                    desc(total(totals.c.gf)),
+                    desc(gd),
+                    asc(ClubDB.name),
+                ],
+            )
+            .label("position"),
+            func.count()
+            .over(partition_by=CompetitionRegisterDB.competition_id)
+            .label("league_size"),
+        )
+        .join(ClubDB, ClubDB.id == CompetitionRegisterDB.club_id)
+        .outerjoin(
+            totals,
+            and_(
+                totals.c.competition_id == CompetitionRegisterDB.competition_id,
+                totals.c.club_id == CompetitionRegisterDB.club_id,
+            ),
+        )
+        .where(CompetitionRegisterDB.season_id == season_id)
+        .where(CompetitionRegisterDB.competition_id.in_(league_ids))
+        .subquery()
+    )
+    return select(table).order_by(table.c.competition_id, table.c.position)
@@ -1,8 +1,25 @@
 from __future__ import annotations
 
 
-from sqlalchemy import ForeignKey, String, Integer, Enum as SAEnum
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    String,
+    Integer,
+    Float,
+    Boolean,
+    Enum as SAEnum,
+)
+from sqlalchemy import select, or_
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    object_session,
+    contains_eager,
+    selectinload,
+)
 
 
 from ..game_types import (
@@ -116,6 +133,10 @@ class StaffDB(Base):
 
 class PlayerDB(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        # transfer market searches, best players of a position first
+        Index("ix_players_position_ability", "position", "ability"),
+    )
 
     person_id: Mapped[int] = mapped_column(
         ForeignKey("persons.id"),
@@ -124,6 +145,9 @@ class PlayerDB(Base):
     )
     position: Mapped[Position] = mapped_column(SAEnum(Position))
     ability: Mapped[int] = mapped_column(Integer)
+    # ability the development curve peaks at, None until first developed
+    potential: Mapped[float] = mapped_column(Float, nullable=True, default=None)
+    retired: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Reverse relationship
     person: Mapped[PersonDB] = relationship("PersonDB", back_populates="player")
@@ -134,6 +158,11 @@ class ClubDB(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String, unique=True, index=True)
 
+    # home league group, non-league clubs are promoted into its bottom league
+    league_group_id: Mapped[int] = mapped_column(
+        ForeignKey("league_groups.id"), nullable=True, default=None, index=True
+    )
+
     # Reverse relationships
     contracts: Mapped[list[ContractDB]] = relationship(
         "ContractDB", back_populates="club"
@@ -174,20 +203,44 @@ class ClubDB(Base):
                 if reg.season_id == season.id
             ]
 
-    def fixtures(self, season=None):
+    def fixtures(self, season=None, competition=None):
+        session = object_session(self)
+        if session is not None:
+            return session.scalars(
+                club_fixtures_select(
+                    self.id,
+                    season_id=season.id if season else None,
+                    competition_id=competition.id if competition else None,
+                )
+            ).all()
+
+        # detached, fall back to whatever relationships are already loaded
         all_fixtures = self.home_fixtures + self.away_fixtures
         if season is not None:
             all_fixtures = [f for f in all_fixtures if f.season_id == season.id]
+        if competition is not None:
+            all_fixtures = [
+                f for f in all_fixtures if f.competition_id == competition.id
+            ]
         all_fixtures.sort(key=lambda f: f.season_week)
         return all_fixtures
 
     def results(self, competition=None, season=None):
-        all_results = [f.result for f in self.fixtures(season) if f.result is not None]
-        if competition is not None:
-            all_results = [
-                r for r in all_results if r.fixture.competition_id == competition.id
-            ]
-        return all_results
+        session = object_session(self)
+        if session is not None:
+            return session.scalars(
+                club_results_select(
+                    self.id,
+                    season_id=season.id if season else None,
+                    competition_id=competition.id if competition else None,
+                )
+            ).all()
+
+        return [
+            f.result
+            for f in self.fixtures(season=season, competition=competition)
+            if f.result is not None
+        ]
 
 
 class ContractDB(Base):
@@ -200,10 +253,11 @@ class ContractDB(Base):
     )
 
     club_id: Mapped[int] = mapped_column(
-        ForeignKey("clubs.id"), nullable=True, default=None
+        ForeignKey("clubs.id"), nullable=True, default=None, index=True
     )
 
-    expiry_date: Mapped[int] = mapped_column(Integer)
+    # absolute game week the contract runs to, see contract_db_functions
+    expiry_date: Mapped[int] = mapped_column(Integer, index=True)
     wage: Mapped[int] = mapped_column(Integer)
 
     contract_type: Mapped[ContractType] = mapped_column(SAEnum(ContractType))
@@ -266,6 +320,8 @@ class LeagueDB(CompetitionDB):
 
     league_ranking: Mapped[int] = mapped_column(Integer)
     required_teams: Mapped[int] = mapped_column(Integer)
+    promotion_places: Mapped[int] = mapped_column(Integer, default=3)
+    relegation_places: Mapped[int] = mapped_column(Integer, default=3)
 
     # Reverse relationship
     league_group: Mapped[LeagueGroupDB] = relationship(
@@ -292,6 +348,9 @@ class CupDB(CompetitionDB):
 
 class CompetitionRegisterDB(Base):
     __tablename__ = "competition_registry"
+    __table_args__ = (
+        Index("ix_competition_registry_season_comp", "season_id", "competition_id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
     competition_id: Mapped[int] = mapped_column(
@@ -316,6 +375,11 @@ class CompetitionRegisterDB(Base):
 
 class FixtureDB(Base):
     __tablename__ = "fixtures"
+    __table_args__ = (
+        Index("ix_fixtures_home_club_season", "home_club_id", "season_id"),
+        Index("ix_fixtures_away_club_season", "away_club_id", "season_id"),
+        Index("ix_fixtures_season_week", "season_id", "season_week"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -339,6 +403,12 @@ class FixtureDB(Base):
 
     season_week: Mapped[int] = mapped_column(Integer)
 
+    # denormalised copy of the result, kept in sync by the result writer so
+    # week and table queries do not need to join/EXISTS against results
+    played: Mapped[bool] = mapped_column(Boolean, default=False)
+    home_score: Mapped[int] = mapped_column(Integer, nullable=True, default=None)
+    away_score: Mapped[int] = mapped_column(Integer, nullable=True, default=None)
+
     # discriminator column for fixture subclasses (joined-table polymorphism)
     fixture_type: Mapped[str] = mapped_column(String(20), default="fixture")
 
@@ -375,6 +445,48 @@ class ResultDB(Base):
     fixture: Mapped[FixtureDB] = relationship("FixtureDB", back_populates="result")
 
 
+def _club_fixture_filters(stmt, club_id, season_id=None, competition_id=None):
+    stmt = stmt.where(
+        or_(FixtureDB.home_club_id == club_id, FixtureDB.away_club_id == club_id)
+    )
+    if season_id is not None:
+        stmt = stmt.where(FixtureDB.season_id == season_id)
+    if competition_id is not None:
+        stmt = stmt.where(FixtureDB.competition_id == competition_id)
+    return stmt.order_by(FixtureDB.season_week, FixtureDB.id)
+
+
+def club_fixtures_select(
+    club_id: int, season_id: int | None = None, competition_id: int | None = None
+):
+    """
+    Fixtures of a club filtered and ordered in SQL, with results loaded in
+    one extra query rather than a lazy load per fixture
+    """
+    return _club_fixture_filters(
+        select(FixtureDB).options(selectinload(FixtureDB.result)),
+        club_id,
+        season_id,
+        competition_id,
+    )
+
+
+def club_results_select(
+    club_id: int, season_id: int | None = None, competition_id: int | None = None
+):
+    """
+    Results of a club joined to their fixtures in a single query
+    """
+    return _club_fixture_filters(
+        select(ResultDB)
+        .join(ResultDB.fixture)
+        .options(contains_eager(ResultDB.fixture)),
+        club_id,
+        season_id,
+        competition_id,
+    )
+
+
 class WorldDB(Base):
     __tablename__ = "world"
 
@@ -387,3 +499,156 @@ class WorldDB(Base):
 
     # Reverse relationship
     season: Mapped[SeasonDB] = relationship("SeasonDB", back_populates="world")
+
+
+class MatchEventDB(Base):
+    """
+    Append-only match event log
+
+    Columns are integer coded (see MatchEventType) and no relationships are
+    mapped so rows can be bulk inserted per matchweek and read back as plain
+    column tuples without populating the session identity map.
+    """
+
+    __tablename__ = "match_events"
+    __table_args__ = (
+        Index("ix_match_events_person_season", "person_id", "season_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    fixture_id: Mapped[int] = mapped_column(ForeignKey("fixtures.id"), index=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), index=True)
+    competition_id: Mapped[int] = mapped_column(ForeignKey("competitions.id"))
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"))
+    person_id: Mapped[int] = mapped_column(ForeignKey("persons.id"))
+
+    event_type: Mapped[int] = mapped_column(Integer)
+    minute: Mapped[int] = mapped_column(Integer)
+    value: Mapped[int] = mapped_column(Integer, nullable=True, default=None)
+
+
+class MatchEventSummaryDB(Base):
+    """
+    Per season event totals kept when old match events are pruned
+    """
+
+    __tablename__ = "match_event_summaries"
+
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), primary_key=True)
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+    person_id: Mapped[int] = mapped_column(ForeignKey("persons.id"), primary_key=True)
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"), primary_key=True)
+    event_type: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    count: Mapped[int] = mapped_column(Integer)
+    value_total: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class PlayerSeasonStatsDB(Base):
+    """
+    Pre-aggregated player statistics per season and competition, upserted
+    from each matchweek's match events
+    """
+
+    __tablename__ = "player_season_stats"
+    __table_args__ = (
+        Index("ix_player_season_stats_season_comp", "season_id", "competition_id"),
+        Index("ix_player_season_stats_club_season", "club_id", "season_id"),
+    )
+
+    person_id: Mapped[int] = mapped_column(ForeignKey("persons.id"), primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), primary_key=True)
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+
+    # club the player last appeared for in the competition
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"))
+
+    appearances: Mapped[int] = mapped_column(Integer, default=0)
+    goals: Mapped[int] = mapped_column(Integer, default=0)
+    assists: Mapped[int] = mapped_column(Integer, default=0)
+    rating_total: Mapped[int] = mapped_column(Integer, default=0)
+
+    @property
+    def average_rating(self):
+        if not self.appearances:
+            return 0.0
+        return self.rating_total / self.appearances
+
+
+class TransferDB(Base):
+    """
+    Player moves between clubs, from_club_id is None for free agent signings
+    """
+
+    __tablename__ = "transfers"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), index=True)
+    season_week: Mapped[int] = mapped_column(Integer)
+    person_id: Mapped[int] = mapped_column(ForeignKey("persons.id"), index=True)
+    from_club_id: Mapped[int] = mapped_column(
+        ForeignKey("clubs.id"), nullable=True, default=None
+    )
+    to_club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"), index=True)
+
+
+class ClubModifierDB(Base):
+    """
+    Multipliers of a club's staff, aggregated from StaffDB once a week so
+    match scoring and development read one row per club, 1.0 is neutral
+    """
+
+    __tablename__ = "club_modifiers"
+
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"), primary_key=True)
+    # absolute game week the staff were aggregated in
+    game_week: Mapped[int] = mapped_column(Integer)
+    match_strength: Mapped[float] = mapped_column(Float)
+    development: Mapped[float] = mapped_column(Float)
+    injury_recovery: Mapped[float] = mapped_column(Float)
+
+
+class SeasonArchiveDB(Base):
+    """
+    Closed season whose fixtures, results, events and registrations have
+    been moved out of the live database into a per-season archive file
+    """
+
+    __tablename__ = "season_archives"
+
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), primary_key=True)
+    path: Mapped[str] = mapped_column(String)
+    fixture_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    season: Mapped[SeasonDB] = relationship("SeasonDB")
+
+
+class LeagueTableArchiveDB(Base):
+    """
+    Final league table rows kept in the live database for archived seasons
+    """
+
+    __tablename__ = "league_table_archives"
+
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), primary_key=True)
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id"))
+    ply: Mapped[int] = mapped_column(Integer)
+    w: Mapped[int] = mapped_column(Integer)
+    d: Mapped[int] = mapped_column(Integer)
+    l: Mapped[int] = mapped_column(Integer)
+    gf: Mapped[int] = mapped_column(Integer)
+    ga: Mapped[int] = mapped_column(Integer)
+    gd: Mapped[int] = mapped_column(Integer)
+    pts: Mapped[int] = mapped_column(Integer)
+
+    club: Mapped[ClubDB] = relationship("ClubDB")
+    competition: Mapped[CompetitionDB] = relationship("CompetitionDB")
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from typing import NamedTuple
+
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from src.core.game_types import Position
+
+from .models import ClubDB, CompetitionDB, ContractDB, FixtureDB, PersonDB, PlayerDB
+
+
+# Read models: immutable tuples built straight from select() column rows
+# for the hot read paths, without ORM identity map tracking or lazy loads.
+# Field order matches the column order of their select statements.
+
+
+class FixtureRow(NamedTuple):
+    id: int
+    season_id: int
+    season_week: int
+    competition_id: int
+    competition: str
+    competition_round: int
+    home_club_id: int
+    home_club: str
+    away_club_id: int
+    away_club: str
+    home_score: int | None
+    away_score: int | None
+    played: bool
+
+
+class StandingRow(NamedTuple):
+    competition_id: int
+    club_id: int
+    name: str
+    ply: int
+    w: int
+    d: int
+    l: int
+    gf: int
+    ga: int
+    gd: int
+    pts: int
+    position: int
+    league_size: int
+
+
+class SquadPlayerRow(NamedTuple):
+    person_id: int
+    club_id: int
+    first_name: str
+    last_name: str
+    age: int
+    position: Position
+    ability: int
+
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def short_name(self):
+        return f"{self.first_name[:1]}.{self.last_name}"
+
+
+def fixture_rows_select(season_id: int, week_num: int, played: bool | None = None):
+    """
+    FixtureRow columns of a week's fixtures ordered by competition, round
+    and id, *played* filters fixtures or results, None is both
+    """
+    home_club, away_club = aliased(ClubDB), aliased(ClubDB)
+    stmt = (
+        select(
+            FixtureDB.id,
+            FixtureDB.season_id,
+            FixtureDB.season_week,
+            FixtureDB.competition_id,
+            CompetitionDB.short_name.label("competition"),
+            FixtureDB.competition_round,
+            FixtureDB.home_club_id,
+            home_club.name.label("home_club"),
+            FixtureDB.away_club_id,
+            away_club.name.label("away_club"),
+            FixtureDB.home_score,
+            FixtureDB.away_score,
+            FixtureDB.played,
+        )
+        .join(CompetitionDB, CompetitionDB.id == FixtureDB.competition_id)
+        .join(home_club, home_club.id == FixtureDB.home_club_id)
+        .join(away_club, away_club.id == FixtureDB.away_club_id)
+        .where(FixtureDB.season_id == season_id)
+        .where(FixtureDB.season_week == week_num)
+        .order_by(FixtureDB.competition_id, FixtureDB.competition_round, FixtureDB.id)
+    )
+    if played is not None:
+        stmt = stmt.where(FixtureDB.played == played)
+    return stmt
+
+
+def squad_rows_select(club_ids):
+    """
+    SquadPlayerRow columns of the contracted players of *club_ids*
+    """
+    return (
+        select(
+            PlayerDB.person_id,
+            ContractDB.club_id,
+            PersonDB.first_name,
+            PersonDB.last_name,
+            PersonDB.age,
+            PlayerDB.position,
+            PlayerDB.ability,
+        )
+        .join(ContractDB, ContractDB.person_id == PlayerDB.person_id)
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .where(ContractDB.club_id.in_(club_ids))
+        .order_by(ContractDB.club_id, PlayerDB.person_id)
+    )
+
+
+def fixture_rows(session, stmt):
+    return [FixtureRow._make(row) for row in session.execute(stmt)]
+
+
+def standing_rows(session, stmt):
+    return [StandingRow._make(row) for row in session.execute(stmt)]
+
+
+def squad_rows(session, stmt):
+    return [SquadPlayerRow._make(row) for row in session.execute(stmt)]
@@ -0,0 +1,473 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from hashlib import sha256
+import json
+import logging
+from os import listdir, makedirs, remove, replace
+from os.path import exists, getsize, isdir, join
+from shutil import rmtree
+import zlib
+
+
+from src.core.utils import timer
+
+from .schema_version import (
+    current_revision,
+    ensure_schema,
+    head_revision,
+    is_known_revision,
+)
+from .utils import (
+    WAL_SUFFIXES,
+    create_db_engine,
+    dispose_read_engine,
+    get_table_changes,
+    remove_db,
+)
+
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_VERSION = 1
+
+# big tables not needed to show the first page of a loaded game, hydrated
+# after the rest when a load is lazy
+DEFERRED_TABLES = [
+    "persons",
+    "staff",
+    "players",
+    "contracts",
+    "transfers",
+    "results",
+    "player_season_stats",
+    "match_event_summaries",
+    "match_events",
+]
+
+COMPRESSION_LEVEL = 6
+
+# a slot is loaded into this file next to the working database and only
+# replaces it once every table has loaded, the previous database is kept
+# here until a lazy load's deferred tables have loaded too
+LOADING_SUFFIX = ".loading"
+PREVIOUS_SUFFIX = ".previous"
+
+
+@dataclass
+class SlotInfo:
+    name: str
+    saved_at: str
+    season: int | None = None
+    week: int | None = None
+    # caller state restored on load, e.g. the engine's WorldState name
+    state: str | None = None
+    # alembic revision of the saved schema
+    revision: str | None = None
+    size: int = 0
+    tables: dict = field(default_factory=dict)
+    # TableChanges generation the tables' versions belong to
+    generation: str | None = None
+
+
+def _quote(name: str):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _encode_table(columns, rows):
+    """
+    Columnar JSON of a table's rows, one list per column
+    """
+    data = [list(c) for c in zip(*rows)] if rows else [[] for _ in columns]
+    return json.dumps(
+        {"columns": columns, "rows": len(rows), "data": data},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _decode_table(payload: bytes):
+    table = json.loads(zlib.decompress(payload))
+    return table["columns"], list(zip(*table["data"]))
+
+
+def _schema_digest(schema):
+    return sha256(json.dumps(schema).encode("utf-8")).hexdigest()
+
+
+def _move_db(src: str, dst: str):
+    """
+    Move the SQLite database *src*, with its WAL files, to *dst* replacing
+    any database there
+    """
+    remove_db(dst)
+    dispose_read_engine(src)
+    for suffix in [""] + WAL_SUFFIXES:
+        if exists(src + suffix):
+            replace(src + suffix, dst + suffix)
+
+
+class TableHydration:
+    """
+    Fills a database from a slot's table snapshots. The first phase is
+    loaded by SaveSlots.load, finish() loads the deferred tables and is a
+    no-op once done. If they fail to load the database the slot replaced
+    is put back.
+    """
+
+    def __init__(
+        self,
+        slots: SaveSlots,
+        info: SlotInfo,
+        db_path: str,
+        deferred,
+        previous: str | None = None,
+    ):
+        self._slots = slots
+        self._info = info
+        self._db_path = db_path
+        self._pending = list(deferred)
+        # the replaced database, kept until the deferred tables have loaded
+        self._previous = previous
+
+    @property
+    def info(self):
+        return self._info
+
+    @property
+    def pending(self):
+        return list(self._pending)
+
+    @property
+    def done(self):
+        return not self._pending
+
+    @timer
+    def finish(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            try:
+                self._slots._hydrate(self._info, self._db_path, pending)
+            except Exception:
+                self._restore_previous()
+                raise
+        if self._previous is not None:
+            remove_db(self._previous)
+            self._previous = None
+
+    def _restore_previous(self):
+        remove_db(self._db_path)
+        if self._previous is not None and exists(self._previous):
+            _move_db(self._previous, self._db_path)
+            logging.warning(
+                f"Loading slot '{self._info.name}' failed, restored {self._db_path}"
+            )
+        self._previous = None
+
+
+class SaveSlots:
+    """
+    Named save slots, each a directory of compressed columnar snapshots of
+    the database tables plus a manifest.
+
+    Saves are incremental. A table is not read when the database's
+    TableChanges show no write to it since the slot was saved and its row
+    count and max rowid still match the manifest, and a table that is read
+    is not compressed or written again when its content digest matches.
+    Loads rebuild the working database from the saved schema and tables,
+    the deferred tables can be hydrated later so a game is playable before
+    everything is read.
+
+    Manifests are stamped with the alembic revision and each table's row
+    count, file size and CRC. Loads check the sizes and CRCs, then build
+    the database next to the working one, checking each table's row count
+    as it is read and running any migrations added since the slot was
+    saved, and only then replace the working database.
+
+    The database is built in an on-disk file rather than hydrated in
+    memory: the working database has to stay untouched until the load has
+    succeeded, and once swapped in the file is what the writer, the shared
+    read engine and the worker threads open by path. An in-memory build
+    would have to be backed up to that file before any of them could use
+    it, writing every table a second time.
+    """
+
+    def __init__(self, saves_dir: str):
+        self._saves_dir = saves_dir
+
+    @property
+    def saves_dir(self):
+        return self._saves_dir
+
+    def slot_dir(self, slot: str):
+        if not slot or any(c in slot for c in "/\\") or slot.startswith("."):
+            raise ValueError(f"Invalid save slot name: '{slot}'")
+        return join(self._saves_dir, slot)
+
+    def get_slot(self, slot: str) -> SlotInfo | None:
+        path = join(self.slot_dir(slot), MANIFEST_NAME)
+        if not exists(path):
+            return None
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        return SlotInfo(**manifest["info"])
+
+    def list_slots(self):
+        """
+        Saved slots, most recently saved first
+        """
+        if not isdir(self._saves_dir):
+            return []
+        slots = [self.get_slot(name) for name in listdir(self._saves_dir)]
+        slots = [s for s in slots if s is not None]
+        slots.sort(key=lambda s: s.saved_at, reverse=True)
+        return slots
+
+    def delete(self, slot: str):
+        if isdir(self.slot_dir(slot)):
+            rmtree(self.slot_dir(slot))
+
+    def _read_manifest(self, slot: str):
+        path = join(self.slot_dir(slot), MANIFEST_NAME)
+        if not exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    @timer
+    def save(self, slot: str, db_path: str, state: str | None = None):
+        """
+        Snapshot the committed content of *db_path* to *slot*, only tables
+        that may have changed since the slot was last saved are read
+        """
+        slot_dir = self.slot_dir(slot)
+        makedirs(slot_dir, exist_ok=True)
+        previous = self._read_manifest(slot) or {}
+        previous_tables = previous.get("info", {}).get("tables", {})
+
+        # versions before reading, a write committed while the tables are
+        # read leaves the slot's versions behind so the next save reads it
+        generation, versions = get_table_changes(db_path).snapshot()
+        same_generation = previous.get("info", {}).get("generation") == generation
+
+        engine = create_db_engine(db_path)
+        tables, read, written = {}, 0, 0
+        try:
+            with engine.connect() as conn:
+                schema = [
+                    list(r)
+                    for r in conn.exec_driver_sql(
+                        "SELECT type, name, tbl_name, sql FROM sqlite_master "
+                        "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+                        "ORDER BY type DESC, rowid"
+                    )
+                ]
+                for _, name, _, _ in (s for s in schema if s[0] == "table"):
+                    version = versions.get(name, 0)
+                    count, max_rowid = conn.exec_driver_sql(
+                        f"SELECT count(*), max(rowid) FROM {_quote(name)}"
+                    ).first()
+                    table = previous_tables.get(name, {})
+                    if (
+                        same_generation
+                        and table.get("version") == version
+                        and table.get("rows") == count
+                        and table.get("max_rowid") == max_rowid
+                        and exists(join(slot_dir, table["file"]))
+                    ):
+                        tables[name] = table
+                        continue
+
+                    result = conn.exec_driver_sql(
+                        f"SELECT * FROM {_quote(name)} ORDER BY rowid"
+                    )
+                    columns = list(result.keys())
+                    rows = result.fetchall()
+                    read += 1
+                    payload = _encode_table(columns, rows)
+                    digest = sha256(payload).hexdigest()
+                    # content addressed, the previous manifest's files stay
+                    # valid until the new manifest replaces it
+                    file_name = f"{name}-{digest[:16]}.tbl"
+                    path = join(slot_dir, file_name)
+                    if table.get("file") != file_name or not exists(path):
+                        data = zlib.compress(payload, COMPRESSION_LEVEL)
+                        with open(path, "wb") as f:
+                            f.write(data)
+                        table = {
+                            "file": file_name,
+                            "digest": digest,
+                            "rows": len(rows),
+                            "bytes": len(data),
+                            "crc32": zlib.crc32(data),
+                        }
+                        written += 1
+                    tables[name] = dict(table, version=version, max_rowid=max_rowid)
+
+                season, week = conn.exec_driver_sql(
+                    "SELECT seasons.year, world.current_week FROM world "
+                    "JOIN seasons ON seasons.id = world.season_id"
+                ).first() or (None, None)
+                revision = current_revision(conn)
+        finally:
+            engine.dispose()
+
+        info = SlotInfo(
+            name=slot,
+            saved_at=datetime.now().isoformat(timespec="seconds"),
+            season=season,
+            week=week,
+            state=state,
+            revision=revision,
+            size=sum(t["bytes"] for t in tables.values()),
+            tables=tables,
+            generation=generation,
+        )
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "schema": schema,
+            "schema_digest": _schema_digest(schema),
+            "info": asdict(info),
+        }
+        manifest_path = join(slot_dir, MANIFEST_NAME)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=1)
+        replace(manifest_path + ".tmp", manifest_path)
+
+        # drop the snapshots only the previous manifest used
+        files = {t["file"] for t in tables.values()}
+        for table in previous_tables.values():
+            if table["file"] not in files and exists(join(slot_dir, table["file"])):
+                remove(join(slot_dir, table["file"]))
+        logging.info(
+            f"Saved slot '{slot}': {read} of {len(tables)} tables read, "
+            f"{written} changed, {info.size} bytes"
+        )
+        return info
+
+    def validate(self, slot: str):
+        """
+        Fast integrity check of *slot* without reading its tables: the
+        manifest's version, schema digest and revision, and the presence
+        and size of every table file. Returns the manifest.
+        """
+        manifest = self._read_manifest(slot)
+        if manifest is None:
+            raise FileNotFoundError(f"No save slot '{slot}' in {self._saves_dir}")
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported save slot version in '{slot}'")
+        if manifest.get("schema_digest") != _schema_digest(manifest["schema"]):
+            raise ValueError(f"Save slot '{slot}' schema does not match its digest")
+
+        revision = manifest["info"].get("revision")
+        if revision is not None and not is_known_revision(revision):
+            raise ValueError(
+                f"Save slot '{slot}' has unknown schema revision {revision}"
+            )
+
+        slot_dir = self.slot_dir(slot)
+        for name, table in manifest["info"]["tables"].items():
+            path = join(slot_dir, table["file"])
+            if not exists(path) or getsize(path) != table["bytes"]:
+                raise ValueError(
+                    f"Save slot '{slot}' table {name} is missing or truncated"
+                )
+        return manifest
+
+    @timer
+    def load(self, slot: str, db_path: str, lazy: bool = True):
+        """
+        Rebuild *db_path* from *slot* in an on-disk database next to it,
+        replacing any existing database once the slot has loaded. With *lazy* the deferred tables are left to the
+        returned TableHydration's finish(), which must run before they are
+        used and puts the replaced database back if they fail to load. A
+        slot saved at an older schema revision is loaded in full and
+        migrated to the current one.
+        """
+        manifest = self.validate(slot)
+        info = SlotInfo(**manifest["info"])
+        migrate = info.revision != head_revision()
+        # every file's CRC up front, so a corrupt deferred table fails the
+        # load before the working database is replaced
+        self._check_crcs(info, info.tables)
+
+        loading = db_path + LOADING_SUFFIX
+        remove_db(loading)
+        try:
+            engine = create_db_engine(loading)
+            try:
+                with engine.begin() as conn:
+                    for type_, _, _, sql in manifest["schema"]:
+                        if type_ == "table":
+                            conn.exec_driver_sql(sql)
+            finally:
+                engine.dispose()
+
+            # migrations may change the deferred tables, so they are not deferred
+            lazy = lazy and not migrate
+            deferred = [t for t in DEFERRED_TABLES if t in info.tables] if lazy else []
+            first = [t for t in info.tables if t not in deferred]
+            self._hydrate(info, loading, first, manifest["schema"])
+            if migrate:
+                engine = create_db_engine(loading)
+                try:
+                    with engine.begin() as conn:
+                        ensure_schema(conn)
+                finally:
+                    engine.dispose()
+        except BaseException:
+            remove_db(loading)
+            raise
+
+        previous = None
+        if deferred and exists(db_path):
+            previous = db_path + PREVIOUS_SUFFIX
+            _move_db(db_path, previous)
+        _move_db(loading, db_path)
+        hydration = TableHydration(self, info, db_path, deferred, previous)
+        logging.info(
+            f"Loaded slot '{slot}', {len(deferred)} tables deferred: "
+            f"{', '.join(deferred)}"
+        )
+        return hydration
+
+    def _check_crcs(self, info: SlotInfo, table_names):
+        slot_dir = self.slot_dir(info.name)
+        for name in table_names:
+            with open(join(slot_dir, info.tables[name]["file"]), "rb") as f:
+                if zlib.crc32(f.read()) != info.tables[name]["crc32"]:
+                    raise ValueError(f"Save slot '{info.name}' table {name} is corrupt")
+
+    def _hydrate(self, info: SlotInfo, db_path: str, table_names, schema=None):
+        if schema is None:
+            schema = self._read_manifest(info.name)["schema"]
+        slot_dir = self.slot_dir(info.name)
+        engine = create_db_engine(db_path)
+        try:
+            with engine.begin() as conn:
+                for name in table_names:
+                    table = info.tables[name]
+                    with open(join(slot_dir, table["file"]), "rb") as f:
+                        data = f.read()
+                    if zlib.crc32(data) != table["crc32"]:
+                        raise ValueError(
+                            f"Save slot '{info.name}' table {name} is corrupt"
+                        )
+                    columns, rows = _decode_table(data)
+                    if len(rows) != table["rows"]:
+                        raise ValueError(
+                            f"Save slot '{info.name}' table {name} has "
+                            f"{len(rows)} rows, {table['rows']} were saved"
+                        )
+                    if rows:
+                        conn.exec_driver_sql(
+                            f"INSERT INTO {_quote(name)} "
+                            f"({', '.join(_quote(c) for c in columns)}) "
+                            f"VALUES ({', '.join('?' * len(columns))})",
+                            rows,
+                        )
+                # indexes after the data, building them is cheaper than
+                # maintaining them row by row
+                for type_, _, tbl_name, sql in schema:
+                    if type_ == "index" and tbl_name in table_names:
+                        conn.exec_driver_sql(sql)
+        finally:
+            engine.dispose()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+from functools import cache
+import logging
+from os.path import abspath, dirname, join
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.util import CommandError
+from sqlalchemy import create_engine
+
+from .models import Base
+
+
+# the repository's alembic environment, migrations in alembic/versions
+ALEMBIC_DIR = join(dirname(dirname(dirname(dirname(abspath(__file__))))), "alembic")
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    A database whose schema cannot be brought to the current models
+    """
+
+
+def alembic_config(connection=None):
+    """
+    Alembic config of the repository migrations, env.py runs them on
+    *connection* when given
+    """
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+@cache
+def script_directory():
+    return ScriptDirectory.from_config(alembic_config())
+
+
+def head_revision():
+    return script_directory().get_current_head()
+
+
+def is_known_revision(revision: str | None):
+    try:
+        return revision is not None and script_directory().get_revision(revision)
+    except CommandError:
+        return False
+
+
+def current_revision(connection):
+    """
+    Alembic revision stamped in the database, None when unstamped
+    """
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def stamp_head(connection):
+    """
+    Mark a database created from the current models as up to date
+    """
+    MigrationContext.configure(connection).stamp(script_directory(), "head")
+
+
+def _copy_schema(source, target):
+    for (sql,) in source.exec_driver_sql(
+        "SELECT sql FROM sqlite_master "
+        "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+    ):
+        target.exec_driver_sql(sql)
+
+
+def matching_revision(connection):
+    """
+    Revision an unstamped database's schema is at, the newest one whose
+    migrations bring it to the models. Each candidate is tried on an in
+    memory copy of the schema, None when no revision matches.
+    """
+    for script in script_directory().walk_revisions():
+        engine = create_engine("sqlite://")
+        try:
+            with engine.connect() as copy:
+                _copy_schema(connection, copy)
+                MigrationContext.configure(copy).stamp(
+                    script_directory(), script.revision
+                )
+                command.upgrade(alembic_config(copy), "head")
+                if not compare_metadata(
+                    MigrationContext.configure(copy), Base.metadata
+                ):
+                    return script.revision
+        except Exception as e:
+            logging.debug(f"Schema does not upgrade from {script.revision}: {e}")
+        finally:
+            engine.dispose()
+    return None
+
+
+def ensure_schema(connection):
+    """
+    Bring the database on *connection* to the head revision, returns the
+    revision it was at.
+
+    A stamped database is checked by its revision alone, pending
+    migrations are run. An unstamped one, created before databases were
+    stamped, is stamped at the revision its schema matches and upgraded
+    from there.
+    """
+    revision = current_revision(connection)
+    head = head_revision()
+    if revision == head:
+        return revision
+
+    if revision is None:
+        matched = matching_revision(connection)
+        if matched is None:
+            diffs = compare_metadata(
+                MigrationContext.configure(connection), Base.metadata
+            )
+            raise SchemaVersionError(
+                f"Unversioned database does not match any migration: {diffs[:3]}"
+            )
+        MigrationContext.configure(connection).stamp(script_directory(), matched)
+        logging.info(f"Stamped unversioned database at {matched}")
+        if matched != head:
+            logging.info(f"Upgrading database from {matched} to {head}")
+            command.upgrade(alembic_config(connection), "head")
+        return revision
+
+    if not is_known_revision(revision):
+        raise SchemaVersionError(
+            f"Database revision {revision} is not one of the migrations, "
+            f"it was saved by a newer or different version of the game"
+        )
+    logging.info(f"Upgrading database from {revision} to {head}")
+    command.upgrade(alembic_config(connection), "head")
+    return revision
@@ -0,0 +1,269 @@
+from __future__ import annotations
+from contextlib import contextmanager
+import logging
+from os import makedirs
+from os.path import basename, dirname, exists, join, splitext
+
+from sqlalchemy import MetaData, select, insert, delete, func, desc, asc
+
+
+from src.core.utils import timer
+
+from .models import (
+    Base,
+    SeasonDB,
+    ClubDB,
+    CompetitionRegisterDB,
+    FixtureDB,
+    ResultDB,
+    MatchEventDB,
+    SeasonArchiveDB,
+    LeagueTableArchiveDB,
+)
+from .league_db_functions import get_league_table_data
+from .db_worker import DatabaseWorker
+from .utils import create_db_engine, remove_db
+
+
+ARCHIVE_SCHEMA = "archive"
+
+# per season tables moved to the archive, in delete order
+ARCHIVED_TABLES = [
+    MatchEventDB.__table__,
+    ResultDB.__table__,
+    FixtureDB.__table__,
+    CompetitionRegisterDB.__table__,
+]
+
+_archive_metadata = MetaData()
+_archive = {
+    t.name: t.to_metadata(_archive_metadata, schema=ARCHIVE_SCHEMA)
+    for t in ARCHIVED_TABLES
+}
+
+
+def archive_table(name: str):
+    """
+    Table of the attached archive schema, for statements run on an
+    archive_connection
+    """
+    return _archive[name]
+
+
+def _season_filter(table, season_id: int):
+    if table is ResultDB.__table__:
+        return table.c.id.in_(
+            select(FixtureDB.id).where(FixtureDB.season_id == season_id)
+        )
+    return table.c.season_id == season_id
+
+
+class SeasonArchiver:
+    """
+    Moves closed seasons out of the live database into per-season SQLite
+    files, so live fixture/result queries do not grow with save history.
+
+    The final league tables are kept in the live database, the archived
+    fixtures, results and events are read back on demand by attaching the
+    season's archive file.
+    """
+
+    def __init__(self, worker: DatabaseWorker, archive_dir: str | None = None):
+        self._worker = worker
+        self._archive_dir = archive_dir or join(dirname(worker.db_path), "archive")
+
+    @property
+    def worker(self):
+        return self._worker
+
+    @property
+    def archive_dir(self):
+        return self._archive_dir
+
+    def archive_path(self, season: SeasonDB):
+        db_name = splitext(basename(self.worker.db_path))[0]
+        return join(self.archive_dir, f"{db_name}_season_{season.year:03d}.db")
+
+    def get_archives(self):
+        return self.worker.session.scalars(
+            select(SeasonArchiveDB).order_by(asc(SeasonArchiveDB.season_id))
+        ).all()
+
+    def get_archive(self, season_id: int):
+        return self.worker.session.get(SeasonArchiveDB, season_id)
+
+    def archivable_seasons(self, keep_seasons: int):
+        """
+        Closed seasons, older than the world's current season and the
+        *keep_seasons* before it, that are not yet archived
+        """
+        world = self.worker.get_world()
+        if world is None or world.season is None:
+            return []
+        return self.worker.session.scalars(
+            select(SeasonDB)
+            .where(SeasonDB.year < world.season.year)
+            .where(~SeasonDB.id.in_(select(SeasonArchiveDB.season_id)))
+            .order_by(desc(SeasonDB.year))
+            .offset(keep_seasons)
+        ).all()
+
+    def archive_old_seasons(self, keep_seasons: int):
+        seasons = self.archivable_seasons(keep_seasons)
+        for season in seasons:
+            self.archive_season(season)
+        return len(seasons)
+
+    @timer
+    def archive_season(self, season: SeasonDB):
+        logging.info(f"Archiving {season}...")
+        session = self.worker.session
+        path = self.archive_path(season)
+
+        table_rows = []
+        for league in self.worker.get_leagues():
+            for ix, d in enumerate(get_league_table_data(league, season)):
+                table_rows.append(
+                    {
+                        "season_id": season.id,
+                        "competition_id": league.id,
+                        "position": ix + 1,
+                        "club_id": d["club"].id,
+                        **{
+                            k: d[k]
+                            for k in ["ply", "w", "d", "l", "gf", "ga", "gd", "pts"]
+                        },
+                    }
+                )
+        fixture_count = session.scalar(
+            select(func.count())
+            .select_from(FixtureDB)
+            .where(FixtureDB.season_id == season.id)
+        )
+
+        if not exists(self.archive_dir):
+            makedirs(self.archive_dir)
+        remove_db(path)
+        archive_engine = create_db_engine(path)
+        Base.metadata.create_all(archive_engine, tables=ARCHIVED_TABLES)
+        archive_engine.dispose()
+
+        # the final tables and the index row are written in the transaction
+        # that moves the season, so it is only recorded as archived once its
+        # rows have left the live database
+        with self._attached(path) as conn:
+            if table_rows:
+                conn.execute(insert(LeagueTableArchiveDB), table_rows)
+            conn.execute(
+                insert(SeasonArchiveDB).values(
+                    season_id=season.id, path=path, fixture_count=fixture_count
+                )
+            )
+            for table in ARCHIVED_TABLES:
+                conn.execute(
+                    insert(_archive[table.name]).from_select(
+                        [c.name for c in table.c],
+                        select(table).where(_season_filter(table, season.id)),
+                    )
+                )
+            for table in ARCHIVED_TABLES:
+                conn.execute(delete(table).where(_season_filter(table, season.id)))
+            conn.commit()
+
+        # drop any archived objects still held in the identity map
+        self.worker.close_session()
+        logging.info(f"Archived {fixture_count} fixtures of {season} to '{path}'")
+
+    @contextmanager
+    def _attached(self, path: str):
+        # ATTACH cannot run inside a transaction so use a dedicated connection
+        # rather than the worker's session
+        self.worker.session.commit()
+        with self.worker.session.get_bind().connect() as conn:
+            conn.exec_driver_sql(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+            conn.commit()
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+                conn.exec_driver_sql(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+    @contextmanager
+    def archive_connection(self, season_id: int):
+        """
+        Connection with the season's archive file attached as the archive
+        schema, None when the season is not archived
+        """
+        archive = self.get_archive(season_id)
+        if archive is None:
+            yield None
+            return
+        with self._attached(archive.path) as conn:
+            yield conn
+
+    def get_final_table(self, season_id: int, competition_id: int):
+        return self.worker.session.scalars(
+            select(LeagueTableArchiveDB)
+            .where(LeagueTableArchiveDB.season_id == season_id)
+            .where(LeagueTableArchiveDB.competition_id == competition_id)
+            .order_by(asc(LeagueTableArchiveDB.position))
+        ).all()
+
+    def get_champions(self, season_id: int):
+        return self.worker.session.scalars(
+            select(LeagueTableArchiveDB)
+            .where(LeagueTableArchiveDB.season_id == season_id)
+            .where(LeagueTableArchiveDB.position == 1)
+        ).all()
+
+    def get_archived_results(self, season_id: int):
+        """
+        Fixtures and scores of an archived season as column tuples
+        """
+        archive = self.get_archive(season_id)
+        if archive is None:
+            return []
+
+        fixtures, results = _archive["fixtures"], _archive["results"]
+        home_club = ClubDB.__table__.alias("home_club")
+        away_club = ClubDB.__table__.alias("away_club")
+        stmt = (
+            select(
+                fixtures.c.id,
+                fixtures.c.competition_id,
+                fixtures.c.competition_round,
+                fixtures.c.season_week,
+                fixtures.c.home_club_id,
+                home_club.c.name.label("home_club"),
+                fixtures.c.away_club_id,
+                away_club.c.name.label("away_club"),
+                results.c.home_score,
+                results.c.away_score,
+            )
+            .join(home_club, home_club.c.id == fixtures.c.home_club_id)
+            .join(away_club, away_club.c.id == fixtures.c.away_club_id)
+            .outerjoin(results, results.c.id == fixtures.c.id)
+            .order_by(fixtures.c.season_week, fixtures.c.id)
+        )
+        with self._attached(archive.path) as conn:
+            return conn.execute(stmt).all()
+
+    def get_archived_match_events(self, season_id: int, person_id: int | None = None):
+        archive = self.get_archive(season_id)
+        if archive is None:
+            return []
+
+        events = _archive["match_events"]
+        stmt = select(
+            events.c.fixture_id,
+            events.c.competition_id,
+            events.c.club_id,
+            events.c.person_id,
+            events.c.event_type,
+            events.c.minute,
+            events.c.value,
+        ).order_by(events.c.fixture_id, events.c.minute)
+        if person_id is not None:
+            stmt = stmt.where(events.c.person_id == person_id)
+        with self._attached(archive.path) as conn:
+            return conn.execute(stmt).all()
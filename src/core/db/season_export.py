@@ -0,0 +1,369 @@
+from __future__ import annotations
+import csv
+from enum import Enum
+import json
+import logging
+from os import makedirs
+from os.path import join
+
+from sqlalchemy import Boolean, Integer, literal, select, asc
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+from src.core.utils import timer
+
+from .models import (
+    SeasonDB,
+    ClubDB,
+    CompetitionDB,
+    ContractDB,
+    PersonDB,
+    PlayerDB,
+    FixtureDB,
+    LeagueDB,
+    LeagueTableArchiveDB,
+)
+from .league_db_functions import league_standings_select
+from .db_worker import DatabaseWorker
+from .season_archive import SeasonArchiver, archive_table
+
+
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+DATASETS = ["fixtures", "results", "standings", "squads"]
+
+# rows fetched per round trip and written per parquet row group
+EXPORT_BATCH = 2000
+
+
+def _fixtures_select(fixtures, season: SeasonDB, played_only: bool = False):
+    home_club, away_club = ClubDB.__table__.alias(), ClubDB.__table__.alias()
+    stmt = (
+        select(
+            literal(season.year).label("season"),
+            fixtures.c.season_week.label("week"),
+            fixtures.c.id.label("fixture_id"),
+            CompetitionDB.short_name.label("competition"),
+            fixtures.c.competition_round.label("round"),
+            fixtures.c.home_club_id,
+            home_club.c.name.label("home_club"),
+            fixtures.c.away_club_id,
+            away_club.c.name.label("away_club"),
+            fixtures.c.played,
+            fixtures.c.home_score,
+            fixtures.c.away_score,
+        )
+        .join(CompetitionDB, CompetitionDB.id == fixtures.c.competition_id)
+        .join(home_club, home_club.c.id == fixtures.c.home_club_id)
+        .join(away_club, away_club.c.id == fixtures.c.away_club_id)
+        .where(fixtures.c.season_id == season.id)
+        .order_by(fixtures.c.season_week, fixtures.c.id)
+    )
+    if played_only:
+        stmt = stmt.where(fixtures.c.played == True)
+    return stmt
+
+
+def _standings_select(season: SeasonDB, league_ids):
+    table = league_standings_select(season.id, league_ids).subquery()
+    return (
+        select(
+            literal(season.year).label("season"),
+            CompetitionDB.short_name.label("competition"),
+            table.c.position,
+            table.c.club_id,
+            table.c.name.label("club"),
+            table.c.ply,
+            table.c.w,
+            table.c.d,
+            table.c.l,
+            table.c.gf,
+            table.c.ga,
+            table.c.gd,
+            table.c.pts,
+        )
+        .join(CompetitionDB, CompetitionDB.id == table.c.competition_id)
+        .order_by(table.c.competition_id, table.c.position)
+    )
+
+
+def _archived_standings_select(season: SeasonDB):
+    table = LeagueTableArchiveDB
+    return (
+        select(
+            literal(season.year).label("season"),
+            CompetitionDB.short_name.label("competition"),
+            table.position,
+            table.club_id,
+            ClubDB.name.label("club"),
+            table.ply,
+            table.w,
+            table.d,
+            table.l,
+            table.gf,
+            table.ga,
+            table.gd,
+            table.pts,
+        )
+        .join(CompetitionDB, CompetitionDB.id == table.competition_id)
+        .join(ClubDB, ClubDB.id == table.club_id)
+        .where(table.season_id == season.id)
+        .order_by(table.competition_id, table.position)
+    )
+
+
+def _squads_select(season: SeasonDB):
+    return (
+        select(
+            literal(season.year).label("season"),
+            ContractDB.club_id,
+            ClubDB.name.label("club"),
+            PlayerDB.person_id,
+            PersonDB.first_name,
+            PersonDB.last_name,
+            PersonDB.age,
+            PlayerDB.position,
+            PlayerDB.ability,
+        )
+        .join(ClubDB, ClubDB.id == ContractDB.club_id)
+        .join(PlayerDB, PlayerDB.person_id == ContractDB.person_id)
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .order_by(ContractDB.club_id, PlayerDB.person_id)
+    )
+
+
+def _columns_select(dataset: str):
+    """
+    A statement with *dataset*'s columns, the header of its file whether or
+    not any season has rows
+    """
+    season = SeasonDB(id=0, year=0)
+    if dataset in ("fixtures", "results"):
+        return _fixtures_select(FixtureDB.__table__, season)
+    if dataset == "standings":
+        return _standings_select(season, [])
+    if dataset == "squads":
+        return _squads_select(season)
+    raise ValueError(f"Unknown dataset: {dataset}")
+
+
+def _export_value(value):
+    return value.name if isinstance(value, Enum) else value
+
+
+class ExportWriter:
+    """
+    Writes a dataset's rows to *path*. Used as a context manager, the file
+    is created with its header on entering, even if no rows follow, and
+    closed on leaving however the block exits.
+    """
+
+    def __init__(self, path: str, columns):
+        self._path = path
+        self._columns = columns
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class CsvExportWriter(ExportWriter):
+    def open(self):
+        self._file = open(self._path, "w", newline="")
+        try:
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self._columns)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlExportWriter(ExportWriter):
+    """
+    JSON lines have no header, an empty dataset is an empty file
+    """
+
+    def open(self):
+        self._file = open(self._path, "w")
+
+    def write_rows(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(dict(zip(self._columns, row))) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExportWriter(ExportWriter):
+    """
+    Writes each batch of rows as a parquet row group, the schema comes from
+    the select statement's column types so nulls in a batch cannot change it.
+    An empty dataset is a file with the schema and no row groups.
+    """
+
+    def __init__(self, path: str, columns, column_types):
+        super().__init__(path, columns)
+        self._schema = pyarrow.schema(
+            [
+                (name, self._arrow_type(sql_type))
+                for name, sql_type in zip(columns, column_types)
+            ]
+        )
+
+    @staticmethod
+    def _arrow_type(sql_type):
+        if isinstance(sql_type, Boolean):
+            return pyarrow.bool_()
+        if isinstance(sql_type, Integer):
+            return pyarrow.int64()
+        return pyarrow.string()
+
+    def open(self):
+        self._writer = pyarrow.parquet.ParquetWriter(self._path, self._schema)
+
+    def write_rows(self, rows):
+        columns = list(zip(*rows))
+        self._writer.write_table(
+            pyarrow.Table.from_arrays(
+                [pyarrow.array(c, type=t) for c, t in zip(columns, self._schema.types)],
+                schema=self._schema,
+            )
+        )
+
+    def close(self):
+        self._writer.close()
+
+
+class SeasonExporter:
+    """
+    Streams fixtures, results, standings and squads of a range of seasons
+    to one file per dataset, as CSV, JSON lines or Parquet (needs pyarrow).
+
+    Rows are read with yield_per cursors and written a batch at a time, so
+    memory stays flat however many seasons are exported. Archived seasons
+    are read from their archive files, with the final tables kept in the
+    live database. Squads are not kept per season, only the current season
+    has them.
+    """
+
+    def __init__(
+        self,
+        worker: DatabaseWorker,
+        output_dir: str,
+        export_format: str = "csv",
+        batch_size: int = EXPORT_BATCH,
+    ):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        if export_format == "parquet" and pyarrow is None:
+            raise RuntimeError("Parquet export needs pyarrow installed")
+        self._worker = worker
+        self._output_dir = output_dir
+        self._format = export_format
+        self._batch_size = batch_size
+        self._archiver = SeasonArchiver(worker)
+
+    @property
+    def worker(self):
+        return self._worker
+
+    def seasons(self, first_year: int | None = None, last_year: int | None = None):
+        stmt = select(SeasonDB).order_by(asc(SeasonDB.year))
+        if first_year is not None:
+            stmt = stmt.where(SeasonDB.year >= first_year)
+        if last_year is not None:
+            stmt = stmt.where(SeasonDB.year <= last_year)
+        return self.worker.session.scalars(stmt).all()
+
+    def path(self, dataset: str):
+        return join(self._output_dir, f"{dataset}.{self._format}")
+
+    def _open_writer(self, dataset: str, stmt):
+        columns = [c.name for c in stmt.selected_columns]
+        path = self.path(dataset)
+        if self._format == "csv":
+            return CsvExportWriter(path, columns)
+        if self._format == "jsonl":
+            return JsonlExportWriter(path, columns)
+        return ParquetExportWriter(
+            path, columns, [c.type for c in stmt.selected_columns]
+        )
+
+    def _stream(self, conn, stmt, writer):
+        count = 0
+        result = conn.execute(stmt.execution_options(yield_per=self._batch_size))
+        for batch in result.partitions():
+            writer.write_rows([tuple(_export_value(v) for v in row) for row in batch])
+            count += len(batch)
+        return count
+
+    def _season_statements(self, dataset: str, season: SeasonDB, archived: bool):
+        if dataset in ("fixtures", "results"):
+            fixtures = archive_table("fixtures") if archived else FixtureDB.__table__
+            return _fixtures_select(fixtures, season, dataset == "results")
+        if dataset == "standings":
+            if archived:
+                return _archived_standings_select(season)
+            league_ids = self.worker.session.scalars(select(LeagueDB.id)).all()
+            return _standings_select(season, league_ids)
+        if dataset == "squads":
+            current = self.worker.get_current_season()
+            return _squads_select(season) if season.id == current.id else None
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+    @timer
+    def export(
+        self,
+        first_year: int | None = None,
+        last_year: int | None = None,
+        datasets=DATASETS,
+    ):
+        """
+        Export *datasets* of the seasons from *first_year* to *last_year*,
+        inclusive with None unbounded, returns {dataset: rows written}
+        """
+        makedirs(self._output_dir, exist_ok=True)
+        seasons = self.seasons(first_year, last_year)
+        archived = {a.season_id for a in self._archiver.get_archives()}
+        counts = {}
+        for dataset in datasets:
+            counts[dataset] = 0
+            with self._open_writer(dataset, _columns_select(dataset)) as writer:
+                for season in seasons:
+                    is_archived = season.id in archived
+                    stmt = self._season_statements(dataset, season, is_archived)
+                    if stmt is None:
+                        continue
+                    if is_archived and dataset != "standings":
+                        with self._archiver.archive_connection(season.id) as conn:
+                            counts[dataset] += self._stream(conn, stmt, writer)
+                    else:
+                        counts[dataset] += self._stream(
+                            self.worker.session, stmt, writer
+                        )
+            logging.info(
+                f"Exported {counts[dataset]} {dataset} rows to {self.path(dataset)}"
+            )
+        return counts
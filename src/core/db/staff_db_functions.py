@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import NamedTuple
+
+from sqlalchemy import case, delete, func, insert, literal, select
+
+from src.core.ability import MAX_ABILITY
+from src.core.game_types import ReputationLevel, StaffRole
+
+from src.core.db.models import ClubModifierDB, ContractDB, StaffDB
+
+
+# A role's rating at a club is the average of its staff's ability plus
+# REPUTATION_RATING per reputation level. Ratings are measured from
+# NEUTRAL_RATING, a club without anyone in a role gets the neutral rating.
+NEUTRAL_RATING = MAX_ABILITY / 2
+REPUTATION_RATING = 2.5
+
+# modifier gained by a role rated MAX_ABILITY, lost by one rated 0
+MANAGER_MATCH_STRENGTH = 0.1
+COACH_MATCH_STRENGTH = 0.05
+COACH_DEVELOPMENT = 0.25
+PHYSIO_INJURY_RECOVERY = 0.3
+
+
+class ClubModifiers(NamedTuple):
+    match_strength: float = 1.0
+    development: float = 1.0
+    injury_recovery: float = 1.0
+
+
+NEUTRAL_MODIFIERS = ClubModifiers()
+
+
+def role_ratings_select():
+    """
+    Rating of each role at each club, a (club_id, role, rating) row per
+    club and role
+    """
+    reputation = case(
+        *[(StaffDB.reputation_type == r, r.value) for r in ReputationLevel],
+        else_=0,
+    )
+    return (
+        select(
+            ContractDB.club_id,
+            StaffDB.role,
+            func.avg(StaffDB.ability + REPUTATION_RATING * reputation).label("rating"),
+        )
+        .join(StaffDB, StaffDB.person_id == ContractDB.person_id)
+        .where(ContractDB.club_id.is_not(None))
+        .group_by(ContractDB.club_id, StaffDB.role)
+    )
+
+
+def club_modifiers_select(week: int):
+    """
+    ClubModifierDB rows of every club with staff, the role ratings pivoted
+    to a row per club and turned into modifiers in the same statement
+    """
+    ratings = role_ratings_select().subquery()
+
+    def role_weight(role: StaffRole):
+        rating = func.coalesce(
+            func.max(case((ratings.c.role == role, ratings.c.rating))),
+            NEUTRAL_RATING,
+        )
+        return (rating - NEUTRAL_RATING) / NEUTRAL_RATING
+
+    manager = role_weight(StaffRole.Manager)
+    coach = role_weight(StaffRole.Coach)
+    physio = role_weight(StaffRole.Physio)
+    return select(
+        ratings.c.club_id,
+        literal(week),
+        1 + MANAGER_MATCH_STRENGTH * manager + COACH_MATCH_STRENGTH * coach,
+        1 + COACH_DEVELOPMENT * coach,
+        1 + PHYSIO_INJURY_RECOVERY * physio,
+    ).group_by(ratings.c.club_id)
+
+
+def update_club_modifiers(session, week: int):
+    """
+    Replace every club's modifiers with ones aggregated from the current
+    staff, in one INSERT ... SELECT, left uncommitted. Returns the number
+    of clubs.
+    """
+    session.execute(delete(ClubModifierDB))
+    session.execute(
+        insert(ClubModifierDB).from_select(
+            [
+                ClubModifierDB.club_id,
+                ClubModifierDB.game_week,
+                ClubModifierDB.match_strength,
+                ClubModifierDB.development,
+                ClubModifierDB.injury_recovery,
+            ],
+            club_modifiers_select(week),
+        )
+    )
+    return session.scalar(select(func.count()).select_from(ClubModifierDB))
+
+
+def club_modifiers(session, club_ids=None):
+    """
+    {club_id: ClubModifiers} of *club_ids*, or of every club, clubs without
+    modifiers are left out and get NEUTRAL_MODIFIERS from their callers
+    """
+    stmt = select(
+        ClubModifierDB.club_id,
+        ClubModifierDB.match_strength,
+        ClubModifierDB.development,
+        ClubModifierDB.injury_recovery,
+    )
+    if club_ids is not None:
+        stmt = stmt.where(ClubModifierDB.club_id.in_(club_ids))
+    return {
+        club_id: ClubModifiers(*modifiers)
+        for club_id, *modifiers in session.execute(stmt)
+    }
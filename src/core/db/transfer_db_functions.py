@@ -0,0 +1,260 @@
+from __future__ import annotations
+from random import shuffle
+from typing import NamedTuple
+
+
+from sqlalchemy import desc, exists, insert, select, update
+
+from src.core.game_types import (
+    ContractType,
+    MatchFormation,
+    Position,
+    StaffRole,
+)
+
+from src.core.db.models import (
+    ContractDB,
+    PersonDB,
+    PlayerDB,
+    StaffDB,
+    TransferDB,
+    WorldDB,
+)
+from src.core.db.contract_db_functions import RELEASE_AGE, contract_length
+
+
+# weeks of the season the transfer window runs in, the first is the
+# pre-season window
+TRANSFER_WINDOW_WEEKS = (1, 26)
+
+# players of each outfield line of the formation a squad wants, per place
+SQUAD_DEPTH = 2
+GOALKEEPERS = 2
+# oldest player clubs sign, older ones are released at their next expiry
+MAX_SIGNING_AGE = RELEASE_AGE - 1
+
+POSITIONS = [
+    Position.Goalkeeper,
+    Position.Defender,
+    Position.Midfielder,
+    Position.Attacker,
+]
+
+
+class TransferCandidate(NamedTuple):
+    person_id: int
+    ability: int
+    # selling club, None for free agents
+    club_id: int | None
+
+
+class TransferWindow(NamedTuple):
+    signed: list[int]
+    transferred: list[int]
+    # clubs whose squads changed, buying and selling
+    club_ids: list[int]
+
+
+def squad_targets(formation: MatchFormation | None):
+    """
+    Players wanted per position for a manager's preferred *formation*
+    """
+    formation = formation or MatchFormation.F222
+    return dict(
+        zip(POSITIONS, [GOALKEEPERS] + [n * SQUAD_DEPTH for n in formation.value])
+    )
+
+
+def free_agent_candidates_select(position: Position, limit: int):
+    """
+    Best *limit* free agents of *position* young enough to sign, walks the
+    players (position, ability) index from the top
+    """
+    return (
+        select(PlayerDB.person_id, PlayerDB.ability)
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .where(PlayerDB.position == position)
+        .where(PlayerDB.retired.is_(False))
+        .where(PersonDB.age <= MAX_SIGNING_AGE)
+        .where(~exists().where(ContractDB.person_id == PlayerDB.person_id))
+        .order_by(desc(PlayerDB.ability))
+        .limit(limit)
+    )
+
+
+def _club_squads(session):
+    """
+    {club_id: [(person_id, position, ability, age)]} of every contracted
+    player, in one query
+    """
+    squads = {}
+    for club_id, *player in session.execute(
+        select(
+            ContractDB.club_id,
+            PlayerDB.person_id,
+            PlayerDB.position,
+            PlayerDB.ability,
+            PersonDB.age,
+        )
+        .join(PlayerDB, PlayerDB.person_id == ContractDB.person_id)
+        .join(PersonDB, PersonDB.id == PlayerDB.person_id)
+        .where(ContractDB.club_id.is_not(None))
+    ):
+        squads.setdefault(club_id, []).append(tuple(player))
+    return squads
+
+
+def _club_formations(session):
+    return dict(
+        session.execute(
+            select(ContractDB.club_id, StaffDB.prefered_formation)
+            .join(StaffDB, StaffDB.person_id == ContractDB.person_id)
+            .where(StaffDB.role == StaffRole.Manager)
+        ).all()
+    )
+
+
+def _squad_gaps(squads, formations):
+    """
+    {club_id: [position, ...]} of the players each club is short of
+    """
+    gaps = {}
+    for club_id, squad in squads.items():
+        targets = squad_targets(formations.get(club_id))
+        for position in POSITIONS:
+            have = sum(1 for p in squad if p[1] == position)
+            if have < targets[position]:
+                gaps.setdefault(club_id, []).extend(
+                    [position] * (targets[position] - have)
+                )
+    return gaps
+
+
+def _plan_transfers(squads, formations, gaps, free_agents):
+    """
+    Fill the clubs' positional *gaps* from the position's candidates, best
+    first. Candidates are the *free_agents* {position: [(person_id,
+    ability)]} and the players over other clubs' targets, a club never
+    sells below its own target. Returns [(person_id, from_club_id,
+    to_club_id)].
+    """
+    candidates = {p: [] for p in POSITIONS}
+    for club_id, squad in squads.items():
+        targets = squad_targets(formations.get(club_id))
+        for position in POSITIONS:
+            players = sorted(
+                (p for p in squad if p[1] == position), key=lambda p: -p[2]
+            )
+            for person_id, _, ability, age in players[targets[position] :]:
+                if age <= MAX_SIGNING_AGE:
+                    candidates[position].append(
+                        TransferCandidate(person_id, ability, club_id)
+                    )
+    for position, rows in free_agents.items():
+        candidates[position].extend(
+            TransferCandidate(person_id, ability, None) for person_id, ability in rows
+        )
+    for rows in candidates.values():
+        rows.sort(key=lambda c: -c.ability)
+
+    # clubs take turns a player at a time, in a random order each window,
+    # heads skip the candidates already taken
+    moves, taken = [], set()
+    heads = dict.fromkeys(POSITIONS, 0)
+    queue = [(club_id, list(positions)) for club_id, positions in gaps.items()]
+    shuffle(queue)
+    while queue:
+        next_queue = []
+        for club_id, positions in queue:
+            position = positions.pop(0)
+            rows = candidates[position]
+            while (
+                heads[position] < len(rows) and rows[heads[position]].person_id in taken
+            ):
+                heads[position] += 1
+            for ix in range(heads[position], len(rows)):
+                candidate = rows[ix]
+                if candidate.club_id != club_id and candidate.person_id not in taken:
+                    taken.add(candidate.person_id)
+                    moves.append((candidate.person_id, candidate.club_id, club_id))
+                    break
+            if positions:
+                next_queue.append((club_id, positions))
+        queue = next_queue
+    return moves
+
+
+def run_transfer_window(session, week: int):
+    """
+    Resolve every club's transfer window in one batched pass: squads and
+    formations are read in two queries, free agents through the
+    (position, ability) index, and the moves are applied with one bulk
+    insert and one bulk update of contracts, left uncommitted. *week* is
+    the absolute game week new contracts run from.
+    """
+    squads = _club_squads(session)
+    formations = _club_formations(session)
+    gaps = _squad_gaps(squads, formations)
+
+    wanted = {p: 0 for p in POSITIONS}
+    for positions in gaps.values():
+        for position in positions:
+            wanted[position] += 1
+    free_agents = {
+        position: session.execute(free_agent_candidates_select(position, count)).all()
+        for position, count in wanted.items()
+        if count
+    }
+
+    moves = _plan_transfers(squads, formations, gaps, free_agents)
+    if not moves:
+        return TransferWindow([], [], [])
+
+    signed = [
+        {
+            "person_id": person_id,
+            "club_id": to_club_id,
+            "expiry_date": week + contract_length(),
+            "wage": 100,
+            "contract_type": ContractType.Player_Contract,
+        }
+        for person_id, from_club_id, to_club_id in moves
+        if from_club_id is None
+    ]
+    transferred = [
+        {
+            "person_id": person_id,
+            "club_id": to_club_id,
+            "expiry_date": week + contract_length(),
+        }
+        for person_id, from_club_id, to_club_id in moves
+        if from_club_id is not None
+    ]
+    if signed:
+        session.execute(insert(ContractDB), signed)
+    if transferred:
+        session.execute(update(ContractDB), transferred)
+
+    season_id, season_week = session.execute(
+        select(WorldDB.season_id, WorldDB.current_week)
+    ).first()
+    session.execute(
+        insert(TransferDB),
+        [
+            {
+                "season_id": season_id,
+                "season_week": season_week,
+                "person_id": person_id,
+                "from_club_id": from_club_id,
+                "to_club_id": to_club_id,
+            }
+            for person_id, from_club_id, to_club_id in moves
+        ],
+    )
+    club_ids = {to_club_id for _, _, to_club_id in moves}
+    club_ids.update(from_club_id for _, from_club_id, _ in moves if from_club_id)
+    return TransferWindow(
+        [c["person_id"] for c in signed],
+        [c["person_id"] for c in transferred],
+        sorted(club_ids),
+    )
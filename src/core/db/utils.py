@@ -1,18 +1,148 @@
 import logging
-from os.path import exists
+from os.path import exists, realpath
 from os import remove
+import re
+from threading import Lock
+from uuid import uuid4
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
 
-from .models import Base
+from .models import Base, PersonDB
+from .schema_version import ensure_schema, stamp_head
 
 
 DATABASE_PATH = "var/football.db"
 
 
+# SQLite files written alongside the database in WAL mode
+WAL_SUFFIXES = ["-wal", "-shm"]
+
+# read only engines shared by the read sessions of each database
+_read_engines = {}
+# change trackers shared by every engine of each database
+_table_changes = {}
+
+# statements writing to a table, the table is in the main schema when the
+# schema group is empty or main
+_WRITE_STATEMENT = re.compile(
+    r"\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    r"|DELETE\s+FROM)\s+(?:\"?(\w+)\"?\.)?\"?(\w+)\"?",
+    re.IGNORECASE,
+)
+# statements that leave the content of the main schema's tables as it was
+_READ_STATEMENT = re.compile(
+    r"\s*(?:SELECT|PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|EXPLAIN"
+    r"|ATTACH|DETACH)\b",
+    re.IGNORECASE,
+)
+
+
+def _enable_wal(dbapi_connection, _connection_record):
+    # WAL lets readers keep a consistent snapshot while the writer commits
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _enable_query_only(dbapi_connection, _connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+    # let the begin event below start transactions, pysqlite only starts
+    # them before writes so reads would not share a snapshot
+    dbapi_connection.isolation_level = None
+
+
+def _begin_snapshot(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def _statement_tables(statement: str):
+    """
+    Main schema tables *statement* writes to, None when that cannot be
+    told from the statement, e.g. DDL
+    """
+    match = _WRITE_STATEMENT.match(statement)
+    if match:
+        schema, table = match.groups()
+        return {table} if schema in (None, "main") else set()
+    if _READ_STATEMENT.match(statement):
+        return set()
+    if statement.lstrip()[:4].upper() == "WITH" and not re.search(
+        r"\b(?:INSERT|UPDATE|DELETE|REPLACE)\b", statement, re.IGNORECASE
+    ):
+        return set()
+    return None
+
+
+class TableChanges:
+    """
+    Versions of a database's tables, moved on by every write made through
+    this process's engines of it and again when the write commits. A
+    reader noting the versions before reading committed content can later
+    tell which tables changed since, without reading them. Statements not
+    attributed to tables, e.g. DDL, and replacing the database file start
+    a new generation in which every table counts as changed.
+
+    Writes by other processes are not seen.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._generation = uuid4().hex
+        self._versions = {}
+
+    def reset(self):
+        with self._lock:
+            self._generation = uuid4().hex
+            self._versions = {}
+
+    def snapshot(self):
+        """
+        (generation, {table: version}), tables not written have version 0
+        """
+        with self._lock:
+            return self._generation, dict(self._versions)
+
+    def _bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def _after_cursor_execute(self, conn, _cursor, statement, *_args):
+        tables = _statement_tables(statement)
+        if tables is None:
+            self.reset()
+        elif tables:
+            self._bump(tables)
+            conn.info.setdefault("written_tables", set()).update(tables)
+
+    def _commit(self, conn):
+        self._bump(conn.info.pop("written_tables", ()))
+
+    def _rollback(self, conn):
+        conn.info.pop("written_tables", None)
+
+    def listen(self, engine):
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "commit", self._commit)
+        event.listen(engine, "rollback", self._rollback)
+
+
+def get_table_changes(db_path: str = DATABASE_PATH):
+    key = realpath(db_path)
+    changes = _table_changes.get(key)
+    if changes is None:
+        changes = _table_changes.setdefault(key, TableChanges())
+    return changes
+
+
 def create_db_engine(db_path: str = DATABASE_PATH):
-    return create_engine(f"sqlite:///{db_path}", echo=False)
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    event.listen(engine, "connect", _enable_wal)
+    get_table_changes(db_path).listen(engine)
+    return engine
 
 
 def create_session(db_path: str = DATABASE_PATH):
@@ -20,12 +150,76 @@ def create_session(db_path: str = DATABASE_PATH):
     return SessionLocal()
 
 
+def get_read_engine(db_path: str = DATABASE_PATH):
+    """
+    Pooled engine whose connections refuse writes, shared by every read
+    session of *db_path*
+    """
+    engine = _read_engines.get(db_path)
+    if engine is None:
+        engine = create_db_engine(db_path)
+        event.listen(engine, "connect", _enable_query_only)
+        event.listen(engine, "begin", _begin_snapshot)
+        _read_engines[db_path] = engine
+    return engine
+
+
+def dispose_read_engine(db_path: str = DATABASE_PATH):
+    engine = _read_engines.pop(db_path, None)
+    if engine is not None:
+        engine.dispose()
+
+
+def create_read_session(db_path: str = DATABASE_PATH):
+    """
+    Session for readers such as the GUI, each transaction reads a snapshot
+    of the last commit and never blocks or is blocked by the writer
+    """
+    SessionLocal = sessionmaker(bind=get_read_engine(db_path), expire_on_commit=False)
+    return SessionLocal()
+
+
+def insert_people(session, people):
+    """
+    Bulk insert PersonDB rows for core Person objects, returns their ids
+    in the same order
+    """
+    return session.scalars(
+        insert(PersonDB).returning(PersonDB.id, sort_by_parameter_order=True),
+        [
+            {
+                "first_name": p.name.first_name,
+                "last_name": p.name.last_name,
+                "age": p.age,
+                "personality": p.personality,
+            }
+            for p in people
+        ],
+    ).all()
+
+
+def remove_db(db_path: str):
+    dispose_read_engine(db_path)
+    get_table_changes(db_path).reset()
+    for path in [db_path] + [db_path + suffix for suffix in WAL_SUFFIXES]:
+        if exists(path):
+            remove(path)
+
+
 def create_tables(db_path: str = DATABASE_PATH, delete_existing=True):
     if delete_existing and exists(db_path):
         logging.info(f"Removing '{db_path}'")
-        remove(db_path)
+        remove_db(db_path)
 
-    if not exists(db_path):
-        Base.metadata.create_all(create_db_engine(db_path))
-    else:
-        logging.warning(f"{db_path} already exists, create tables abandoned")
+    new_db = not exists(db_path)
+    engine = create_db_engine(db_path)
+    try:
+        with engine.begin() as conn:
+            if new_db:
+                Base.metadata.create_all(conn)
+                stamp_head(conn)
+            else:
+                logging.warning(f"{db_path} already exists, create tables abandoned")
+                ensure_schema(conn)
+    finally:
+        engine.dispose()
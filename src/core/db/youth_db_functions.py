@@ -0,0 +1,187 @@
+from __future__ import annotations
+from random import getrandbits
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import insert, select
+
+from src.core.ability import MAX_ABILITY
+from src.core.game_types import ContractType, Position, ReputationLevel, StaffRole
+from src.core.people import PersonFactory
+from src.core.player_development import ability_curve
+
+from src.core.db.models import (
+    ClubDB,
+    CompetitionRegisterDB,
+    ContractDB,
+    LeagueDB,
+    PlayerDB,
+    StaffDB,
+    WorldDB,
+)
+from src.core.db.contract_db_functions import contract_length
+from src.core.db.utils import insert_people
+
+
+# youth players join at these ages, on the development curve of their
+# potential
+YOUTH_MIN_AGE, YOUTH_MAX_AGE, YOUTH_AVERAGE_AGE = 16, 18, 17
+# players each club takes in a season, the least reputable clubs the
+# minimum, the most reputable the maximum
+MIN_INTAKE, MAX_INTAKE = 1, 3
+# potential of intakes, the mean rises with club reputation and with the
+# ability of the club's coaches and scouts above the average
+YOUTH_POTENTIAL_MEAN = 45
+REPUTATION_POTENTIAL = 30
+STAFF_POTENTIAL = 0.3
+YOUTH_POTENTIAL_SD = 10
+YOUTH_STAFF_ROLES = (StaffRole.Coach, StaffRole.Scout)
+GOALKEEPER_RATIO = 1 / 7
+
+
+class YouthIntake(NamedTuple):
+    person_ids: list[int]
+    # clubs whose squads gained players
+    club_ids: list[int]
+
+
+def _league_rankings(session):
+    """
+    {club_id: league_ranking} of the clubs in a league this season
+    """
+    return dict(
+        session.execute(
+            select(CompetitionRegisterDB.club_id, LeagueDB.league_ranking)
+            .join(LeagueDB, LeagueDB.id == CompetitionRegisterDB.competition_id)
+            .join(WorldDB, WorldDB.season_id == CompetitionRegisterDB.season_id)
+        ).all()
+    )
+
+
+def _club_staff(session):
+    """
+    {club_id: [(role, reputation_type, ability)]} of every contracted
+    member of staff, in one query
+    """
+    staff = {}
+    for club_id, *member in session.execute(
+        select(
+            ContractDB.club_id, StaffDB.role, StaffDB.reputation_type, StaffDB.ability
+        )
+        .join(StaffDB, StaffDB.person_id == ContractDB.person_id)
+        .where(ContractDB.club_id.is_not(None))
+    ):
+        staff.setdefault(club_id, []).append(tuple(member))
+    return staff
+
+
+def club_reputations(session):
+    """
+    (club_ids, reputations, youth staff abilities) arrays of every club.
+    A club's reputation, 0 to 1, is the mean of its league standing, the
+    top league 1 and non-league 0, and its staff's reputation.
+    """
+    club_ids = session.scalars(select(ClubDB.id).order_by(ClubDB.id)).all()
+    rankings = _league_rankings(session)
+    staff = _club_staff(session)
+    lowest = max(rankings.values(), default=0) + 1
+    top_reputation = max(r.value for r in ReputationLevel)
+
+    reputations, abilities = [], []
+    for club_id in club_ids:
+        league = 1 - (rankings.get(club_id, lowest) - 1) / max(lowest - 1, 1)
+        members = staff.get(club_id, [])
+        staff_reputation = (
+            np.mean([r.value for _, r, _ in members]) / top_reputation
+            if members
+            else 0.0
+        )
+        reputations.append((league + staff_reputation) / 2)
+        youth_staff = [a for role, _, a in members if role in YOUTH_STAFF_ROLES]
+        abilities.append(np.mean(youth_staff) if youth_staff else MAX_ABILITY / 2)
+    return np.array(club_ids), np.array(reputations), np.array(abilities)
+
+
+def intake_sizes(reputations):
+    return MIN_INTAKE + np.rint(
+        np.asarray(reputations) * (MAX_INTAKE - MIN_INTAKE)
+    ).astype(int)
+
+
+def youth_potentials(reputations, staff_abilities, rng: np.random.Generator):
+    means = (
+        YOUTH_POTENTIAL_MEAN
+        + REPUTATION_POTENTIAL * np.asarray(reputations)
+        + STAFF_POTENTIAL * (np.asarray(staff_abilities) - MAX_ABILITY / 2)
+    )
+    return np.clip(rng.normal(means, YOUTH_POTENTIAL_SD), 10, MAX_ABILITY)
+
+
+def youth_intake(session, week: int):
+    """
+    Every club's youth intake of the season, generated in one batch: the
+    people, players and their contracts are written with three bulk
+    inserts, left uncommitted. *week* is the absolute game week contracts
+    run from.
+    """
+    club_ids, reputations, staff_abilities = club_reputations(session)
+    if not len(club_ids):
+        return YouthIntake([], [])
+
+    rng = np.random.default_rng(getrandbits(64))
+    sizes = intake_sizes(reputations)
+    # one entry per youth player, repeating the club's values
+    club_ids = np.repeat(club_ids, sizes)
+    count = len(club_ids)
+    potentials = youth_potentials(
+        np.repeat(reputations, sizes), np.repeat(staff_abilities, sizes), rng
+    )
+
+    people = PersonFactory.random_males(
+        count,
+        min_age=YOUTH_MIN_AGE,
+        max_age=YOUTH_MAX_AGE,
+        average=YOUTH_AVERAGE_AGE,
+        rng=rng,
+    )
+    ages = np.array([p.age for p in people])
+    abilities = np.clip(np.rint(ability_curve(ages, potentials)), 1, MAX_ABILITY)
+    positions = np.where(
+        rng.random(count) < GOALKEEPER_RATIO,
+        0,
+        rng.integers(1, len(Position), count),
+    )
+    all_positions = list(Position)
+
+    person_ids = insert_people(session, people)
+    session.execute(
+        insert(PlayerDB),
+        [
+            {
+                "person_id": person_id,
+                "position": all_positions[position],
+                "ability": ability,
+                "potential": round(potential, 2),
+            }
+            for person_id, position, ability, potential in zip(
+                person_ids,
+                positions.tolist(),
+                abilities.astype(int).tolist(),
+                potentials.tolist(),
+            )
+        ],
+    )
+    session.execute(
+        insert(ContractDB),
+        [
+            {
+                "person_id": person_id,
+                "club_id": club_id,
+                "expiry_date": week + contract_length(),
+                "wage": 100,
+                "contract_type": ContractType.Player_Contract,
+            }
+            for person_id, club_id in zip(person_ids, club_ids.tolist())
+        ],
+    )
+    return YouthIntake(list(person_ids), sorted(set(club_ids.tolist())))
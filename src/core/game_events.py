@@ -0,0 +1,65 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import logging
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """
+    Base of the change events published by the WorldStateEngine after the
+    change has been committed
+    """
+
+    season_id: int
+
+
+@dataclass(frozen=True)
+class SeasonStarted(GameEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class WeekAdvanced(GameEvent):
+    week_num: int
+
+
+@dataclass(frozen=True)
+class ResultsAdded(GameEvent):
+    week_num: int
+    # {fixture_id: (home_score, away_score)}
+    scores: dict
+
+
+@dataclass(frozen=True)
+class StandingsChanged(GameEvent):
+    competition_id: int
+
+
+@dataclass(frozen=True)
+class SquadsChanged(GameEvent):
+    club_ids: tuple
+
+
+class GameEventPublisher:
+    """
+    Calls the subscribed listeners with each published event, on the
+    thread publishing it
+    """
+
+    def __init__(self):
+        self._listeners = []
+
+    def subscribe(self, listener: callable):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: callable):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, event: GameEvent):
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:
+                logging.exception(f"Game event listener failed for {event}")
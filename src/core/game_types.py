@@ -108,4 +108,18 @@ class MatchFormation(Enum):
 
     def __str__(self):
         return "-".join([str(v) for v in self.value])
-    
\ No newline at end of file
+    
+
+@unique
+class MatchEventType(Enum):
+    """
+    Integer coded match event types, stored as plain integers in the
+    match_events table to keep rows compact
+    """
+
+    Appearance = 1
+    Goal = 2
+    Assist = 3
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,110 @@
+from random import choices, gauss, randint, random
+
+
+from .game_types import MatchEventType, MatchFormation, Position
+
+
+MATCH_MINUTES = 90
+
+# relative chance of each position scoring / assisting a goal
+SCORER_WEIGHTS = {
+    Position.Goalkeeper: 0,
+    Position.Defender: 1,
+    Position.Midfielder: 3,
+    Position.Attacker: 6,
+}
+ASSIST_WEIGHTS = {
+    Position.Goalkeeper: 0,
+    Position.Defender: 1,
+    Position.Midfielder: 4,
+    Position.Attacker: 3,
+}
+ASSIST_CHANCE = 0.7
+
+MIN_RATING, MAX_RATING = 1, 10
+
+
+def select_team(squad, formation: MatchFormation | None = None):
+    """
+    Pick a starting team from a squad of (person_id, position, ability)
+    tuples: the best goalkeeper plus the best players for each outfield
+    line of the formation, topped up with the best remaining players if a
+    line is short.
+    """
+    formation = formation or MatchFormation.F222
+    counts = [1] + list(formation.value)
+    positions = [
+        Position.Goalkeeper,
+        Position.Defender,
+        Position.Midfielder,
+        Position.Attacker,
+    ]
+
+    ranked = sorted(squad, key=lambda p: -p[2])
+    team = []
+    for pos, count in zip(positions, counts):
+        team.extend([p for p in ranked if p[1] == pos][:count])
+
+    shortfall = sum(counts) - len(team)
+    if shortfall > 0:
+        picked = set(p[0] for p in team)
+        team.extend([p for p in ranked if p[0] not in picked][:shortfall])
+    return team
+
+
+def team_strength(team):
+    """
+    Average ability of a team picked by select_team, 0 for an empty team
+    """
+    return sum(p[2] for p in team) / len(team) if team else 0
+
+
+def _pick(team, weights, exclude=None):
+    candidates = [p for p in team if p[0] != exclude and weights[p[1]] > 0]
+    if not candidates:
+        candidates = [p for p in team if p[0] != exclude]
+    if not candidates:
+        return None
+    return choices(candidates, weights=[weights[p[1]] or 1 for p in candidates])[0]
+
+
+def create_match_events(home_team, away_team, score):
+    """
+    Create the events for a played fixture.
+
+    home_team/away_team are lists of (person_id, position, ability) as
+    returned by select_team, score is (home_goals, away_goals).
+
+    Returns a list of (team_index, event_type, minute, person_id, value)
+    tuples where team_index is 0 for home and 1 for away.
+    """
+    events = []
+    contributions = [dict(), dict()]
+
+    for side, (team, goals) in enumerate(zip([home_team, away_team], score)):
+        if not team:
+            continue
+        for minute in sorted(randint(1, MATCH_MINUTES) for _ in range(goals)):
+            scorer = _pick(team, SCORER_WEIGHTS)
+            events.append((side, MatchEventType.Goal, minute, scorer[0], None))
+            contributions[side][scorer[0]] = contributions[side].get(scorer[0], 0) + 1
+
+            if random() < ASSIST_CHANCE:
+                assister = _pick(team, ASSIST_WEIGHTS, exclude=scorer[0])
+                if assister is not None:
+                    events.append(
+                        (side, MatchEventType.Assist, minute, assister[0], None)
+                    )
+                    contributions[side][assister[0]] = (
+                        contributions[side].get(assister[0], 0) + 1
+                    )
+
+    for side, team in enumerate([home_team, away_team]):
+        goal_diff = score[side] - score[1 - side]
+        for person_id, _, _ in team:
+            rating = gauss(6.0, 1.0) + contributions[side].get(person_id, 0)
+            rating += max(-1, min(1, goal_diff)) * 0.5
+            rating = max(MIN_RATING, min(MAX_RATING, int(round(rating))))
+            events.append((side, MatchEventType.Appearance, 0, person_id, rating))
+
+    return events
@@ -0,0 +1,185 @@
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import json
+from math import ceil
+from threading import Lock
+from time import perf_counter
+
+
+# upper bounds in seconds of the Prometheus histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# WorldStateEngine state transitions, labelled by the state processed
+STATE_METRIC = "world_state"
+# GameDBWorker method calls, labelled by the method name
+GAME_WORKER_METRIC = "game_worker"
+# Prometheus label name of each metric's labels
+METRIC_LABELS = {STATE_METRIC: "state", GAME_WORKER_METRIC: "method"}
+
+
+class LatencyHistogram:
+    """
+    Latencies of one operation: count, sum and max of every sample,
+    Prometheus bucket counts, and the most recent samples for quantiles
+    """
+
+    # recent samples kept for the p50/p95 estimates
+    MAX_SAMPLES = 4096
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.bucket_counts = [0] * len(BUCKETS)
+        self._samples = deque(maxlen=self.MAX_SAMPLES)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        for ix, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[ix] += 1
+                break
+        self._samples.append(seconds)
+
+    def quantile(self, q: float):
+        """
+        Nearest rank *q* quantile of the recent samples, 0.0 when empty
+        """
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        return samples[max(0, ceil(q * len(samples)) - 1)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class LatencyMetrics:
+    """
+    Latency histograms grouped by metric name and label, e.g. the
+    ProcessingFixtures label of the world_state metric.
+
+    Recorded on the game worker thread and read from the GUI thread, every
+    access holds the lock.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._histograms: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def observe(self, metric: str, label: str, seconds: float):
+        with self._lock:
+            labels = self._histograms.setdefault(metric, {})
+            if label not in labels:
+                labels[label] = LatencyHistogram()
+            labels[label].observe(seconds)
+
+    @contextmanager
+    def time(self, metric: str, label: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, label, perf_counter() - start)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self):
+        """
+        {metric: {label: {count, sum, p50, p95, max}}} in seconds
+        """
+        with self._lock:
+            return {
+                metric: {label: h.summary() for label, h in sorted(labels.items())}
+                for metric, labels in sorted(self._histograms.items())
+            }
+
+    def rows(self):
+        """
+        (metric, label, count, p50, p95, max) rows, slowest total first
+        """
+        rows = []
+        for metric, labels in self.summary().items():
+            for label, s in labels.items():
+                rows.append(
+                    (metric, label, s["count"], s["p50"], s["p95"], s["max"], s["sum"])
+                )
+        rows.sort(key=lambda r: -r[6])
+        return [r[:6] for r in rows]
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self, prefix: str = "fitba"):
+        """
+        Prometheus text exposition of every metric as a histogram in seconds
+        """
+        lines = []
+        with self._lock:
+            for metric, labels in sorted(self._histograms.items()):
+                name = f"{prefix}_{metric}_seconds"
+                label_name = METRIC_LABELS.get(metric, "name")
+                lines.append(f"# TYPE {name} histogram")
+                for label, h in sorted(labels.items()):
+                    bucket = f'{name}_bucket{{{label_name}="{label}",le='
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, h.bucket_counts):
+                        cumulative += count
+                        lines.append(f'{bucket}"{bound}"}} {cumulative}')
+                    lines.append(f'{bucket}"+Inf"}} {h.count}')
+                    lines.append(f'{name}_sum{{{label_name}="{label}"}} {h.sum}')
+                    lines.append(f'{name}_count{{{label_name}="{label}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str):
+        """
+        Write the metrics to *path*, Prometheus text for .prom/.txt files
+        and JSON otherwise
+        """
+        text = (
+            self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        )
+        with open(path, "w") as f:
+            f.write(text)
+
+
+def measured(metric: str):
+    """
+    Method decorator recording each call's latency in the instance's
+    metrics, labelled by the method name
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.time(metric, func.__name__):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def latency_table_text(metrics: LatencyMetrics):
+    lines = [
+        f"{'Metric':<12} {'Name':<24} {'Count':>7} {'p50 ms':>10} "
+        f"{'p95 ms':>10} {'max ms':>10}"
+    ]
+    for metric, label, count, p50, p95, max_ in metrics.rows():
+        lines.append(
+            f"{metric:<12} {label:<24} {count:>7} {p50 * 1000:>10.2f} "
+            f"{p95 * 1000:>10.2f} {max_ * 1000:>10.2f}"
+        )
+    return lines
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .ability import MAX_ABILITY
+
+
+# Vectorised form of the development curve explored in
+# src/sandbox/player_ability_sandbox.py, applied to every player at once.
+
+MIN_AGE, MAX_AGE = 16, 40
+# players this old or older retire once their ability has fallen below
+# what the curve gave them at 21, everyone retires at MAX_AGE
+RETIREMENT_AGE = 30
+# largest fraction of potential lost in a season
+POTENTIAL_DECAY = 0.05
+
+
+def ability_curve(ages, potentials):
+    """
+    Ability the development curve gives for *ages* and *potentials*:
+    rising from 40% of potential at 16 to 90% at 24 and the full potential
+    at 30, then an accelerating decline to 20% of potential at 40
+    """
+    ages = np.clip(np.asarray(ages, dtype=float), MIN_AGE, MAX_AGE)
+    potentials = np.clip(np.asarray(potentials, dtype=float), 0, MAX_ABILITY)
+    initial_16 = 0.4 * potentials
+    target_24 = 0.9 * potentials
+    return np.select(
+        [ages <= 24, ages <= 30],
+        [
+            initial_16 + (target_24 - initial_16) * (ages - 16) / 8.0,
+            target_24 + (potentials - target_24) * (ages - 24) / 6.0,
+        ],
+        potentials * (1 - 0.8 * ((ages - 30) / 10.0) ** 2),
+    )
+
+
+def initial_potentials(ages, abilities):
+    """
+    Potentials putting players of *ages* with *abilities* on the curve,
+    capped at MAX_ABILITY
+    """
+    fraction = ability_curve(ages, MAX_ABILITY) / MAX_ABILITY
+    return np.minimum(np.asarray(abilities, dtype=float) / fraction, MAX_ABILITY)
+
+
+def develop(ages, abilities, potentials, rng: np.random.Generator, modifiers=1.0):
+    """
+    One season of development for players now *ages* old: potentials decay
+    by up to POTENTIAL_DECAY, abilities move by the curve's change since
+    last season. Gains are multiplied and losses divided by the clubs'
+    development *modifiers*. Returns (abilities, potentials, retired)
+    arrays.
+    """
+    ages = np.asarray(ages, dtype=float)
+    abilities = np.asarray(abilities, dtype=float)
+    potentials = np.asarray(potentials, dtype=float)
+    modifiers = np.asarray(modifiers, dtype=float)
+
+    new_potentials = potentials * (1 - POTENTIAL_DECAY * rng.random(len(ages)))
+    change = ability_curve(ages, new_potentials) - ability_curve(ages - 1, potentials)
+    change = np.where(change > 0, change * modifiers, change / modifiers)
+    new_abilities = np.clip(np.rint(abilities + change), 1, MAX_ABILITY)
+
+    retired = (ages >= MAX_AGE) | (
+        (ages >= RETIREMENT_AGE) & (new_abilities < ability_curve(21, new_potentials))
+    )
+    return new_abilities.astype(int), new_potentials, retired
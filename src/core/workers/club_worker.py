@@ -140,6 +140,32 @@ class ClubAnalysisWorker:
                 
 
 
+    def analyse_squad(self, players, formation):
+        """
+        Squad ability, position groups and best team of *players*, either
+        PlayerDB entities or SquadPlayerRow read models
+        """
+        data = {}
+        avg_a, avg_dev, max_a = AbilityCalculator([p.ability for p in players]).analyse()
+        data["squad"] = {
+            "avg": avg_a,
+            "d_avg": avg_dev,
+            "max_a": max_a
+        }
+
+        player_positions, best_player = self._get_players_position_groups(players)
+        data["position_groups"] = player_positions
+        data["best_player"] = best_player
+
+        best_team = self.get_team_sheet(player_positions, formation)
+        best_team_players = []
+        for r in best_team[0]:
+            best_team_players.extend(r[1])
+        b_avg, b_avg_d, b_max = AbilityCalculator([p.ability for p in best_team_players]).analyse()
+        data["best_team"] = best_team
+        data["team_analysis"] = b_avg, b_avg_d, b_max
+        return data
+
     def analyse(self, season: SeasonDB):
         logging.info(f"Analysing club: {self.club.name} season: {season}")
         data = {}
@@ -161,26 +187,24 @@ class ClubAnalysisWorker:
             data["formation"] = data["manager"].prefered_formation
 
             # avgs, deviation_avg = self._average_ability_devation(data["players"])
-            avg_a, avg_dev, max_a = AbilityCalculator([p.ability for p in data["players"]]).analyse()
-            data["squad"] = {
-                "avg": avg_a,
-                "d_avg": avg_dev,
-                "max_a": max_a
-            }
-
-            player_positions, best_player = self._get_players_position_groups(data["players"])
-            data["position_groups"] = player_positions
-            data["best_player"] = best_player
-
-            best_team = self.get_team_sheet(player_positions, data["formation"])
-            best_team_players = []
-            for r in best_team[0]:
-                best_team_players.extend(r[1])
-            b_avg, b_avg_d, b_max = AbilityCalculator([p.ability for p in best_team_players]).analyse()
-            data["best_team"] = best_team
-            data["team_analysis"] = b_avg, b_avg_d, b_max
+            data.update(self.analyse_squad(data["players"], data["formation"]))
             
             logging.info(f'Sqaud Avg: {data["squad"]["avg"]:2.2f} dev: {data["squad"]["d_avg"]:2.2f}')
 
         return data
-    
\ No newline at end of file
+    
+
+def analyse_club_squads(db_worker, club_ids):
+    """
+    ClubAnalysisWorker.analyse_squad of several clubs from SquadPlayerRow
+    read models, two queries in all instead of loading each club's ORM
+    graph. Clubs without a manager are left out.
+    """
+    squads = db_worker.get_squad_rows(club_ids)
+    formations = db_worker.get_club_formations(club_ids)
+    analysis = ClubAnalysisWorker(None)
+    return {
+        club_id: analysis.analyse_squad(squad, formations[club_id])
+        for club_id, squad in squads.items()
+        if squad and club_id in formations
+    }
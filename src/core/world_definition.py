@@ -0,0 +1,176 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, asdict
+import json
+
+
+DEFAULT_WORLD_PATH = "data/worlds/default.json"
+
+# 42 rounds of a double round robin fit the weeks of league_fixture_weeks
+MAX_LEAGUE_TEAMS = 22
+
+# shape of the league groups of pyramid_for_clubs worlds
+PYRAMID_TIERS, PYRAMID_TEAMS, PYRAMID_PLACES = 5, 16, 3
+
+
+@dataclass
+class LeagueDefinition:
+    name: str
+    short_name: str
+    teams: int
+    promotion_places: int = 3
+    relegation_places: int = 3
+
+
+@dataclass
+class LeagueGroupDefinition:
+    name: str
+    leagues: list[LeagueDefinition]
+    # clubs outside the leagues that can be promoted into the bottom tier
+    non_league_clubs: int = 0
+
+    @property
+    def league_clubs(self):
+        return sum(lg.teams for lg in self.leagues)
+
+    @property
+    def total_clubs(self):
+        return self.league_clubs + self.non_league_clubs
+
+
+@dataclass
+class CupDefinition:
+    name: str
+    short_name: str
+
+
+@dataclass
+class WorldDefinition:
+    """
+    Competition structure of a world: league groups (pyramids) of ranked
+    leagues with their team counts and promotion/relegation places, plus cups
+    """
+
+    name: str
+    league_groups: list[LeagueGroupDefinition]
+    cups: list[CupDefinition] = field(default_factory=list)
+
+    @property
+    def total_clubs(self):
+        return sum(g.total_clubs for g in self.league_groups)
+
+    @property
+    def league_count(self):
+        return sum(len(g.leagues) for g in self.league_groups)
+
+    def validate(self):
+        names, short_names = set(), set()
+        competitions = [lg for g in self.league_groups for lg in g.leagues] + self.cups
+        for comp in competitions:
+            if comp.name in names or comp.short_name in short_names:
+                raise ValueError(f"Duplicate competition name: {comp.name}")
+            names.add(comp.name)
+            short_names.add(comp.short_name)
+
+        for group in self.league_groups:
+            if not group.leagues:
+                raise ValueError(f"League group {group.name} has no leagues")
+            for ix, league in enumerate(group.leagues):
+                if not 2 <= league.teams <= MAX_LEAGUE_TEAMS:
+                    raise ValueError(
+                        f"{league.name}: teams must be between 2 and {MAX_LEAGUE_TEAMS}"
+                    )
+                if league.teams % 2 != 0:
+                    raise ValueError(f"{league.name}: teams must be even")
+                if league.promotion_places + league.relegation_places > league.teams:
+                    raise ValueError(f"{league.name}: too many promotion places")
+                if ix > 0:
+                    above = group.leagues[ix - 1]
+                    if above.relegation_places != league.promotion_places:
+                        raise ValueError(
+                            f"{above.name} relegates {above.relegation_places} but "
+                            f"{league.name} promotes {league.promotion_places}"
+                        )
+            if group.leagues[-1].relegation_places > group.non_league_clubs:
+                raise ValueError(
+                    f"{group.name}: not enough non-league clubs to replace relegations"
+                )
+        return self
+
+    @staticmethod
+    def from_dict(data: dict):
+        return WorldDefinition(
+            name=data["name"],
+            league_groups=[
+                LeagueGroupDefinition(
+                    name=g["name"],
+                    leagues=[LeagueDefinition(**lg) for lg in g["leagues"]],
+                    non_league_clubs=g.get("non_league_clubs", 0),
+                )
+                for g in data["league_groups"]
+            ],
+            cups=[CupDefinition(**c) for c in data.get("cups", [])],
+        ).validate()
+
+    def to_dict(self):
+        return asdict(self)
+
+    @staticmethod
+    def load(path: str = DEFAULT_WORLD_PATH):
+        with open(path, "r") as f:
+            return WorldDefinition.from_dict(json.load(f))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @staticmethod
+    def pyramid(
+        groups: int,
+        tiers: int,
+        teams: int = 16,
+        places: int = 3,
+        non_league_clubs: int | None = None,
+        cups: bool = True,
+    ):
+        """
+        Generated world of *groups* league groups each with *tiers* leagues
+        of *teams* clubs, used for large worlds and benchmarks
+        """
+        non_league_clubs = places if non_league_clubs is None else non_league_clubs
+        league_groups = []
+        for g in range(groups):
+            league_groups.append(
+                LeagueGroupDefinition(
+                    name=f"FA {g + 1}",
+                    leagues=[
+                        LeagueDefinition(
+                            name=f"FA {g + 1} Division {t + 1}",
+                            short_name=f"G{g + 1}D{t + 1}",
+                            teams=teams,
+                            promotion_places=0 if t == 0 else places,
+                            relegation_places=places,
+                        )
+                        for t in range(tiers)
+                    ],
+                    non_league_clubs=non_league_clubs,
+                )
+            )
+        return WorldDefinition(
+            name=f"Pyramid {groups}x{tiers}x{teams}",
+            league_groups=league_groups,
+            cups=[CupDefinition(name="League Cup", short_name="LC")] if cups else [],
+        ).validate()
+
+    @staticmethod
+    def pyramid_for_clubs(clubs: int):
+        """
+        Pyramid world of PYRAMID_TIERS tier league groups with roughly
+        *clubs* clubs
+        """
+        group_size = PYRAMID_TIERS * PYRAMID_TEAMS + PYRAMID_PLACES
+        return WorldDefinition.pyramid(
+            groups=max(1, round(clubs / group_size)),
+            tiers=PYRAMID_TIERS,
+            teams=PYRAMID_TEAMS,
+            places=PYRAMID_PLACES,
+        )
@@ -1,12 +1,25 @@
 
 from __future__ import annotations
+from dataclasses import dataclass
 from enum import Enum, auto, unique
 import logging
 from random import randint
 
 
 from .world_time import WEEKS_IN_YEAR
-from .db.game_worker import create_score, GameDBWorker
+from .world_definition import WorldDefinition
+from .game_events import (
+    GameEvent,
+    GameEventPublisher,
+    SeasonStarted,
+    WeekAdvanced,
+    ResultsAdded,
+    SquadsChanged,
+    StandingsChanged,
+)
+from .metrics import LatencyMetrics, STATE_METRIC
+from .db.game_worker import GameDBWorker
+from .db.transfer_db_functions import TRANSFER_WINDOW_WEEKS
 
 
 @unique
@@ -20,13 +33,55 @@ class WorldState(Enum):
     AwaitingContinue = auto()
 
 
+@dataclass
+class PresimulatedWeek:
+    """
+    Results and match events computed ahead for a matchweek's fixtures,
+    held in memory until the week is processed or discarded
+    """
+
+    key: tuple
+    scores: dict
+    events: list
+
+
+def week_key(fixtures):
+    """
+    Identifies the fixtures a presimulated week was computed for
+    """
+    return tuple(sorted((f.season_id, f.season_week, f.id) for f in fixtures))
+
+
 class WorldStateEngine:
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        world_definition: WorldDefinition | None = None,
+        metrics: LatencyMetrics | None = None,
+        expunge_interval: int | None = 8,
+        saves_dir: str | None = None,
+        event_retention: int | None = GameDBWorker.DEFAULT_EVENT_RETENTION,
+        archive_after: int | None = GameDBWorker.DEFAULT_ARCHIVE_AFTER,
+    ):
         db_path = db_path if db_path is not None else GameDBWorker.DEFAULT_DB_PATH
-        self._game_worker = GameDBWorker(db_path=db_path)
+        # per state transition and game worker method latencies
+        self._metrics = metrics if metrics is not None else LatencyMetrics()
+        self._game_worker = GameDBWorker(
+            db_path=db_path,
+            event_retention=event_retention,
+            archive_after=archive_after,
+            world_definition=world_definition,
+            metrics=self._metrics,
+            expunge_interval=expunge_interval,
+            saves_dir=saves_dir,
+        )
 
         self._state = WorldState.NewGame
         self._results = None
+        self._presimulated: PresimulatedWeek | None = None
+        self._events = GameEventPublisher()
+        # events of the transition in progress, published once it commits
+        self._pending_events: list[GameEvent] | None = None
 
     def clear_results(self):
         self._results = None
@@ -39,6 +94,25 @@ class WorldStateEngine:
     def game_worker(self):
         return self._game_worker
 
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def events(self):
+        """
+        Publisher of the typed change events, listeners are called on the
+        thread advancing the engine once the state transition raising them
+        has been committed
+        """
+        return self._events
+
+    def _publish(self, event: GameEvent):
+        if self._pending_events is not None:
+            self._pending_events.append(event)
+        else:
+            self._events.publish(event)
+
     @property
     def world_time(self):
         return self.game_worker.current_date()
@@ -51,6 +125,48 @@ class WorldStateEngine:
     def state(self, new_state: WorldState):
         self._state = new_state
 
+    @property
+    def presimulated(self):
+        return self._presimulated
+
+    def presimulate(self):
+        """
+        Compute the results and events of the fixtures the next Continue
+        will process without writing anything, so processing only has to
+        commit them. Safe to call repeatedly, an existing presimulation of
+        the same fixtures is kept.
+        """
+        if self.state not in [WorldState.AwaitingContinue, WorldState.PreFixtures]:
+            return None
+
+        self._game_worker.ensure_hydrated()
+
+        current_fixtures = self.game_worker.current_fixture_rows()
+        if not current_fixtures:
+            return None
+
+        key = week_key(current_fixtures)
+        if self._presimulated is None or self._presimulated.key != key:
+            fixtures_and_scores, events = self.game_worker.simulate_matches(
+                current_fixtures
+            )
+            self._presimulated = PresimulatedWeek(
+                key=key,
+                scores={f.id: score for f, score in fixtures_and_scores},
+                events=events,
+            )
+            logging.info(f"Presimulated {len(current_fixtures)} fixtures")
+        return self._presimulated
+
+    def discard_presimulation(self):
+        """
+        Drop presimulated results, to be called by anything that changes
+        squads or fixtures before the week is processed
+        """
+        if self._presimulated is not None:
+            logging.info("Discarding presimulated week")
+            self._presimulated = None
+
     def _do_process_fixtures(self):
         current_fixtures = self.game_worker.current_fixtures()
         if not current_fixtures:
@@ -58,11 +174,61 @@ class WorldStateEngine:
             return
 
         logging.info(f"Processing {len(current_fixtures)} fixtures")
-        self._results = self.game_worker.worker.add_results(
-            fixtures_and_scores=[
-                (fixture, create_score()) for fixture in current_fixtures
+        presimulated, self._presimulated = self._presimulated, None
+        if presimulated is not None and presimulated.key == week_key(current_fixtures):
+            fixtures_and_scores = [
+                (fixture, presimulated.scores[fixture.id])
+                for fixture in current_fixtures
             ]
+            events = presimulated.events
+        else:
+            fixtures_and_scores, events = self.game_worker.simulate_matches(
+                current_fixtures
+            )
+
+        self._results = self.game_worker.worker.add_results(
+            fixtures_and_scores=fixtures_and_scores
         )
+        self.game_worker.worker.add_match_events(events)
+        self._publish_results(fixtures_and_scores)
+
+    def _publish_results(self, fixtures_and_scores):
+        season_id = fixtures_and_scores[0][0].season_id
+        self._publish(
+            ResultsAdded(
+                season_id=season_id,
+                week_num=fixtures_and_scores[0][0].season_week,
+                scores={f.id: score for f, score in fixtures_and_scores},
+            )
+        )
+        league_ids = set(lg.id for lg in self.game_worker.worker.get_leagues())
+        for competition_id in sorted(
+            set(f.competition_id for f, _ in fixtures_and_scores)
+        ):
+            if competition_id in league_ids:
+                self._publish(
+                    StandingsChanged(season_id=season_id, competition_id=competition_id)
+                )
+
+    def _run_weekly_squad_jobs(self, week_num: int):
+        """
+        Contract expiries, in window weeks the transfer window, then the
+        clubs' staff modifiers. Returns the ids of the clubs whose squads
+        changed.
+        """
+        club_ids = set(self.game_worker.process_contracts().club_ids)
+        if week_num in TRANSFER_WINDOW_WEEKS:
+            club_ids.update(self.game_worker.run_transfer_window().club_ids)
+        self.game_worker.update_club_modifiers()
+        if club_ids:
+            self.discard_presimulation()
+        return sorted(club_ids)
+
+    def _publish_squad_changes(self, club_ids):
+        if club_ids:
+            self._publish(
+                SquadsChanged(season_id=self.world_time[0].id, club_ids=tuple(club_ids))
+            )
 
     def _process_state(self):
         if self.state == WorldState.NewGame:
@@ -73,14 +239,19 @@ class WorldStateEngine:
         elif self.state == WorldState.NewSeason:
             self.game_worker.do_new_season()
             logging.info(f"New Season {self.world_time[0].year}")
+            changed_clubs = self._run_weekly_squad_jobs(self.world_time[1].week_num)
             self.state = WorldState.AwaitingContinue
+            self._publish(SeasonStarted(season_id=self.world_time[0].id))
+            self._publish_squad_changes(changed_clubs)
 
         elif self.state == WorldState.PostSeason:
             logging.info(
                 f"Post Season {self.world_time[0].year} completed! prepare promotion/relegation and new season setup next week."
             )
-            self._game_worker.process_end_of_season()
+            self.discard_presimulation()
+            club_ids = self._game_worker.process_end_of_season()
             self.state = WorldState.NewSeason
+            self._publish_squad_changes(club_ids)
 
         elif self.state == WorldState.PreFixtures:
             logging.info("Pre Fixtures")
@@ -96,21 +267,66 @@ class WorldStateEngine:
             self.state = WorldState.AwaitingContinue
 
         elif self.state == WorldState.AwaitingContinue:
-            current_week_fixtures = self.game_worker.current_fixtures()
+            current_week_fixtures = self.game_worker.current_fixture_rows()
             if current_week_fixtures:
                 self.state = WorldState.PreFixtures
             else:
                 logging.info("Advance Week")
                 self.clear_results()
                 self.game_worker.worker.advance_week()
-                if self.world_time[1].week_num == WEEKS_IN_YEAR:
+                season, week = self.world_time
+                changed_clubs = self._run_weekly_squad_jobs(week.week_num)
+                if week.week_num == WEEKS_IN_YEAR:
                     self.state = WorldState.PostSeason
+                self._publish(
+                    WeekAdvanced(season_id=season.id, week_num=week.week_num)
+                )
+                self._publish_squad_changes(changed_clubs)
 
         else:
             raise RuntimeError(f"Unknown state: {self.state}")
 
+    def resume_game(self):
+        """
+        Continue the game in the working database from its current week
+        """
+        self._game_worker.check_schema()
+        self.state = WorldState.AwaitingContinue
+
+    def save_game(self, slot: str):
+        return self._game_worker.save_game(slot, state=self.state.name)
+
+    def load_game(self, slot: str, lazy: bool = True):
+        """
+        Load *slot* into the working database and restore the state it was
+        saved in. With *lazy* the squad and history tables are filled on the
+        first advance or presimulation, or by game_worker.ensure_hydrated().
+        """
+        self.discard_presimulation()
+        self.clear_results()
+        info = self._game_worker.load_game(slot, lazy=lazy)
+        self.state = (
+            WorldState[info.state]
+            if info.state in WorldState.__members__
+            else WorldState.AwaitingContinue
+        )
+        return info
+
     def advance_game(self):
-        self._process_state()
+        self._game_worker.ensure_hydrated()
+        # events wait for the unit of work to commit, so listeners reading
+        # through their own sessions see the changes, a failed transition
+        # publishes none
+        self._pending_events = []
+        try:
+            with self._metrics.time(STATE_METRIC, self.state.name):
+                with self._game_worker.unit_of_work():
+                    self._process_state()
+            events = self._pending_events
+        finally:
+            self._pending_events = None
+        for event in events:
+            self._events.publish(event)
 
     def advance_to_post_season(self):
         current_week = self.world_time[1].week_num
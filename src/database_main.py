@@ -6,13 +6,23 @@ from time import perf_counter, sleep
 from traceback import format_exc
 
 from src.core.world_state_engine import  WorldState, WorldStateEngine
+from src.core.metrics import latency_table_text
+from src.core.db.db_worker import DatabaseWorker
+from src.core.db.game_worker import GameDBWorker
+from src.core.db.season_export import DATASETS, EXPORT_FORMATS, SeasonExporter
 
 
-def game_state_engine(seasons: int = 3):
+def game_state_engine(
+    seasons: int = 3,
+    event_retention: int | None = GameDBWorker.DEFAULT_EVENT_RETENTION,
+    archive_after: int | None = GameDBWorker.DEFAULT_ARCHIVE_AFTER,
+):
     """
     non interactive game loop
     """
-    state_engine = WorldStateEngine()
+    state_engine = WorldStateEngine(
+        event_retention=event_retention, archive_after=archive_after
+    )
     if state_engine.state == WorldState.NewGame:
         state_engine.advance_game()
 
@@ -23,6 +33,8 @@ def game_state_engine(seasons: int = 3):
         sleep(1)
         state_engine.advance_game()
 
+    return state_engine
+
 
 def game_with_state_engine_test_run():
     """
@@ -81,10 +93,19 @@ def game_with_state_engine_test_run():
             state_engine.advance_game()
 
 
-def db_main():
+def db_main(
+    seasons: int = 3,
+    metrics_path: str | None = None,
+    event_retention: int | None = GameDBWorker.DEFAULT_EVENT_RETENTION,
+    archive_after: int | None = GameDBWorker.DEFAULT_ARCHIVE_AFTER,
+):
     """
     Test DB Main function
-    simulates a a number of seasons with out a UI
+    simulates a a number of seasons with out a UI, the latency metrics are
+    logged and written to *metrics_path*, as Prometheus text for .prom or
+    .txt paths and JSON otherwise. Match events of all but the latest
+    *event_retention* seasons are summarised and seasons older than the
+    latest *archive_after* are archived, None keeps them all.
     """
     logging.basicConfig(
         level=logging.DEBUG,
@@ -94,30 +115,114 @@ def db_main():
     try:
         start_time = perf_counter()
 
-        game_state_engine(seasons=3)
+        state_engine = game_state_engine(
+            seasons=seasons,
+            event_retention=event_retention,
+            archive_after=archive_after,
+        )
         # game_with_state_engine_test_run()
 
         total_time = perf_counter() - start_time
         logging.info(f"Took {total_time:.6f} seconds")
 
+        latencies = latency_table_text(state_engine.metrics)
+        logging.info("\n".join(["Latencies:"] + latencies))
+        if metrics_path:
+            state_engine.metrics.save(metrics_path)
+            logging.info(f"Metrics written to {metrics_path}")
+
     except Exception as e:
         logging.debug(format_exc())
         logging.exception(e)
         logging.error(e)
 
 
+def export_main(
+    db_path: str,
+    output_dir: str,
+    export_format: str = "csv",
+    first_year: int | None = None,
+    last_year: int | None = None,
+    datasets=DATASETS,
+):
+    """
+    Export seasons of a save, all of them unless a year range is given
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s|%(levelname)s|%(module)s.%(funcName)s] %(message)s",
+    )
+    worker = DatabaseWorker(db_path=db_path, read_only=True)
+    try:
+        counts = SeasonExporter(worker, output_dir, export_format).export(
+            first_year, last_year, datasets
+        )
+    finally:
+        worker.close_session()
+    for dataset, count in counts.items():
+        logging.info(f"{dataset}: {count} rows")
+
+
 if __name__ == "__main__":
     parser = ArgumentParser("Fitba")
     options = [
         "create",
+        "export",
     ]
     parser.add_argument(
         "-m", "--mode", choices=options, default="create", help="Running mode"
     )
+    parser.add_argument(
+        "-s", "--seasons", type=int, default=3, help="Seasons to simulate"
+    )
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        help="Write latency metrics to this path, .prom/.txt for Prometheus text",
+    )
+    parser.add_argument(
+        "--event-retention",
+        type=int,
+        default=GameDBWorker.DEFAULT_EVENT_RETENTION,
+        help="Seasons of match events to keep, older seasons are summarised",
+    )
+    parser.add_argument(
+        "--archive-after",
+        type=int,
+        default=GameDBWorker.DEFAULT_ARCHIVE_AFTER,
+        help="Seasons to keep in the live database, older seasons are archived",
+    )
+    export_options = parser.add_argument_group("export")
+    export_options.add_argument("--db", default=GameDBWorker.DEFAULT_DB_PATH)
+    export_options.add_argument("--output-dir", default="var/export")
+    export_options.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export_options.add_argument(
+        "--from-season", type=int, default=None, help="First season year"
+    )
+    export_options.add_argument(
+        "--to-season", type=int, default=None, help="Last season year"
+    )
+    export_options.add_argument(
+        "--datasets", nargs="+", choices=DATASETS, default=DATASETS
+    )
     args = parser.parse_args()
 
     if args.mode:
         if args.mode == "create":
-            db_main()
+            db_main(
+                seasons=args.seasons,
+                metrics_path=args.metrics,
+                event_retention=args.event_retention,
+                archive_after=args.archive_after,
+            )
+        elif args.mode == "export":
+            export_main(
+                args.db,
+                args.output_dir,
+                args.format,
+                args.from_season,
+                args.to_season,
+                args.datasets,
+            )
         else:
             pass
@@ -132,13 +132,13 @@ class ClubWidget(GeneralGamePage):
             # self.update_data()
     
     def _get_club(self):
-        if self.game_engine.db_worker is None:
+        if self.game_engine.read_worker is None:
             club = None
         else:
-            club = self.game_engine.db_worker.get_club(self._club_id)
+            club = self.game_engine.read_worker.get_club(self._club_id)
 
             if self._club_worker is None:
-                self._club_worker = ClubWorker(self._club_id, self.game_engine.db_worker)
+                self._club_worker = ClubWorker(self._club_id, self.game_engine.read_worker)
             else:
                 self._club_worker.club_id = self._club_id
         return club
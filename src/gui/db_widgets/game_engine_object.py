@@ -1,18 +1,38 @@
+from __future__ import annotations
+from concurrent.futures import Future
+import logging
+
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
 from src.core.world_time import WEEKS_IN_YEAR
 from src.core.world_state_engine import WorldState, WorldStateEngine
+from src.core.db.async_worker import GameWorkerThread
+from src.core.db.game_worker import GameDBWorker
+from src.core.db.save_slots import SaveSlots
 
 
 class GameEngineObject(QObject):
     state_engine_changed = Signal()
     game_advanced = Signal()
+    # typed change events (src.core.game_events), delivered on this
+    # object's thread after the read snapshot has been refreshed
+    game_event = Signal(object)
+    # emitted on the game worker thread, delivered on this object's thread
+    request_done = Signal(object, object)
+    engine_event = Signal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self._state_engine: WorldStateEngine | None = None
+        self._worker_thread = GameWorkerThread()
+        self.request_done.connect(self.on_request_done)
+        self.engine_event.connect(self.on_engine_event)
+
+    @property
+    def worker_thread(self):
+        return self._worker_thread
 
     @property
     def state_engine(self):
@@ -37,67 +57,186 @@ class GameEngineObject(QObject):
             return self._state_engine.game_worker.worker
         return None
 
+    @property
+    def read_worker(self):
+        """
+        Read only worker for views, its snapshot is refreshed whenever the
+        game advances
+        """
+        if self._state_engine:
+            return self._state_engine.game_worker.read_worker
+        return None
+
     @property
     def world_time(self):
         if not self._state_engine:
             return None, None
-        return self._state_engine.world_time
+        worker = self.read_worker
+        return worker.get_current_season(), worker.get_week(worker.get_current_week())
+
+    def run_in_worker(self, funct: callable, on_done: callable | None = None):
+        """
+        Queue *funct* on the game worker thread, *on_done* is called with
+        its result on this object's thread once it has run
+        """
+        future = self._worker_thread.submit(funct)
+        future.add_done_callback(lambda f: self.request_done.emit(f, on_done))
+        return future
+
+    def on_request_done(self, future: Future, on_done: callable | None):
+        result = None
+        if future.exception() is not None:
+            logging.error(f"Game request failed: {future.exception()}")
+        else:
+            result = future.result()
+        if on_done:
+            on_done(result)
 
-    def create_new_game(self):
-        new_state_engine = WorldStateEngine()
-        if new_state_engine.state == WorldState.NewGame:
-            new_state_engine.advance_game()
-        self.state_engine = new_state_engine
+    def on_engine_event(self, event):
+        if self._state_engine:
+            self.read_worker.refresh()
+            self.game_event.emit(event)
 
-    def load_game(self):
+    def _start_engine(self, load: bool, slot: str | None = None):
         new_state_engine = WorldStateEngine()
-        new_state_engine.state = WorldState.AwaitingContinue
-        self.state_engine = new_state_engine
+        new_state_engine.events.subscribe(self.engine_event.emit)
+        if slot is not None:
+            new_state_engine.load_game(slot)
+        elif load:
+            new_state_engine.resume_game()
+        elif new_state_engine.state == WorldState.NewGame:
+            new_state_engine.advance_game()
+        return self._worker_thread.set_engine(new_state_engine).result()
+
+    def presimulate(self):
+        """
+        Queue precomputing the next matchweek on the worker thread while
+        the user looks at the current page, a Continue queued behind it
+        then only has to commit the results
+        """
+        if self._state_engine and self.state == WorldState.AwaitingContinue:
+            self.run_in_worker(self._state_engine.presimulate)
+
+    def _on_engine_started(
+        self, new_engine, on_done: callable | None, hydrate: bool = False
+    ):
+        self.state_engine = new_engine
+        if new_engine:
+            self.read_worker.refresh()
+            if hydrate:
+                # fill the tables a lazy slot load deferred, then refresh the
+                # pages that were shown without them
+                self.run_in_worker(
+                    new_engine.game_worker.ensure_hydrated,
+                    lambda _: self._on_game_advanced(None),
+                )
+            else:
+                self.presimulate()
+        if on_done:
+            on_done()
+
+    def create_new_game(self, on_done: callable | None = None):
+        return self.run_in_worker(
+            lambda: self._start_engine(load=False),
+            lambda engine: self._on_engine_started(engine, on_done),
+        )
+
+    def load_game(self, on_done: callable | None = None, slot: str | None = None):
+        """
+        Continue the last session's database, or load save *slot* into it
+        """
+        return self.run_in_worker(
+            lambda: self._start_engine(load=True, slot=slot),
+            lambda engine: self._on_engine_started(
+                engine, on_done, hydrate=slot is not None
+            ),
+        )
+
+    def save_game(self, slot: str, on_done: callable | None = None):
+        if not self._state_engine:
+            raise RuntimeError("No State Engine to save")
+        return self.run_in_worker(
+            lambda: self._state_engine.save_game(slot),
+            lambda info: on_done(info) if on_done else None,
+        )
+
+    def save_slots(self):
+        """
+        SlotInfo of the saved games, most recent first
+        """
+        if self._state_engine:
+            return self._state_engine.game_worker.save_slots.list_slots()
+        saves_dir = GameDBWorker.saves_dir_for(GameDBWorker.DEFAULT_DB_PATH)
+        return SaveSlots(saves_dir).list_slots()
 
     def close_state_engine(self):
         if self.state_engine:
             # make sure any open database session is closed to avoid
             # detached-object surprises later on and to release file locks
             try:
-                self.state_engine.game_worker.close()
+                self._worker_thread.set_engine(None).result()
             except Exception:
                 # be defensive: if something is wrong we still clear the
                 # reference so the engine can be garbage collected
                 pass
             self.state_engine = None
 
-    def advance_game(self):
+    def _on_game_advanced(self, on_done: callable | None):
+        self.read_worker.refresh()
+        self.game_advanced.emit()
+        if on_done:
+            on_done()
+        self.presimulate()
+
+    def advance_game(self, on_done: callable | None = None):
         if not self._state_engine:
             raise RuntimeError("No State Engine to advance")
-        self._state_engine.advance_game()
-        self.game_advanced.emit()
+        return self.run_in_worker(
+            self._state_engine.advance_game,
+            lambda _: self._on_game_advanced(on_done),
+        )
 
-    def advance_to_end_of_season(self):
+    def advance_to_end_of_season(self, on_done: callable | None = None):
         if not self._state_engine:
             raise RuntimeError("No State Engine to advance to end of season")
-        self._state_engine.advance_to_post_season()
-        self.game_advanced.emit()
+        return self.run_in_worker(
+            self._state_engine.advance_to_post_season,
+            lambda _: self._on_game_advanced(on_done),
+        )
 
-    def advance_to_next_week(self):
+    def advance_to_next_week(self, on_done: callable | None = None):
         if not self._state_engine:
             raise RuntimeError("No State Engine to advance to end of season")
         if self.world_time[1].week_num < WEEKS_IN_YEAR:
-            self._state_engine.advance_to_new_week()
-            self.game_advanced.emit()
+            return self.run_in_worker(
+                self._state_engine.advance_to_new_week,
+                lambda _: self._on_game_advanced(on_done),
+            )
+        if on_done:
+            on_done()
 
     @property
     def is_active(self):
         return self._state_engine is not None
 
+    @property
+    def metrics(self):
+        """
+        Latency metrics of the state engine, recorded on the worker thread
+        """
+        if self._state_engine:
+            return self._state_engine.metrics
+        return None
+
     def current_fixtures(self):
         if not self._state_engine:
             raise RuntimeError("No State Engine to get current fixtures")
 
-        return self._state_engine.game_worker.current_fixtures()
+        return self.read_worker.get_fixtures_for_current_week()
 
     def current_result_fixtures(self):
         if not self._state_engine:
             raise RuntimeError("No State Engine to get current result")
 
-        results = self._state_engine.game_worker.current_results()
+        results = self.read_worker.get_results_for_current_week()
         return [r.fixture for r in results]
@@ -39,6 +39,10 @@ class TwinLeagueView(QFrame):
         for v in [self._league_1, self._league_2]:
             v.clear()
 
+    def on_game_event(self, event):
+        for v in [self._league_1, self._league_2]:
+            v.on_game_event(event)
+
     def update_leagues(self, league_1, league_2, season):
         views = [self._league_1, self._league_2]
         for v in views:
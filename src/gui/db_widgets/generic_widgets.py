@@ -7,6 +7,7 @@ from PySide6.QtWidgets import *
 
 
 from .game_engine_object import GameEngineObject
+from .table_models import LatencyTableModel
 
 
 class TitleLabel(QLabel):
@@ -146,6 +147,42 @@ class LogWindow(QTextEdit):
         self.moveCursor(QTextCursor.End)
 
 
+class LatencyView(QTableView):
+    """
+    Per state and per game worker method latencies of the game engine,
+    refreshed while visible
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, game_engine: GameEngineObject, parent=None):
+        super().__init__(parent=parent)
+        self._game_engine = game_engine
+        self._model = LatencyTableModel(self)
+        self.setModel(self._model)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.verticalHeader().hide()
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        metrics = self._game_engine.metrics
+        self._model.set_rows(metrics.rows() if metrics else [])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+
 class GeneralGamePage(QWidget):
     def __init__(self, game_engine: GameEngineObject, parent=None):
         super().__init__(parent=parent)
@@ -3,12 +3,16 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
+from sqlalchemy.orm import object_session
+
 
 from src.core.db.models import SeasonDB, LeagueDB
-from src.core.db.league_db_functions import get_league_table_data
+from src.core.db.league_db_functions import get_league_table_rows
+from src.core.game_events import GameEvent, StandingsChanged
 
 
 from .generic_widgets import TitleLabel
+from .table_models import LeagueTableModel
 
 
 class LeagueView(QFrame):
@@ -16,42 +20,55 @@ class LeagueView(QFrame):
         super().__init__(parent=parent)
         self.setFrameStyle(QFrame.StyledPanel | QFrame.Plain)
 
+        self._session = None
+        self._league_id = None
+        self._season_id = None
+
         self.title = TitleLabel("", 12)
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setFont(QFont("DejaVu Sans", 12))
+        self._model = LeagueTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self._model)
+        self.table_view.setFont(QFont("DejaVu Sans", 12))
+        self.table_view.verticalHeader().hide()
+        self.table_view.setSelectionMode(QAbstractItemView.NoSelection)
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.title, 0, Qt.AlignHCenter | Qt.AlignTop)
-        layout.addWidget(self.tree_widget, 100)
+        layout.addWidget(self.table_view, 100)
+
+    @property
+    def league_id(self):
+        return self._league_id
 
     def set_league(self, league: LeagueDB, season: SeasonDB):
         self.title.setText(league.name)
+        self._session = object_session(league)
+        self._league_id = league.id
+        self._season_id = season.id
+        self.refresh()
+        self.table_view.resizeColumnsToContents()
 
-        table_data = get_league_table_data(league, season)
-        self.tree_widget.clear()
-        self.tree_widget.setHeaderLabels(
-            ["Pos", "Club", "Ply", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+    def refresh(self):
+        """
+        Re-read the standings, only rows that changed are repainted
+        """
+        if self._session is None:
+            return
+        self._model.set_rows(
+            get_league_table_rows(self._session, self._league_id, self._season_id)
         )
-        for ix, d in enumerate(table_data):
-            pos = ix + 1
-            item = QTreeWidgetItem(
-                [
-                    str(pos),
-                    d["club"].name,
-                    str(d["ply"]),
-                    str(d["w"]),
-                    str(d["d"]),
-                    str(d["l"]),
-                    str(d["gf"]),
-                    str(d["ga"]),
-                    str(d["gd"]),
-                    str(d["pts"]),
-                ]
-            )
-            self.tree_widget.addTopLevelItem(item)
-
-        for c in range(self.tree_widget.columnCount()):
-            self.tree_widget.resizeColumnToContents(c)
+
+    def on_game_event(self, event: GameEvent):
+        if (
+            isinstance(event, StandingsChanged)
+            and event.competition_id == self._league_id
+            and event.season_id == self._season_id
+        ):
+            self.refresh()
 
     def clear(self):
         self.title.clear()
+        self._model.clear()
+        self._session = None
+        self._league_id = None
+        self._season_id = None
@@ -0,0 +1,244 @@
+from PySide6.QtCore import Qt
+from PySide6.QtCore import *
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Table model over a list of row tuples.
+
+    set_rows() with the same row keys in the same order only signals the
+    rows whose values changed, so views repaint those rows instead of
+    being reset.
+    """
+
+    HEADERS = []
+    ALIGNMENTS = {}
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self._rows = []
+        self._row_index = {}
+
+    def row_key(self, row):
+        return row[0]
+
+    def display(self, row, column: int):
+        return row[column]
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self.display(self._rows[index.row()], index.column())
+            return "" if value is None else str(value)
+        if role == Qt.TextAlignmentRole:
+            return self.ALIGNMENTS.get(index.column(), Qt.AlignCenter)
+        if role == Qt.UserRole:
+            return self.row_key(self._rows[index.row()])
+        return None
+
+    def clear(self):
+        self.set_rows([])
+
+    def set_rows(self, rows):
+        rows = list(rows)
+        keys = [self.row_key(r) for r in rows]
+        if keys != [self.row_key(r) for r in self._rows]:
+            self.beginResetModel()
+            self._rows = rows
+            self._row_index = {key: ix for ix, key in enumerate(keys)}
+            self.endResetModel()
+            return
+
+        for ix, row in enumerate(rows):
+            if tuple(row) != tuple(self._rows[ix]):
+                self._rows[ix] = row
+                self.dataChanged.emit(
+                    self.index(ix, 0), self.index(ix, self.columnCount() - 1)
+                )
+
+    def update_row(self, key, row):
+        ix = self._row_index.get(key)
+        if ix is None:
+            return False
+        self._rows[ix] = row
+        self.dataChanged.emit(self.index(ix, 0), self.index(ix, self.columnCount() - 1))
+        return True
+
+
+class PagedRowTableModel(RowTableModel):
+    """
+    Row model filled lazily from a select statement a page at a time.
+
+    Views call fetchMore as they scroll, so only the pages that have been
+    shown are read and held regardless of how many rows the query has.
+    """
+
+    PAGE_SIZE = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self._session = None
+        self._stmt = None
+        self._exhausted = True
+
+    def set_query(self, session, stmt):
+        self.beginResetModel()
+        self._session = session
+        self._stmt = stmt
+        self._rows = []
+        self._row_index = {}
+        self._exhausted = stmt is None
+        self.endResetModel()
+        self.fetchMore()
+
+    def clear(self):
+        self.set_query(None, None)
+
+    def refresh(self):
+        """
+        Re-run the query for the pages already loaded, patching changed rows
+        """
+        if self._stmt is None:
+            return
+        loaded = max(len(self._rows), self.PAGE_SIZE)
+        rows = self._session.execute(self._stmt.limit(loaded)).all()
+        self._exhausted = len(rows) < loaded
+        self.set_rows(tuple(r) for r in rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        rows = self._session.execute(
+            self._stmt.limit(self.PAGE_SIZE).offset(len(self._rows))
+        ).all()
+        self._exhausted = len(rows) < self.PAGE_SIZE
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for ix, row in enumerate(rows):
+            row = tuple(row)
+            self._rows.append(row)
+            self._row_index[self.row_key(row)] = first + ix
+        self.endInsertRows()
+
+
+class LeagueTableModel(RowTableModel):
+    """
+    League StandingRow read models, keyed by position so a changed table
+    only repaints the positions that moved
+    """
+
+    HEADERS = ["Pos", "Club", "Ply", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+    ALIGNMENTS = {1: Qt.AlignLeft | Qt.AlignVCenter}
+    _COLUMNS = ["position", "name", "ply", "w", "d", "l", "gf", "ga", "gd", "pts"]
+
+    def row_key(self, row):
+        return row.position
+
+    def display(self, row, column: int):
+        return getattr(row, self._COLUMNS[column])
+
+
+class FixtureListModel(PagedRowTableModel):
+    """
+    A matchweek's fixtures, paged from current_week_fixture_rows_select
+    rows, results are patched in by fixture id as they are added
+    """
+
+    HEADERS = ["Comp", "Home", "", "Away"]
+    ALIGNMENTS = {
+        1: Qt.AlignRight | Qt.AlignVCenter,
+        3: Qt.AlignLeft | Qt.AlignVCenter,
+    }
+
+    def display(self, row, column: int):
+        _, short_name, comp_round, home, home_score, away_score, away, played = row
+        if column == 0:
+            return f"{short_name} ({comp_round})"
+        if column == 1:
+            return home
+        if column == 2:
+            return f"{home_score} - {away_score}" if played else "v"
+        return away
+
+    def set_results(self, scores: dict):
+        """
+        Patch the scores of the loaded fixtures in *scores*, {fixture_id:
+        (home, away)}, returns the number of rows updated. Pages not yet
+        loaded read the results when fetched.
+        """
+        updated = 0
+        for fixture_id, (home_score, away_score) in scores.items():
+            ix = self._row_index.get(fixture_id)
+            if ix is None:
+                continue
+            row = self._rows[ix]
+            updated += self.update_row(
+                fixture_id, row[:4] + (home_score, away_score, row[6], True)
+            )
+        return updated
+
+    @property
+    def results_count(self):
+        return sum(1 for r in self._rows if r[7])
+
+
+class ClubListModel(PagedRowTableModel):
+    """
+    Numbered club names paged from club_rows_select rows
+    """
+
+    HEADERS = ["Club"]
+    ALIGNMENTS = {0: Qt.AlignLeft | Qt.AlignVCenter}
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return str(index.row() + 1).ljust(8) + self._rows[index.row()][1]
+        return super().data(index, role)
+
+
+class LatencyTableModel(RowTableModel):
+    """
+    LatencyMetrics.rows(), keyed by metric and name, times shown in ms
+    """
+
+    HEADERS = ["Metric", "Name", "Count", "p50 ms", "p95 ms", "max ms"]
+    ALIGNMENTS = {
+        0: Qt.AlignLeft | Qt.AlignVCenter,
+        1: Qt.AlignLeft | Qt.AlignVCenter,
+        2: Qt.AlignRight | Qt.AlignVCenter,
+    }
+
+    def row_key(self, row):
+        return row[0], row[1]
+
+    def display(self, row, column: int):
+        if column < 3:
+            return row[column]
+        return f"{row[column] * 1000:.2f}"
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.TextAlignmentRole:
+            return self.ALIGNMENTS.get(index.column(), Qt.AlignRight | Qt.AlignVCenter)
+        return super().data(index, role)
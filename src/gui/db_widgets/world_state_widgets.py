@@ -1,3 +1,4 @@
+from __future__ import annotations
 from PySide6.QtCore import Qt
 from PySide6.QtCore import *
 from PySide6.QtGui import *
@@ -7,6 +8,7 @@ from PySide6.QtWidgets import *
 from .game_engine_object import GameEngineObject
 from .generic_widgets import TitleLabel
 from .fixture_result_widgets import FixtureResultList
+from .table_models import FixtureListModel
 
 
 class BaseGameWidget(QWidget):
@@ -31,13 +33,19 @@ class PlaceholderGamePage(BaseGameWidget):
 
 
 class BaseFixturesWidget(BaseGameWidget):
-    def __init__(self, state_text: str, parent=None):
+    def __init__(
+        self, state_text: str, model: FixtureListModel | None = None, parent=None
+    ):
         super().__init__(parent=parent)
-        self._fixture_list = FixtureResultList()
+        self._fixture_list = FixtureResultList(model)
 
         layout = QVBoxLayout(self)
         layout.addWidget(TitleLabel(state_text), 0, Qt.AlignHCenter | Qt.AlignTop)
         layout.addWidget(self._fixture_list, 100)
 
-    def set_fixtures(self, fixtures):
-        self._fixture_list.set_fixtures(fixtures)
+    @property
+    def model(self):
+        return self._fixture_list.model
+
+    def set_query(self, session, stmt):
+        self._fixture_list.set_query(session, stmt)
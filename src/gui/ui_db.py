@@ -10,12 +10,20 @@ from PySide6.QtWidgets import *
 from src.core.constants import APP_TITLE, version_str
 
 from src.core.world_state_engine import WorldState
+from src.core.game_events import (
+    GameEvent,
+    SeasonStarted,
+    WeekAdvanced,
+    ResultsAdded,
+    SquadsChanged,
+)
 
 from src.gui.db_widgets.game_engine_object import GameEngineObject
 
 from src.gui.db_widgets.generic_widgets import (
     TitleLabel, 
     LogWindow, 
+    LatencyView,
     GeneralGamePage
 )
 
@@ -29,6 +37,7 @@ from src.gui.db_widgets.world_state_widgets import (
 )
 
 from src.gui.db_widgets.game_widgets import DateLabel, ContinueBtn, TwinLeagueView
+from src.gui.db_widgets.table_models import FixtureListModel, ClubListModel
 
 from .utils import set_white_bg
 from .generic_widgets import BusyPage
@@ -51,18 +60,29 @@ class HomePage(GeneralGamePage):
         self._league_views.clear()
         if self.game_engine.is_active:
             season = self.game_engine.world_time[0]
-            leagues = self.game_engine.db_worker.get_leagues()
+            leagues = self.game_engine.read_worker.get_leagues()
             if not season:
                 raise RuntimeError("Invalid Season")
             self._league_views.update_leagues(leagues[0], leagues[1], season)
 
+    def on_game_event(self, event: GameEvent):
+        if isinstance(event, SeasonStarted):
+            self.update_data()
+        else:
+            self._league_views.on_game_event(event)
+
 
 class ClubPage(GeneralGamePage):
     def __init__(self, game_engine: GameEngineObject, parent=None):
         super().__init__(game_engine, parent=parent)
 
-        self._club_list = QListWidget()
-        self._club_list.currentItemChanged.connect(self.on_current_item_changed)
+        self._club_model = ClubListModel(self)
+        self._club_list = QListView()
+        self._club_list.setUniformItemSizes(True)
+        self._club_list.setModel(self._club_model)
+        self._club_list.selectionModel().currentChanged.connect(
+            self.on_current_item_changed
+        )
         self._current_club = 0
 
         self._club_widget = ClubWidget(self.game_engine)
@@ -80,7 +100,7 @@ class ClubPage(GeneralGamePage):
         self._current_club = new_club_id
 
     def clear(self):
-        self._club_list.clear()
+        self._club_model.clear()
         self._club_widget.club_id = None
 
     def update_club_data(self):
@@ -90,13 +110,9 @@ class ClubPage(GeneralGamePage):
     def update_data(self):
         print("Update date for ClubPage")
         if self.game_engine.is_active:
-            if self._club_list.count() == 0:
-                clubs = self.game_engine.db_worker.get_clubs()
-                for ix, c in enumerate(clubs):
-                    text = str(ix + 1).ljust(8) + c.name
-                    item = QListWidgetItem(text)
-                    item.setData(Qt.UserRole, c.id)
-                    self._club_list.addItem(item)
+            if self._club_model.rowCount() == 0:
+                worker = self.game_engine.read_worker
+                self._club_model.set_query(worker.session, worker.club_rows_select())
 
             if self.current_club is not None:
                 self.update_club_data()
@@ -112,6 +128,10 @@ class ClubPage(GeneralGamePage):
         self.current_club = data
         self.update_club_data()
 
+    def on_game_event(self, event: GameEvent):
+        if isinstance(event, SquadsChanged) and self.current_club in event.club_ids:
+            self.update_club_data()
+
 
 class NewSeasonWidget(PlaceholderGamePage):
     def __init__(self, parent=None):
@@ -133,15 +153,15 @@ class PostSeasonWidget(BaseGameWidget):
         self._league_views.clear()
         if game_engine.is_active:
             season = game_engine.world_time[0]
-            leagues = game_engine.db_worker.get_leagues()
+            leagues = game_engine.read_worker.get_leagues()
             if not season:
                 raise RuntimeError("Invalid Season")
             self._league_views.update_leagues(leagues[0], leagues[1], season)
 
 
 class PreFixturesWidget(BaseFixturesWidget):
-    def __init__(self, parent=None):
-        super().__init__("Pre Fixtures", parent=parent)
+    def __init__(self, model: FixtureListModel | None = None, parent=None):
+        super().__init__("Pre Fixtures", model, parent=parent)
 
 
 class ProcessingFixturesWidget(PlaceholderGamePage):
@@ -150,14 +170,15 @@ class ProcessingFixturesWidget(PlaceholderGamePage):
 
 
 class PostFixturesWidget(BaseFixturesWidget):
-    def __init__(self, parent=None):
-        super().__init__("Post Fixtures", parent=parent)
+    def __init__(self, model: FixtureListModel | None = None, parent=None):
+        super().__init__("Post Fixtures", model, parent=parent)
 
 
 class AwaitingContinueWidget(BaseGameWidget):
     def __init__(self, game_engine: GameEngineObject, parent=None):
         super().__init__(parent=parent)
         self._game_engine = game_engine
+        self._populated = False
 
         self._nav_frame = QFrame()
         self._nav_frame.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
@@ -196,14 +217,27 @@ class AwaitingContinueWidget(BaseGameWidget):
         self._view_stack.setCurrentWidget(self._pages["home"])
 
     def on_club_clicked(self):
+        self._pages["club"].update_data()
         self._view_stack.setCurrentWidget(self._pages["club"])
 
     def update_data(self, game_engine: GameEngineObject):
+        # pages are loaded once, after that change events patch them
+        if self._populated:
+            return
         print("Update date for AwaitingContinueWidget")
 
         for v in self._pages.values():
             if isinstance(v, GeneralGamePage):
                 v.update_data()
+        self._populated = True
+
+    def reset(self):
+        self._populated = False
+
+    def on_game_event(self, event: GameEvent):
+        if self._populated:
+            self._pages["home"].on_game_event(event)
+            self._pages["club"].on_game_event(event)
 
 
 class DBMainGameView(QWidget):
@@ -211,6 +245,7 @@ class DBMainGameView(QWidget):
     goto_end_of_season = Signal(name="goto end of season")
     goto_next_week = Signal(name="goto next week")
     main_menu = Signal(name="main_menu")
+    save_game = Signal(name="save_game")
 
     def __init__(self, game_engine: GameEngineObject, parent=None):
         super().__init__(parent=parent)
@@ -218,14 +253,20 @@ class DBMainGameView(QWidget):
         self._game_engine = game_engine
         self._game_engine.state_engine_changed.connect(self.on_state_engine_changed)
         self._game_engine.game_advanced.connect(self.on_game_advanced)
+        self._game_engine.game_event.connect(self.on_game_event)
+
+        # the week's fixtures, shared by the pre and post fixture pages and
+        # patched with results as they are added
+        self._fixtures_model = FixtureListModel(self)
+        self._fixtures_stale = True
 
         self._pages = {
             "blank": BlankGameWidget(),
             "new_season": NewSeasonWidget(),
             "post_season": PostSeasonWidget(),
-            "pre_fixtures": PreFixturesWidget(),
+            "pre_fixtures": PreFixturesWidget(self._fixtures_model),
             "processing_fixtures": ProcessingFixturesWidget(),
-            "post_fixtures": PostFixturesWidget(),
+            "post_fixtures": PostFixturesWidget(self._fixtures_model),
             "awaiting_continue": AwaitingContinueWidget(self._game_engine),
         }
 
@@ -246,6 +287,9 @@ class DBMainGameView(QWidget):
         self._main_menu_btn = QPushButton("Main Menu")
         self._main_menu_btn.clicked.connect(self.main_menu)
 
+        self._save_btn = QPushButton("Save")
+        self._save_btn.clicked.connect(self.save_game)
+
         self._continue_btn = ContinueBtn()
         self._continue_btn.clicked.connect(self.continue_game)
 
@@ -269,6 +313,7 @@ class DBMainGameView(QWidget):
         self.top_bar_frame.setFrameStyle(QFrame.StyledPanel | QFrame.Sunken)
         top_bar_layout = QHBoxLayout(self.top_bar_frame)
         top_bar_layout.addWidget(self._date_lbl, 0, Qt.AlignLeft | Qt.AlignTop)
+        top_bar_layout.addWidget(self._save_btn, 0, Qt.AlignRight | Qt.AlignTop)
         top_bar_layout.addWidget(self._main_menu_btn, 0, Qt.AlignRight | Qt.AlignTop)
 
         self.bottom_bar_frame = QFrame()
@@ -289,11 +334,29 @@ class DBMainGameView(QWidget):
         self.invalidate()
 
     def on_state_engine_changed(self):
+        self._fixtures_model.clear()
+        self._fixtures_stale = True
+        self._pages["awaiting_continue"].reset()
         self.invalidate()
 
     def on_game_advanced(self):
         self.invalidate()
 
+    def on_game_event(self, event: GameEvent):
+        if isinstance(event, ResultsAdded):
+            self._fixtures_model.set_results(event.scores)
+        elif isinstance(event, (WeekAdvanced, SeasonStarted)):
+            self._fixtures_stale = True
+        self._pages["awaiting_continue"].on_game_event(event)
+
+    def _update_fixtures(self):
+        if self._fixtures_stale:
+            worker = self._game_engine.read_worker
+            self._fixtures_model.set_query(
+                worker.session, worker.current_week_fixture_rows_select()
+            )
+            self._fixtures_stale = False
+
     def invalidate(self):
         new_page = None
         if self._game_engine.state == WorldState.NewSeason:
@@ -310,7 +373,7 @@ class DBMainGameView(QWidget):
             self.top_bar_frame.setVisible(False)
             self._extra_continue_frame.setVisible(False)
             new_page = self._pages["pre_fixtures"]
-            new_page.set_fixtures(self._game_engine.current_fixtures())
+            self._update_fixtures()
 
         elif self._game_engine.state == WorldState.ProcessingFixtures:
             self.top_bar_frame.setVisible(False)
@@ -321,7 +384,7 @@ class DBMainGameView(QWidget):
             self.top_bar_frame.setVisible(False)
             self._extra_continue_frame.setVisible(False)
             new_page = self._pages["post_fixtures"]
-            new_page.set_fixtures(self._game_engine.current_result_fixtures())
+            self._update_fixtures()
 
         elif self._game_engine.state == WorldState.AwaitingContinue:
             self.top_bar_frame.setVisible(True)
@@ -423,6 +486,7 @@ class MainView(QStackedWidget):
         self._views["main_menu"].load_game.connect(self.on_load_game)
         self._views["main_menu"].exit_game.connect(self.on_exit_game)
         self._views["game_view"].main_menu.connect(self.on_main_menu)
+        self._views["game_view"].save_game.connect(self.on_save_game)
         self._views["game_view"].advanced_game.connect(self.on_advanced_game)
         self._views["game_view"].goto_end_of_season.connect(self.on_goto_end_of_season)
         self._views["game_view"].goto_next_week.connect(self.on_goto_next_week)
@@ -432,17 +496,22 @@ class MainView(QStackedWidget):
         self.setCurrentWidget(self._views["main_menu"])
         # self.grabKeyboard()
 
+    @property
+    def game_engine_object(self):
+        return self._game_engine_object
+
     def on_state_engine_changed(self):
         sender = self.sender()
         if isinstance(sender, GameEngineObject):
             print("New State Engine!")
 
     def run_thread_function(self, funct: callable, on_done: callable, message=""):
+        """
+        Show the busy page while *funct* queues its work on the game worker
+        thread, *on_done* is called back on the GUI thread when it finishes
+        """
         self.set_busy(message)
-        thread = QThread(self)
-        thread.finished.connect(on_done)
-        thread.run = lambda: funct()
-        thread.start()
+        funct(on_done=on_done)
 
     def set_busy(self, message=""):
         self._views["busy"].set_message(message)
@@ -462,14 +531,43 @@ class MainView(QStackedWidget):
 
     def on_load_game(self):
         print("Load Game !")
+        last_session = "Last session"
+        slots = self._game_engine_object.save_slots()
+        slot = None
+        if slots:
+            items = [last_session] + [
+                f"{s.name} ({s.season} week {s.week}, {s.saved_at})" for s in slots
+            ]
+            item, ok = QInputDialog.getItem(
+                self, "Load Game", "Save slot:", items, 0, False
+            )
+            if not ok:
+                return
+            if item != last_session:
+                slot = slots[items.index(item) - 1].name
         self.run_thread_function(
-            self._game_engine_object.load_game,
+            lambda on_done: self._game_engine_object.load_game(on_done, slot=slot),
             self.on_show_game_view,
-            "Creating Game...",
+            "Loading Game...",
+        )
+
+    def on_save_game(self):
+        slots = [s.name for s in self._game_engine_object.save_slots()]
+        slot, ok = QInputDialog.getItem(
+            self, "Save Game", "Save slot:", slots or ["save"], 0, True
+        )
+        if not ok or not slot:
+            return
+        self.run_thread_function(
+            lambda on_done: self._game_engine_object.save_game(slot, on_done),
+            lambda _: self.on_show_game_view(),
+            f"Saving to {slot}...",
         )
 
     def on_exit_game(self):
         print("Exit Game !")
+        self._game_engine_object.close_state_engine()
+        self._game_engine_object.worker_thread.stop()
         if self.parent():
             self.parent().close()
         else:
@@ -540,10 +638,15 @@ class AppMainWindow(QMainWindow):
         self.setCentralWidget(self._main_view_stack)
 
         self._log_window = LogWindow(pass_to_console=True)
+        self._latency_view = LatencyView(self._main_view_stack.game_engine_object)
+
+        self._log_tabs = QTabWidget()
+        self._log_tabs.addTab(self._log_window, "Log")
+        self._log_tabs.addTab(self._latency_view, "Latency")
 
         self._log_docked_widget = QDockWidget("Log")
         # self._log_docked_widget.setFeatures(QDockWidget.DockWidgetClosable | QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
-        self._log_docked_widget.setWidget(self._log_window)
+        self._log_docked_widget.setWidget(self._log_tabs)
         self._log_docked_widget.setAllowedAreas(Qt.BottomDockWidgetArea)
         self._log_docked_widget.hide()
 
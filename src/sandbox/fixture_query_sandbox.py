@@ -0,0 +1,147 @@
+import logging
+from os.path import exists
+from time import perf_counter
+
+from sqlalchemy import select
+
+
+from src.core.db.models import FixtureDB, ResultDB
+from src.core.db.league_db_functions import get_league_table_data
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+SANDBOX_DB_PATH = "var/sandbox_seasons.db"
+
+
+def create_save(db_path: str, seasons: int):
+    """
+    Play *seasons* full seasons headless into a new save at *db_path*
+    """
+    engine = WorldStateEngine(db_path=db_path)
+    engine.advance_game()
+    for _ in range(seasons):
+        engine.advance_game()
+        engine.advance_to_post_season()
+        engine.advance_game()
+    while engine.state != WorldState.AwaitingContinue:
+        engine.advance_game()
+    return engine
+
+
+def week_fixtures_exists(session, season_id, week):
+    return session.scalars(
+        select(FixtureDB)
+        .where(FixtureDB.season_id == season_id)
+        .where(FixtureDB.season_week == week)
+        .where(FixtureDB.result == None)
+    ).all()
+
+
+def week_fixtures_played(session, season_id, week):
+    return session.scalars(
+        select(FixtureDB)
+        .where(FixtureDB.season_id == season_id)
+        .where(FixtureDB.season_week == week)
+        .where(FixtureDB.played == False)
+    ).all()
+
+
+def week_results_exists(session, season_id, week):
+    fixtures = session.scalars(
+        select(FixtureDB)
+        .where(FixtureDB.season_id == season_id)
+        .where(FixtureDB.season_week == week)
+        .where(FixtureDB.result != None)
+    ).all()
+    return [(f.id, f.result.home_score, f.result.away_score) for f in fixtures]
+
+
+def week_results_played(session, season_id, week):
+    return session.execute(
+        select(FixtureDB.id, FixtureDB.home_score, FixtureDB.away_score)
+        .where(FixtureDB.season_id == season_id)
+        .where(FixtureDB.season_week == week)
+        .where(FixtureDB.played == True)
+    ).all()
+
+
+def league_table_relationships(league, season):
+    """
+    League table the way it was built before the denormalised columns:
+    every club's full fixture history then a lazy result load per fixture
+    """
+    table = []
+    for club in league.get_clubs_for_season(season=season):
+        results = [
+            f.result
+            for f in club.home_fixtures + club.away_fixtures
+            if f.season_id == season.id
+            and f.competition_id == league.id
+            and f.result is not None
+        ]
+        table.append((club.id, len(results)))
+    return table
+
+
+def time_function(funct, *args, repeat: int = 20):
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        funct(*args)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def fixture_query_sandbox(seasons: int = 20, db_path: str = SANDBOX_DB_PATH):
+    if not exists(db_path):
+        logging.info(f"Creating {seasons} season save at {db_path}")
+        create_save(db_path, seasons)
+
+    engine = WorldStateEngine(db_path=db_path)
+    worker = engine.game_worker.worker
+    session = worker.session
+    season_ids = [s.id for s in worker.get_seasons()]
+    season = worker.get_seasons()[-2]
+    week = session.scalar(
+        select(FixtureDB.season_week).where(FixtureDB.season_id == season.id)
+    )
+    league = worker.get_leagues()[0]
+    print(
+        f"Seasons: {len(season_ids)}, fixtures: {len(session.scalars(select(FixtureDB.id)).all())}, "
+        f"results: {len(session.scalars(select(ResultDB.id)).all())}"
+    )
+
+    comparisons = [
+        (
+            "week fixtures",
+            week_fixtures_exists,
+            week_fixtures_played,
+            (session, season.id, week),
+        ),
+        (
+            "week results",
+            week_results_exists,
+            week_results_played,
+            (session, season.id, week),
+        ),
+    ]
+    for name, old, new, args in comparisons:
+        old_t, new_t = time_function(old, *args), time_function(new, *args)
+        print(
+            f"{name.ljust(16)} EXISTS/join: {old_t * 1000:8.3f}ms  played: {new_t * 1000:8.3f}ms  x{old_t / new_t:6.1f}"
+        )
+
+    def fresh(funct):
+        # league tables walk relationships, expire so each run reloads them
+        def run(*args):
+            session.expire_all()
+            return funct(*args)
+
+        return run
+
+    old_t = time_function(fresh(league_table_relationships), league, season, repeat=5)
+    new_t = time_function(fresh(get_league_table_data), league, season, repeat=5)
+    print(
+        f"{'league table'.ljust(16)} EXISTS/join: {old_t * 1000:8.3f}ms  played: {new_t * 1000:8.3f}ms  x{old_t / new_t:6.1f}"
+    )
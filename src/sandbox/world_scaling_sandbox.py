@@ -0,0 +1,61 @@
+import logging
+from os import makedirs
+from os.path import join
+from time import perf_counter
+
+
+from src.core.world_definition import WorldDefinition
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+SANDBOX_DIR = "var/scaling"
+
+
+def time_world(world: WorldDefinition, db_path: str):
+    engine = WorldStateEngine(db_path=db_path, world_definition=world)
+    game_worker = engine.game_worker
+    timings = {}
+
+    start = perf_counter()
+    game_worker.create_new_database(delete_existing=True)
+    timings["create_db"] = perf_counter() - start
+
+    start = perf_counter()
+    game_worker.do_new_season()
+    timings["new_season"] = perf_counter() - start
+    engine.state = WorldState.AwaitingContinue
+
+    # advance to the first league week then time its matchweek
+    while not engine.results:
+        if engine.state == WorldState.ProcessingFixtures:
+            start = perf_counter()
+            engine.advance_game()
+            timings["matchweek"] = perf_counter() - start
+        else:
+            engine.advance_game()
+
+    # rollover of the part played season, standings cost does not depend
+    # on the number of weeks played
+    start = perf_counter()
+    game_worker.process_end_of_season()
+    game_worker.do_new_season()
+    timings["rollover"] = perf_counter() - start
+
+    game_worker.close()
+    return timings
+
+
+def world_scaling_sandbox(club_counts=(1000, 5000, 20000)):
+    makedirs(SANDBOX_DIR, exist_ok=True)
+    logging.getLogger().setLevel(logging.WARNING)
+    for clubs in club_counts:
+        world = WorldDefinition.pyramid_for_clubs(clubs)
+        timings = time_world(world, join(SANDBOX_DIR, f"world_{clubs}.db"))
+        print(
+            f"{world.total_clubs:6d} clubs {world.league_count:5d} leagues  "
+            + "  ".join(f"{k}: {v:7.2f}s" for k, v in timings.items())
+        )
+
+
+if __name__ == "__main__":
+    world_scaling_sandbox()
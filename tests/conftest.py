@@ -0,0 +1,21 @@
+import pytest
+
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+def advance_to_results(engine: WorldStateEngine):
+    """Advance the engine until a matchweek has been processed."""
+    engine.clear_results()
+    while not engine.results:
+        engine.advance_game()
+    return engine.results
+
+
+@pytest.fixture
+def game_engine(tmp_path):
+    """A new game advanced to the first week of its first season."""
+    engine = WorldStateEngine(db_path=str(tmp_path / "game.db"))
+    while engine.state != WorldState.AwaitingContinue:
+        engine.advance_game()
+    yield engine
+    engine.game_worker.close()
@@ -0,0 +1,149 @@
+-- Schema of a database created by the baseline models, before databases
+-- were stamped with an alembic revision (initial revision 9b64667d664e)
+
+CREATE TABLE weeks (
+	id INTEGER NOT NULL, 
+	week_num INTEGER NOT NULL, 
+	role VARCHAR(14) NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE seasons (
+	id INTEGER NOT NULL, 
+	year INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	UNIQUE (year)
+);
+
+CREATE TABLE persons (
+	id INTEGER NOT NULL, 
+	first_name VARCHAR(50) NOT NULL, 
+	last_name VARCHAR(50) NOT NULL, 
+	age INTEGER NOT NULL, 
+	personality VARCHAR(11) NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE INDEX ix_persons_last_name ON persons (last_name);
+
+CREATE INDEX ix_persons_first_name ON persons (first_name);
+
+CREATE TABLE clubs (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_clubs_name ON clubs (name);
+
+CREATE TABLE competitions (
+	id INTEGER NOT NULL, 
+	name VARCHAR(50) NOT NULL, 
+	short_name VARCHAR(6) NOT NULL, 
+	competition_type VARCHAR(8) NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_competitions_name ON competitions (name);
+
+CREATE UNIQUE INDEX ix_competitions_short_name ON competitions (short_name);
+
+CREATE TABLE league_groups (
+	id INTEGER NOT NULL, 
+	name VARCHAR(50) NOT NULL, 
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_league_groups_name ON league_groups (name);
+
+CREATE TABLE staff (
+	person_id INTEGER NOT NULL, 
+	role VARCHAR(9) NOT NULL, 
+	reputation_type VARCHAR(9) NOT NULL, 
+	ability INTEGER NOT NULL, 
+	prefered_formation VARCHAR(4) NOT NULL, 
+	PRIMARY KEY (person_id), 
+	UNIQUE (person_id), 
+	FOREIGN KEY(person_id) REFERENCES persons (id)
+);
+
+CREATE TABLE players (
+	person_id INTEGER NOT NULL, 
+	position VARCHAR(10) NOT NULL, 
+	ability INTEGER NOT NULL, 
+	PRIMARY KEY (person_id), 
+	UNIQUE (person_id), 
+	FOREIGN KEY(person_id) REFERENCES persons (id)
+);
+
+CREATE TABLE contracts (
+	person_id INTEGER NOT NULL, 
+	club_id INTEGER, 
+	expiry_date INTEGER NOT NULL, 
+	wage INTEGER NOT NULL, 
+	contract_type VARCHAR(15) NOT NULL, 
+	PRIMARY KEY (person_id), 
+	UNIQUE (person_id), 
+	FOREIGN KEY(person_id) REFERENCES persons (id), 
+	FOREIGN KEY(club_id) REFERENCES clubs (id)
+);
+
+CREATE TABLE leagues (
+	id INTEGER NOT NULL, 
+	league_group_id INTEGER NOT NULL, 
+	league_ranking INTEGER NOT NULL, 
+	required_teams INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(id) REFERENCES competitions (id), 
+	FOREIGN KEY(league_group_id) REFERENCES league_groups (id)
+);
+
+CREATE TABLE cups (
+	id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(id) REFERENCES competitions (id)
+);
+
+CREATE TABLE competition_registry (
+	id INTEGER NOT NULL, 
+	season_id INTEGER NOT NULL, 
+	competition_id INTEGER NOT NULL, 
+	club_id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(season_id) REFERENCES seasons (id), 
+	FOREIGN KEY(competition_id) REFERENCES competitions (id), 
+	FOREIGN KEY(club_id) REFERENCES clubs (id)
+);
+
+CREATE TABLE fixtures (
+	id INTEGER NOT NULL, 
+	home_club_id INTEGER NOT NULL, 
+	away_club_id INTEGER NOT NULL, 
+	competition_id INTEGER NOT NULL, 
+	competition_round INTEGER NOT NULL, 
+	season_id INTEGER NOT NULL, 
+	season_week INTEGER NOT NULL, 
+	fixture_type VARCHAR(20) NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(home_club_id) REFERENCES clubs (id), 
+	FOREIGN KEY(away_club_id) REFERENCES clubs (id), 
+	FOREIGN KEY(competition_id) REFERENCES competitions (id), 
+	FOREIGN KEY(season_id) REFERENCES seasons (id)
+);
+
+CREATE TABLE world (
+	id INTEGER NOT NULL, 
+	season_id INTEGER, 
+	current_week INTEGER NOT NULL, 
+	game_seed INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(season_id) REFERENCES seasons (id)
+);
+
+CREATE TABLE results (
+	id INTEGER NOT NULL, 
+	home_score INTEGER NOT NULL, 
+	away_score INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(id) REFERENCES fixtures (id)
+);
@@ -0,0 +1,75 @@
+import asyncio
+
+from src.core.db.async_worker import GameWorkerThread
+from src.core.db import utils
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+def test_game_worker_thread(tmp_path):
+    worker_thread = GameWorkerThread(
+        WorldStateEngine(db_path=str(tmp_path / "game.db"))
+    )
+
+    async def play():
+        state = None
+        while state != WorldState.AwaitingContinue:
+            state = await worker_thread.advance_game()
+
+        league = worker_thread.call(
+            lambda: worker_thread.engine.game_worker.worker.get_leagues()[0]
+        )
+        engine = worker_thread.engine
+        week = worker_thread.call(lambda: engine.world_time[1].week_num)
+        order = []
+
+        def advance():
+            engine.advance_to_new_week()
+            order.append("advance")
+
+        def read_week():
+            order.append("read")
+            return engine.world_time[1].week_num
+
+        # reads queued behind a write run after it, in order, and see its
+        # result
+        advance_done = asyncio.wrap_future(worker_thread.submit(advance))
+        week_read = asyncio.wrap_future(worker_thread.submit(read_week))
+        table, club = await asyncio.gather(
+            worker_thread.get_league_table(league.id),
+            worker_thread.get_club(1),
+        )
+        await advance_done
+        assert await week_read == week + 1
+        assert order == ["advance", "read"]
+        return league, table, club
+
+    league, table, club = asyncio.run(play())
+    assert [r.position for r in table] == list(range(1, league.required_teams + 1))
+    assert club.id == 1
+    assert all(c.person is not None for c in club.contracts)
+
+    worker_thread.stop()
+    assert not worker_thread.is_running
+
+
+def test_get_club_reuses_the_read_engine(tmp_path, monkeypatch):
+    worker_thread = GameWorkerThread(
+        WorldStateEngine(db_path=str(tmp_path / "game.db"))
+    )
+    try:
+        worker_thread.call(worker_thread.engine.advance_game)
+        created = []
+        create_engine = utils.create_engine
+        monkeypatch.setattr(
+            utils,
+            "create_engine",
+            lambda *args, **kwargs: (
+                created.append(args) or create_engine(*args, **kwargs)
+            ),
+        )
+        for _ in range(3):
+            assert asyncio.run(worker_thread.get_club(1)).id == 1
+        # at most the shared read engine, not an engine per call
+        assert len(created) <= 1
+    finally:
+        worker_thread.stop()
@@ -0,0 +1,23 @@
+from benchmarks.run_benchmarks import compare
+
+
+def _results(**timings):
+    return {"results": {"small": {"clubs": 90, "leagues": 2, **timings}}}
+
+
+def test_compare_flags_slow_cases():
+    baseline = _results(create_db=1.0, matchweek=0.1)
+    results = _results(create_db=1.5, matchweek=0.11)
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert [(size, case) for size, case, *_ in regressions] == [("small", "create_db")]
+
+
+def test_compare_ignores_noise_and_changed_worlds():
+    baseline = _results(league_tables=0.001)
+    # 5x slower but within the noise floor
+    assert not compare(_results(league_tables=0.005), baseline)
+
+    resized = {"results": {"small": {"clubs": 120, "leagues": 2, "league_tables": 9.0}}}
+    assert not compare(resized, baseline)
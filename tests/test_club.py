@@ -0,0 +1,16 @@
+from src.core.club import ClubNameGenerator, club_names
+
+
+def test_club_names_unique_and_deterministic():
+    names = club_names(5000, seed=42)
+    assert len(set(names)) == 5000
+    assert names == club_names(5000, seed=42)
+    assert names != club_names(5000, seed=43)
+
+
+def test_club_name_generator_avoids_used_names():
+    used = set(club_names(100, seed=1))
+    generator = ClubNameGenerator(seed=1, used=used)
+    names = generator.batch(100)
+    assert not used.intersection(names)
+    assert len(generator.used) == 200
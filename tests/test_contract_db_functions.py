@@ -0,0 +1,68 @@
+from sqlalchemy import select, update
+
+from src.core.db.contract_db_functions import (
+    MIN_SQUAD_SIZE,
+    free_agents_select,
+    process_expired_contracts,
+)
+from src.core.db.models import ContractDB, PersonDB
+from src.core.game_events import SquadsChanged
+from src.core.game_types import ContractType
+from src.core.world_time import WEEKS_IN_YEAR
+
+
+def test_game_week_counts_across_seasons(game_engine):
+    worker = game_engine.game_worker.worker
+    assert worker.get_game_week() == 1
+    game_engine.advance_to_post_season()
+    game_engine.advance_game()
+    game_engine.advance_game()
+    assert worker.get_game_week() == WEEKS_IN_YEAR + 1
+
+
+def test_expired_contracts_are_renewed_or_released(game_engine):
+    session = game_engine.game_worker.worker.session
+    club_id = session.scalars(select(ContractDB.club_id)).first()
+    contracts = session.execute(
+        select(ContractDB.person_id, ContractDB.contract_type).where(
+            ContractDB.club_id == club_id
+        )
+    ).all()
+    person_ids = [person_id for person_id, _ in contracts]
+    staff_ids = {p for p, t in contracts if t == ContractType.Staff_Contract}
+    # every player old enough to be released, all expiring this week
+    session.execute(update(PersonDB).where(PersonDB.id.in_(person_ids)).values(age=40))
+    session.execute(
+        update(ContractDB)
+        .where(ContractDB.person_id.in_(person_ids))
+        .values(expiry_date=5)
+    )
+    free_agents = len(session.execute(free_agents_select()).all())
+
+    changes = process_expired_contracts(session, 5)
+    players = len(person_ids) - len(staff_ids)
+    assert len(changes.released) == players - MIN_SQUAD_SIZE
+    assert staff_ids <= set(changes.renewed)
+    assert changes.club_ids == [club_id]
+    assert len(session.execute(free_agents_select()).all()) == free_agents + len(
+        changes.released
+    )
+    expiries = session.scalars(
+        select(ContractDB.expiry_date).where(ContractDB.club_id == club_id)
+    ).all()
+    assert len(expiries) == len(staff_ids) + MIN_SQUAD_SIZE
+    assert all(e > 5 and (e - 5) % WEEKS_IN_YEAR == 0 for e in expiries)
+    assert process_expired_contracts(session, 5).renewed == []
+
+
+def test_week_advance_publishes_squad_changes(game_engine):
+    session = game_engine.game_worker.worker.session
+    session.execute(update(PersonDB).values(age=40))
+    session.execute(update(ContractDB).values(expiry_date=2))
+    session.commit()
+
+    events = []
+    game_engine.events.subscribe(events.append)
+    game_engine.advance_to_new_week()
+    changed = [e for e in events if isinstance(e, SquadsChanged)]
+    assert len(changed) == 1 and changed[0].club_ids
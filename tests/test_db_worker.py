@@ -3,6 +3,7 @@ from pathlib import Path
 import tempfile
 
 import pytest
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm.exc import DetachedInstanceError
 
 from src.core.db.game_worker import GameDBWorker
@@ -15,6 +16,8 @@ from src.core.db.models import (
 from src.core.game_types import PersonalityType, StaffRole, ReputationLevel, ContractType
 from src.core.db.utils import create_tables
 
+from conftest import advance_to_results
+
 
 def setup_basic_club(db_path: str) -> tuple[ClubDB, StaffDB]:
     """Create a simple club with one staff member and return both objects.
@@ -96,3 +99,62 @@ def test_worker_caching(tmp_path):
     gw.close()
     w3 = gw.worker
     assert w3 is not w1
+
+
+def test_club_fixtures_and_results(game_engine):
+    advance_to_results(game_engine)
+    worker = game_engine.game_worker.worker
+    season = worker.get_current_season()
+    league = worker.get_leagues()[0]
+    club = league.get_clubs_for_season(season)[0]
+
+    everything = club.home_fixtures + club.away_fixtures
+    fixtures = worker.club_fixtures(club.id, season_id=season.id)
+    assert sorted(f.id for f in fixtures) == sorted(f.id for f in everything)
+    weeks = [f.season_week for f in fixtures]
+    assert weeks == sorted(weeks)
+
+    results = worker.club_results(club.id, season.id, competition_id=league.id)
+    assert len(results) == 1
+    assert results[0].fixture.competition_id == league.id
+    assert [r.id for r in club.results(competition=league, season=season)] == [
+        r.id for r in results
+    ]
+    assert club.fixtures(season=season) == fixtures
+
+
+def test_read_worker_snapshot(game_engine):
+    game_worker = game_engine.game_worker
+    read_worker = game_worker.read_worker
+    week = read_worker.get_current_week()
+
+    # the writer commits while the reader keeps its snapshot until refreshed
+    game_worker.worker.advance_week()
+    assert game_worker.worker.get_current_week() == week + 1
+    assert read_worker.get_current_week() == week
+
+    read_worker.refresh()
+    assert read_worker.get_current_week() == week + 1
+
+    with pytest.raises(OperationalError):
+        read_worker.advance_week()
+    read_worker.refresh()
+
+
+def test_unit_of_work_rolls_back_and_expunges(game_engine):
+    game_worker = game_engine.game_worker
+    week = game_worker.worker.get_current_week()
+
+    with pytest.raises(RuntimeError):
+        with game_worker.unit_of_work() as worker:
+            worker.get_world().current_week += 10
+            raise RuntimeError("failed transition")
+    assert game_worker.worker.get_current_week() == week
+
+    season = game_worker.worker.get_current_season()
+    for _ in range(8):
+        with game_worker.unit_of_work():
+            pass
+    assert season not in game_worker.worker.session
+    # loaded attributes stay readable once detached
+    assert season.year == game_worker.worker.get_current_season().year
@@ -0,0 +1,51 @@
+from collections import Counter
+
+from src.core.db.league_db_functions import get_league_table_data
+
+
+def test_standings_match_league_table_data(game_engine):
+    game_engine.advance_to_post_season()
+    worker = game_engine.game_worker.worker
+    season = worker.get_current_season()
+    league_group = worker.get_league_groups()[0]
+
+    standings = worker.get_league_group_standings(league_group, season)
+    for league in league_group.leagues:
+        rows = [r for r in standings if r.competition_id == league.id]
+        expected = get_league_table_data(league, season)
+        assert [r.position for r in rows] == list(range(1, len(expected) + 1))
+        assert [(r.club_id, r.pts, r.gf, r.gd) for r in rows] == [
+            (d["club"].id, d["pts"], d["gf"], d["gd"]) for d in expected
+        ]
+        assert all(r.league_size == league.required_teams for r in rows)
+
+
+def test_next_season_registrations(game_engine):
+    game_engine.advance_to_post_season()
+    worker = game_engine.game_worker.worker
+    season = worker.get_current_season()
+    league_group = worker.get_league_groups()[0]
+    top, second = sorted(league_group.leagues, key=lambda lg: lg.league_ranking)
+    standings = worker.get_league_group_standings(league_group, season)
+
+    registrations = dict(worker.get_next_season_league_registrations())
+    assert Counter(registrations.values()) == {
+        lg.id: lg.required_teams for lg in [top, second]
+    }
+
+    for row in standings:
+        relegated = row.position > row.league_size - top.relegation_places
+        if row.competition_id == top.id:
+            expected = second.id if relegated else top.id
+        else:
+            expected = top.id if row.position <= second.promotion_places else second.id
+            if row.position > row.league_size - second.relegation_places:
+                expected = None
+        assert registrations.get(row.club_id) == expected
+
+    # relegated clubs are replaced from the group's non-league clubs
+    new_clubs = set(registrations) - set(r.club_id for r in standings)
+    assert len(new_clubs) == second.relegation_places
+    for club_id in new_clubs:
+        assert registrations[club_id] == second.id
+        assert worker.get_club(club_id).league_group_id == league_group.id
@@ -0,0 +1,123 @@
+from sqlalchemy import func, select
+
+from src.core.db.models import MatchEventDB, MatchEventSummaryDB
+from src.core.game_types import MatchEventType, MatchFormation, Position
+from src.core.match_events import select_team, create_match_events
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+from conftest import advance_to_results
+
+
+def test_select_team():
+    squad = [
+        (1, Position.Goalkeeper, 50),
+        (2, Position.Goalkeeper, 60),
+        (3, Position.Defender, 40),
+        (4, Position.Defender, 70),
+        (5, Position.Defender, 30),
+        (6, Position.Midfielder, 45),
+        (7, Position.Attacker, 55),
+        (8, Position.Attacker, 65),
+    ]
+    team = select_team(squad, MatchFormation.F222)
+    # one midfielder short, topped up with the best remaining player
+    assert [p[0] for p in team] == [2, 4, 3, 6, 8, 7, 1]
+
+
+def test_create_match_events():
+    home = [(i, Position.Attacker, 50) for i in range(1, 8)]
+    away = [(i, Position.Midfielder, 50) for i in range(11, 18)]
+    events = create_match_events(home, away, (3, 1))
+
+    goals = [e for e in events if e[1] == MatchEventType.Goal]
+    assert [g[0] for g in goals].count(0) == 3
+    assert [g[0] for g in goals].count(1) == 1
+
+    apps = [e for e in events if e[1] == MatchEventType.Appearance]
+    assert len(apps) == 14
+    assert all(1 <= e[4] <= 10 for e in apps)
+
+
+def test_match_events_written_per_matchweek(game_engine):
+    results = advance_to_results(game_engine)
+    worker = game_engine.game_worker.worker
+
+    fixture_events = worker.get_fixture_events(results[0].id)
+    goals = [e for e in fixture_events if e.event_type == MatchEventType.Goal.value]
+    assert len(goals) == results[0].home_score + results[0].away_score
+
+    person_id = fixture_events[-1].person_id
+    season_id = results[0].fixture.season_id
+    player_events = worker.get_player_season_events(person_id, season_id)
+    assert player_events
+    assert all(e.fixture_id == results[0].id for e in player_events)
+
+
+def test_prune_match_events(game_engine):
+    advance_to_results(game_engine)
+    worker = game_engine.game_worker.worker
+    count = worker.session.scalar(select(func.count()).select_from(MatchEventDB))
+
+    assert worker.prune_match_events(keep_seasons=1) == 0
+    assert worker.prune_match_events(keep_seasons=0) == count
+    assert worker.session.scalar(select(func.count()).select_from(MatchEventDB)) == 0
+
+    summed = worker.session.scalar(select(func.sum(MatchEventSummaryDB.count)))
+    assert summed == count
+
+
+def test_engine_prunes_match_events_at_season_end(tmp_path):
+    engine = WorldStateEngine(db_path=str(tmp_path / "game.db"), event_retention=1)
+    try:
+        while engine.state != WorldState.AwaitingContinue:
+            engine.advance_game()
+        engine.advance_to_post_season()
+        worker = engine.game_worker.worker
+        season_id = worker.get_current_season().id
+
+        def event_count():
+            return worker.session.scalar(
+                select(func.count())
+                .select_from(MatchEventDB)
+                .where(MatchEventDB.season_id == season_id)
+            )
+
+        count = event_count()
+        assert count
+
+        engine.advance_game()
+        assert engine.state == WorldState.NewSeason
+        assert worker.get_current_season().id != season_id
+        assert event_count() == 0
+        summed = worker.session.scalar(
+            select(func.sum(MatchEventSummaryDB.count)).where(
+                MatchEventSummaryDB.season_id == season_id
+            )
+        )
+        assert summed == count
+    finally:
+        engine.game_worker.close()
+
+
+def test_player_season_stats(game_engine):
+    results = advance_to_results(game_engine)
+    advance_to_results(game_engine)
+    worker = game_engine.game_worker.worker
+
+    fixture = results[0].fixture
+    scorers = worker.get_top_scorers(fixture.season_id, fixture.competition_id)
+    assert scorers
+    assert scorers[0].goals >= scorers[-1].goals
+    assert all(s.appearances <= 2 for s in scorers)
+    assert 1.0 <= scorers[0].average_rating <= 10.0
+
+    club_stats = worker.get_club_player_stats(fixture.home_club_id, fixture.season_id)
+    assert len(club_stats) >= 7
+
+    assert worker.check_player_season_stats() == []
+    worker.rebuild_player_season_stats()
+    assert worker.check_player_season_stats() == []
+
+    # rebuilding still works from the summaries once events are pruned
+    worker.prune_match_events(keep_seasons=0)
+    assert worker.check_player_season_stats() == []
@@ -0,0 +1,37 @@
+import json
+
+from src.core.metrics import GAME_WORKER_METRIC, STATE_METRIC, LatencyMetrics
+
+from conftest import advance_to_results
+
+
+def test_latency_histogram_summary():
+    metrics = LatencyMetrics()
+    for ms in range(1, 101):
+        metrics.observe(STATE_METRIC, "NewSeason", ms / 1000)
+
+    summary = metrics.summary()[STATE_METRIC]["NewSeason"]
+    assert summary["count"] == 100
+    assert summary["p50"] == 0.05
+    assert summary["p95"] == 0.095
+    assert summary["max"] == 0.1
+
+    text = metrics.to_prometheus()
+    assert "# TYPE fitba_world_state_seconds histogram" in text
+    assert 'fitba_world_state_seconds_bucket{state="NewSeason",le="0.05"} 50' in text
+    assert 'fitba_world_state_seconds_bucket{state="NewSeason",le="+Inf"} 100' in text
+    assert 'fitba_world_state_seconds_count{state="NewSeason"} 100' in text
+
+
+def test_engine_records_state_latencies(game_engine, tmp_path):
+    advance_to_results(game_engine)
+
+    summary = game_engine.metrics.summary()
+    for state in ("NewGame", "NewSeason", "ProcessingFixtures", "AwaitingContinue"):
+        assert summary[STATE_METRIC][state]["count"] >= 1
+    assert summary[GAME_WORKER_METRIC]["do_new_season"]["count"] == 1
+    assert game_engine.game_worker.metrics is game_engine.metrics
+
+    path = tmp_path / "metrics.json"
+    game_engine.metrics.save(str(path))
+    assert json.loads(path.read_text()) == json.loads(game_engine.metrics.to_json())
@@ -0,0 +1,57 @@
+import numpy as np
+from sqlalchemy import select, update
+
+from src.core.db.development_db_functions import develop_players
+from src.core.db.models import ContractDB, PersonDB, PlayerDB
+from src.core.player_development import (
+    MAX_AGE,
+    ability_curve,
+    develop,
+    initial_potentials,
+)
+from src.sandbox.player_ability_sandbox import calculate_current_ability
+
+
+def test_curve_matches_sandbox():
+    ages = np.arange(16, 41)
+    for potential in [20, 55.5, 90]:
+        curve = ability_curve(ages, np.full(len(ages), potential))
+        expected = [calculate_current_ability(a, potential) for a in ages]
+        assert np.allclose(curve, expected, atol=1)
+
+
+def test_initial_potentials_put_players_on_curve():
+    ages, abilities = np.array([18, 24, 30]), np.array([40, 60, 80])
+    potentials = initial_potentials(ages, abilities)
+    assert np.allclose(ability_curve(ages, potentials), abilities)
+
+
+def test_develop_grows_young_and_retires_old():
+    rng = np.random.default_rng(1)
+    ages = np.array([19, 37, MAX_AGE])
+    abilities, potentials, retired = develop(
+        ages, [50, 50, 50], initial_potentials(ages - 1, [50, 50, 50]), rng
+    )
+    assert abilities[0] > 50 and abilities[1] < 50
+    assert retired.tolist() == [False, True, True]
+
+
+def test_develop_players_writes_back_and_releases_retired(game_engine):
+    session = game_engine.game_worker.worker.session
+    person_id, club_id = session.execute(
+        select(ContractDB.person_id, ContractDB.club_id).join(
+            PlayerDB, PlayerDB.person_id == ContractDB.person_id
+        )
+    ).first()
+    session.execute(
+        update(PersonDB).where(PersonDB.id == person_id).values(age=MAX_AGE)
+    )
+
+    development = develop_players(session)
+    assert development.developed == len(session.scalars(select(PlayerDB)).all())
+    assert person_id in development.retired
+    assert club_id in development.club_ids
+    player = session.get(PlayerDB, person_id)
+    session.refresh(player)
+    assert player.retired and player.potential is not None
+    assert session.get(ContractDB, person_id) is None
@@ -0,0 +1,48 @@
+from src.core.db.league_db_functions import get_league_table_data, get_league_table_rows
+from src.core.db.read_models import FixtureRow, SquadPlayerRow, StandingRow
+from src.core.workers.club_worker import ClubAnalysisWorker, analyse_club_squads
+
+from conftest import advance_to_results
+
+
+def test_fixture_rows_match_entities(game_engine):
+    while not game_engine.game_worker.current_fixtures():
+        game_engine.advance_game()
+
+    fixtures = game_engine.game_worker.current_fixtures()
+    rows = game_engine.game_worker.current_fixture_rows()
+    assert all(isinstance(r, FixtureRow) for r in rows)
+    assert sorted(
+        (r.id, r.competition_id, r.home_club, r.away_club, r.played) for r in rows
+    ) == sorted(
+        (f.id, f.competition_id, f.home_club.name, f.away_club.name, f.played)
+        for f in fixtures
+    )
+
+
+def test_league_table_rows_match_table_data(game_engine):
+    advance_to_results(game_engine)
+    worker = game_engine.game_worker.worker
+    season = worker.get_current_season()
+    league = worker.get_leagues()[0]
+
+    rows = get_league_table_rows(worker.session, league.id, season.id)
+    assert all(isinstance(r, StandingRow) for r in rows)
+    assert [(r.club_id, r.pts) for r in rows] == [
+        (d["club"].id, d["pts"]) for d in get_league_table_data(league, season)
+    ]
+
+
+def test_squad_row_analysis_matches_entities(game_engine):
+    worker = game_engine.game_worker.worker
+    season = worker.get_current_season()
+    club = worker.get_clubs()[0]
+
+    expected = ClubAnalysisWorker(club).analyse(season=season)
+    squads = worker.get_squad_rows([club.id])
+    assert all(isinstance(p, SquadPlayerRow) for p in squads[club.id])
+
+    analysis = analyse_club_squads(worker, [club.id])[club.id]
+    assert analysis["squad"] == expected["squad"]
+    assert analysis["team_analysis"] == expected["team_analysis"]
+    assert analysis["best_player"].person_id == expected["best_player"].person_id
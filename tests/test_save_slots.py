@@ -0,0 +1,173 @@
+from os import listdir
+from os.path import join
+import sqlite3
+
+import pytest
+from sqlalchemy import update
+
+from src.core.db import save_slots
+from src.core.db.models import ClubDB, PlayerDB
+from src.core.db.save_slots import DEFERRED_TABLES, SaveSlots
+from src.core.db.schema_version import head_revision
+from src.core.db.utils import create_db_engine
+from src.core.world_state_engine import WorldStateEngine
+
+from conftest import advance_to_results
+
+
+def _row_counts(db_path):
+    engine = create_db_engine(db_path)
+    try:
+        with engine.connect() as conn:
+            names = conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%'"
+            ).scalars()
+            return {
+                name: conn.exec_driver_sql(f'SELECT COUNT(*) FROM "{name}"').scalar()
+                for name in names.all()
+            }
+    finally:
+        engine.dispose()
+
+
+def test_save_and_load_roundtrip(game_engine, tmp_path):
+    advance_to_results(game_engine)
+    week = game_engine.world_time[1].week_num
+    info = game_engine.save_game("first")
+    assert info.week == week
+    assert info.state == game_engine.state.name
+    saved_counts = _row_counts(game_engine.game_worker.db_path)
+    game_engine.game_worker.close()
+
+    slots = SaveSlots(game_engine.game_worker.save_slots.saves_dir)
+    assert [s.name for s in slots.list_slots()] == ["first"]
+
+    engine = WorldStateEngine(
+        db_path=str(tmp_path / "loaded.db"), saves_dir=slots.saves_dir
+    )
+    try:
+        engine.load_game("first", lazy=False)
+        assert engine.state == game_engine.state
+        assert engine.world_time[1].week_num == week
+        assert _row_counts(str(tmp_path / "loaded.db")) == saved_counts
+        engine.advance_to_new_week()
+        assert engine.world_time[1].week_num == week + 1
+    finally:
+        engine.game_worker.close()
+
+
+def test_save_is_incremental(game_engine):
+    game_engine.save_game("slot")
+    slot_dir = game_engine.game_worker.save_slots.slot_dir("slot")
+    files = set(listdir(slot_dir))
+
+    game_engine.save_game("slot")
+    assert set(listdir(slot_dir)) == files
+
+    advance_to_results(game_engine)
+    game_engine.save_game("slot")
+    changed = set(listdir(slot_dir)) - files
+    assert any(f.startswith("fixtures-") for f in changed)
+    assert not any(f.startswith("clubs-") for f in changed)
+    # old snapshots of changed tables are removed
+    assert len(listdir(slot_dir)) == len(files)
+
+
+def test_save_reads_only_changed_tables(game_engine, monkeypatch):
+    game_engine.save_game("slot")
+    read = []
+    encode_table = save_slots._encode_table
+
+    def recording_encode_table(columns, rows):
+        read.append(set(columns))
+        return encode_table(columns, rows)
+
+    monkeypatch.setattr(save_slots, "_encode_table", recording_encode_table)
+    game_engine.save_game("slot")
+    assert read == []
+
+    # same row count and max rowid, only the write tracking sees it
+    worker = game_engine.game_worker.worker
+    worker.session.execute(update(PlayerDB).values(ability=PlayerDB.ability + 1))
+    worker.session.commit()
+    game_engine.save_game("slot")
+    assert read == [set(PlayerDB.__table__.columns.keys())]
+
+    # a write the process does not see still changes the row count
+    read.clear()
+    with sqlite3.connect(game_engine.game_worker.db_path) as conn:
+        conn.execute("INSERT INTO clubs (name) VALUES ('Outsiders')")
+    conn.close()
+    game_engine.save_game("slot")
+    assert read == [set(ClubDB.__table__.columns.keys())]
+
+
+def test_lazy_load_defers_tables_until_advance(game_engine):
+    game_engine.save_game("lazy")
+    counts = _row_counts(game_engine.game_worker.db_path)
+
+    info = game_engine.load_game("lazy")
+    assert info.name == "lazy"
+    pending = game_engine.game_worker._hydration.pending
+    assert "players" in pending
+    assert set(pending) <= set(DEFERRED_TABLES)
+    assert _row_counts(game_engine.game_worker.db_path)["players"] == 0
+
+    game_engine.advance_game()
+    assert game_engine.game_worker._hydration is None
+    assert _row_counts(game_engine.game_worker.db_path)["players"] == counts["players"]
+
+
+def test_load_validates_slot_files(game_engine):
+    info = game_engine.save_game("checked")
+    assert info.revision == head_revision()
+    assert all(t["rows"] >= 0 and t["crc32"] for t in info.tables.values())
+
+    slots = game_engine.game_worker.save_slots
+    path = join(slots.slot_dir("checked"), info.tables["players"]["file"])
+    with open(path, "r+b") as f:
+        data = bytearray(f.read())
+        data[-1] ^= 0xFF
+        f.seek(0)
+        f.write(data)
+    with pytest.raises(ValueError, match="players is corrupt"):
+        game_engine.load_game("checked", lazy=False)
+
+    with open(path, "r+b") as f:
+        f.truncate(10)
+    with pytest.raises(ValueError, match="missing or truncated"):
+        slots.validate("checked")
+
+
+def _corrupt(slots, info, table):
+    path = join(slots.slot_dir(info.name), info.tables[table]["file"])
+    with open(path, "r+b") as f:
+        data = bytearray(f.read())
+        data[-1] ^= 0xFF
+        f.seek(0)
+        f.write(data)
+
+
+def test_corrupt_slot_keeps_working_database(game_engine):
+    info = game_engine.save_game("bad")
+    advance_to_results(game_engine)
+    counts = _row_counts(game_engine.game_worker.db_path)
+
+    _corrupt(game_engine.game_worker.save_slots, info, "clubs")
+    with pytest.raises(ValueError, match="clubs is corrupt"):
+        game_engine.load_game("bad", lazy=False)
+    assert _row_counts(game_engine.game_worker.db_path) == counts
+
+
+def test_failed_lazy_hydration_restores_working_database(game_engine):
+    info = game_engine.save_game("bad")
+    advance_to_results(game_engine)
+    counts = _row_counts(game_engine.game_worker.db_path)
+
+    game_engine.load_game("bad")
+    # corrupted after the load checked it, found by the deferred hydration
+    _corrupt(game_engine.game_worker.save_slots, info, "players")
+    with pytest.raises(ValueError, match="players is corrupt"):
+        game_engine.game_worker.ensure_hydrated()
+    assert _row_counts(game_engine.game_worker.db_path) == counts
@@ -0,0 +1,81 @@
+from os.path import dirname, join
+import sqlite3
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from src.core.db.models import Base
+from src.core.db.schema_version import (
+    SchemaVersionError,
+    current_revision,
+    ensure_schema,
+    head_revision,
+    matching_revision,
+)
+from src.core.db.utils import create_db_engine, create_tables
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    db_path = str(tmp_path / "schema.db")
+    create_tables(db_path)
+    engine = create_db_engine(db_path)
+    yield engine
+    engine.dispose()
+
+
+def test_new_database_is_stamped_at_head(db_engine):
+    with db_engine.connect() as conn:
+        assert current_revision(conn) == head_revision()
+        assert ensure_schema(conn) == head_revision()
+
+
+def test_unstamped_database_matching_models_is_stamped(db_engine):
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM alembic_version")
+        assert ensure_schema(conn) is None
+        assert current_revision(conn) == head_revision()
+
+
+def test_unstamped_baseline_database_is_upgraded(tmp_path):
+    db_path = str(tmp_path / "baseline.db")
+    with open(join(dirname(__file__), "data", "baseline_schema.sql")) as f:
+        schema = f.read()
+    conn = sqlite3.connect(db_path)
+    conn.executescript(schema)
+    conn.execute("INSERT INTO persons VALUES (1, 'Alf', 'Smith', 20, 'Confident')")
+    conn.execute("INSERT INTO players VALUES (1, 'Defender', 50)")
+    conn.commit()
+    conn.close()
+
+    engine = create_db_engine(db_path)
+    try:
+        with engine.connect() as conn:
+            assert matching_revision(conn) == "9b64667d664e"
+
+        create_tables(db_path, delete_existing=False)
+        with engine.connect() as conn:
+            assert current_revision(conn) == head_revision()
+            assert not compare_metadata(MigrationContext.configure(conn), Base.metadata)
+            assert conn.exec_driver_sql(
+                "SELECT ability, retired FROM players"
+            ).all() == [(50, 0)]
+    finally:
+        engine.dispose()
+
+
+def test_unstamped_database_matching_no_revision_is_rejected(db_engine):
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")
+        conn.exec_driver_sql("DROP TABLE club_modifiers")
+        conn.exec_driver_sql("CREATE TABLE unknown (id INTEGER PRIMARY KEY)")
+        with pytest.raises(SchemaVersionError):
+            ensure_schema(conn)
+
+
+def test_unknown_revision_is_rejected(db_engine):
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE alembic_version SET version_num = 'f00'")
+        with pytest.raises(SchemaVersionError):
+            ensure_schema(conn)
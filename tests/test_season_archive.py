@@ -0,0 +1,117 @@
+from os.path import exists
+
+import pytest
+from sqlalchemy import func, select
+
+from src.core.db import season_archive
+from src.core.db.models import FixtureDB, MatchEventDB
+from src.core.db.league_db_functions import get_league_table_data
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+def test_archive_closed_season(game_engine):
+    game_engine.advance_to_post_season()
+    game_worker = game_engine.game_worker
+    worker = game_worker.worker
+    season = worker.get_current_season()
+    league = worker.get_leagues()[0]
+    final_table = [
+        (d["club"].id, d["pts"]) for d in get_league_table_data(league, season)
+    ]
+    fixture_count = len(
+        worker.session.scalars(
+            select(FixtureDB).where(FixtureDB.season_id == season.id)
+        ).all()
+    )
+
+    # end of season and start of the next, the closed season can be archived
+    game_engine.advance_game()
+    game_engine.advance_game()
+
+    archiver = game_worker.archiver
+    assert archiver.archive_old_seasons(keep_seasons=0) == 1
+    assert archiver.archive_old_seasons(keep_seasons=0) == 0
+
+    archive = archiver.get_archive(season.id)
+    assert exists(archive.path)
+    assert archive.fixture_count == fixture_count
+
+    def live_count(model):
+        return worker.session.scalar(
+            select(func.count()).select_from(model).where(model.season_id == season.id)
+        )
+
+    assert live_count(FixtureDB) == 0
+    assert live_count(MatchEventDB) == 0
+
+    table = archiver.get_final_table(season.id, league.id)
+    assert [(r.club_id, r.pts) for r in table] == final_table
+    assert len(archiver.get_champions(season.id)) == len(worker.get_leagues())
+
+    results = archiver.get_archived_results(season.id)
+    assert len(results) == fixture_count
+    assert all(r.home_score is not None for r in results)
+
+    person_id = archiver.get_archived_match_events(season.id)[0].person_id
+    assert archiver.get_archived_match_events(season.id, person_id=person_id)
+
+
+def test_failed_archive_leaves_season_live(game_engine, monkeypatch):
+    game_engine.advance_to_post_season()
+    worker = game_engine.game_worker.worker
+    season_id = worker.get_current_season().id
+    game_engine.advance_game()
+    game_engine.advance_game()
+
+    def failing_delete(table):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(season_archive, "delete", failing_delete)
+    archiver = game_engine.game_worker.archiver
+    with pytest.raises(RuntimeError):
+        archiver.archive_old_seasons(keep_seasons=0)
+
+    assert archiver.get_archive(season_id) is None
+    assert [s.id for s in archiver.archivable_seasons(keep_seasons=0)] == [season_id]
+    assert worker.session.scalar(
+        select(func.count())
+        .select_from(FixtureDB)
+        .where(FixtureDB.season_id == season_id)
+    )
+
+
+def test_engine_archives_at_season_end(tmp_path):
+    engine = WorldStateEngine(
+        db_path=str(tmp_path / "game.db"),
+        saves_dir=str(tmp_path / "saves"),
+        archive_after=0,
+    )
+    try:
+        while engine.state != WorldState.AwaitingContinue:
+            engine.advance_game()
+        engine.advance_to_post_season()
+        worker = engine.game_worker.worker
+        season_id = worker.get_current_season().id
+        archiver = engine.game_worker.archiver
+
+        # the season ending is still the current one, it is archived at the
+        # end of the next
+        engine.advance_game()
+        assert archiver.get_archive(season_id) is None
+        engine.advance_game()
+        assert worker.get_current_season().id != season_id
+        engine.advance_to_post_season()
+        engine.advance_game()
+        assert engine.state == WorldState.NewSeason
+
+        archive = archiver.get_archive(season_id)
+        assert archive is not None
+        assert exists(archive.path)
+        assert not worker.session.scalar(
+            select(func.count())
+            .select_from(FixtureDB)
+            .where(FixtureDB.season_id == season_id)
+        )
+        assert archiver.get_archive(worker.get_current_season().id) is None
+    finally:
+        engine.game_worker.close()
@@ -0,0 +1,69 @@
+import csv
+import json
+from os.path import getsize
+
+import pytest
+
+from src.core.db.season_export import DATASETS, CsvExportWriter, SeasonExporter
+
+
+def _read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_live_and_archived_seasons(game_engine, tmp_path):
+    game_engine.advance_to_post_season()
+    game_engine.advance_game()
+    game_engine.advance_game()
+    worker = game_engine.game_worker.worker
+    first_year = worker.get_seasons()[0].year
+
+    exporter = SeasonExporter(worker, str(tmp_path / "live"), batch_size=100)
+    counts = exporter.export(first_year, first_year)
+    results = _read_csv(exporter.path("results"))
+    standings = _read_csv(exporter.path("standings"))
+    assert counts["results"] == len(results) > 0
+    assert all(r["season"] == str(first_year) for r in results)
+    assert [r["position"] for r in standings[:3]] == ["1", "2", "3"]
+    assert exporter.export(datasets=["squads"])["squads"] > 0
+
+    assert game_engine.game_worker.archiver.archive_old_seasons(keep_seasons=0) == 1
+    exporter = SeasonExporter(worker, str(tmp_path / "archived"), "jsonl")
+    archived_counts = exporter.export(first_year, first_year)
+    assert archived_counts["results"] == counts["results"]
+    assert archived_counts["standings"] == counts["standings"]
+    assert archived_counts["squads"] == 0
+
+    with open(exporter.path("standings")) as f:
+        rows = [json.loads(line) for line in f]
+    assert [(r["club_id"], r["pts"]) for r in rows] == [
+        (int(r["club_id"]), int(r["pts"])) for r in standings
+    ]
+
+
+def test_empty_export_writes_headers(game_engine, tmp_path):
+    worker = game_engine.game_worker.worker
+    year = worker.get_current_season().year
+
+    exporter = SeasonExporter(worker, str(tmp_path / "csv"))
+    counts = exporter.export(year + 1, year + 1)
+    assert counts == {dataset: 0 for dataset in DATASETS}
+    with open(exporter.path("results"), newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["season", "week", "fixture_id"]
+    assert len(rows) == 1
+
+    exporter = SeasonExporter(worker, str(tmp_path / "jsonl"), "jsonl")
+    exporter.export(year + 1, year + 1)
+    assert all(getsize(exporter.path(dataset)) == 0 for dataset in DATASETS)
+
+
+def test_export_writer_closes_on_error(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with pytest.raises(RuntimeError):
+        with CsvExportWriter(path, ["a", "b"]) as writer:
+            writer.write_rows([(1, 2)])
+            raise RuntimeError("export failed")
+    assert writer._file.closed
+    assert _read_csv(path) == [{"a": "1", "b": "2"}]
@@ -0,0 +1,65 @@
+import numpy as np
+from sqlalchemy import select, update
+
+from src.core.db.game_worker import create_score
+from src.core.db.models import ClubDB, ContractDB, StaffDB
+from src.core.db.staff_db_functions import (
+    NEUTRAL_MODIFIERS,
+    club_modifiers,
+    update_club_modifiers,
+)
+from src.core.game_types import StaffRole
+from src.core.player_development import develop, initial_potentials
+
+
+def test_new_game_has_club_modifiers(game_engine):
+    session = game_engine.game_worker.worker.session
+    modifiers = club_modifiers(session)
+    assert set(modifiers) == set(session.scalars(select(ClubDB.id)).all())
+
+
+def test_better_manager_raises_match_strength(game_engine):
+    session = game_engine.game_worker.worker.session
+    club_id = session.scalar(select(ClubDB.id))
+    managers = (
+        select(StaffDB.person_id)
+        .join(ContractDB, ContractDB.person_id == StaffDB.person_id)
+        .where(ContractDB.club_id == club_id)
+        .where(StaffDB.role == StaffRole.Manager)
+    )
+
+    session.execute(
+        update(StaffDB).where(StaffDB.person_id.in_(managers)).values(ability=10)
+    )
+    update_club_modifiers(session, week=1)
+    weak = club_modifiers(session, [club_id])[club_id]
+    session.execute(
+        update(StaffDB).where(StaffDB.person_id.in_(managers)).values(ability=90)
+    )
+    update_club_modifiers(session, week=1)
+    strong = club_modifiers(session, [club_id])[club_id]
+
+    assert (
+        weak.match_strength < NEUTRAL_MODIFIERS.match_strength < strong.match_strength
+    )
+    assert weak.development == strong.development
+
+
+def test_create_score_favours_stronger_side():
+    for _ in range(50):
+        home, away = create_score(1.0, 0.0)
+        assert 0 <= home <= 10 and away == 0
+        home, away = create_score()
+        assert 0 <= home <= 5 and 0 <= away <= 5
+
+
+def test_development_modifier_speeds_growth():
+    ages, abilities = np.array([19]), np.array([40])
+    potentials = initial_potentials(ages - 1, abilities)
+    slow, fast = (
+        develop(
+            ages, abilities, potentials, np.random.default_rng(1), modifiers=modifier
+        )[0]
+        for modifier in [0.8, 1.25]
+    )
+    assert slow[0] < fast[0]
@@ -0,0 +1,68 @@
+from sqlalchemy import delete, func, select
+
+from src.core.db.models import ContractDB, PlayerDB, TransferDB
+from src.core.db.transfer_db_functions import (
+    _plan_transfers,
+    _squad_gaps,
+    run_transfer_window,
+    squad_targets,
+)
+from src.core.game_types import MatchFormation, Position
+
+
+def test_squad_targets_follow_formation():
+    targets = squad_targets(MatchFormation.F321)
+    assert targets == {
+        Position.Goalkeeper: 2,
+        Position.Defender: 6,
+        Position.Midfielder: 4,
+        Position.Attacker: 2,
+    }
+
+
+def test_plan_fills_gaps_best_first_without_selling_below_target():
+    gk, df = Position.Goalkeeper, Position.Defender
+    formations = {1: MatchFormation.F222, 2: MatchFormation.F222}
+    squads = {
+        # one goalkeeper short
+        1: [(10, gk, 50, 25)] + [(11 + i, df, 50, 25) for i in range(4)],
+        # one goalkeeper over target, the weakest is for sale
+        2: [(20, gk, 90, 25), (21, gk, 80, 25), (22, gk, 70, 25)]
+        + [(23 + i, df, 50, 25) for i in range(4)],
+    }
+    gaps = _squad_gaps(squads, formations)
+    assert gaps[1] == [gk] + [Position.Midfielder] * 4 + [Position.Attacker] * 4
+
+    moves = _plan_transfers(squads, formations, {1: [gk]}, {gk: [(30, 60), (31, 75)]})
+    assert moves == [(31, None, 1)]
+
+    moves = _plan_transfers(squads, formations, {1: [gk]}, {gk: [(30, 60)]})
+    assert moves == [(22, 2, 1)]
+
+
+def test_transfer_window_fills_released_places(game_engine):
+    session = game_engine.game_worker.worker.session
+    club_id = session.scalars(select(ContractDB.club_id)).first()
+    defenders = session.scalars(
+        select(ContractDB.person_id)
+        .join(PlayerDB, PlayerDB.person_id == ContractDB.person_id)
+        .where(ContractDB.club_id == club_id)
+        .where(PlayerDB.position == Position.Defender)
+    ).all()
+    session.execute(delete(ContractDB).where(ContractDB.person_id.in_(defenders)))
+
+    window = run_transfer_window(session, week=1)
+    assert club_id in window.club_ids
+    assert session.scalar(select(func.count()).select_from(TransferDB)) >= len(
+        window.signed
+    )
+    squad_defenders = session.scalar(
+        select(func.count())
+        .select_from(ContractDB)
+        .join(PlayerDB, PlayerDB.person_id == ContractDB.person_id)
+        .where(ContractDB.club_id == club_id)
+        .where(PlayerDB.position == Position.Defender)
+    )
+    formation = game_engine.game_worker.worker.get_club_formations([club_id])
+    assert squad_defenders == squad_targets(formation.get(club_id))[Position.Defender]
+    assert club_id not in run_transfer_window(session, week=1).club_ids
@@ -0,0 +1,63 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import select, func
+
+from src.core.db.models import FixtureDB
+from src.core.world_definition import WorldDefinition
+from src.core.world_state_engine import WorldState, WorldStateEngine
+
+
+def test_default_world_definition():
+    world = WorldDefinition.load()
+    assert world.league_count == 2
+    assert WorldDefinition.from_dict(world.to_dict()) == world
+
+
+def test_world_definition_validation():
+    world = WorldDefinition.pyramid(groups=1, tiers=2, teams=4, places=1)
+    world.league_groups[0].leagues[1].promotion_places = 2
+    with pytest.raises(ValueError):
+        world.validate()
+
+    with pytest.raises(ValueError):
+        WorldDefinition.pyramid(groups=1, tiers=1, teams=5)
+
+
+def test_pyramid_for_clubs():
+    world = WorldDefinition.pyramid_for_clubs(1000)
+    assert world.league_count == 60
+    assert world.total_clubs == 996
+    assert WorldDefinition.pyramid_for_clubs(10).league_count == 5
+
+
+def test_pyramid_world(tmp_path):
+    world = WorldDefinition.pyramid(groups=2, tiers=3, teams=6, places=2)
+    engine = WorldStateEngine(db_path=str(tmp_path / "game.db"), world_definition=world)
+    while engine.state != WorldState.AwaitingContinue:
+        engine.advance_game()
+
+    worker = engine.game_worker.worker
+    season = worker.get_current_season()
+    assert len(worker.get_clubs()) == world.total_clubs
+    assert len(worker.get_leagues()) == world.league_count
+
+    registrations = worker.get_league_registrations_for_current_season()
+    assert Counter(r.competition_id for r in registrations) == {
+        lg.id: 6 for lg in worker.get_leagues()
+    }
+    for r in registrations:
+        assert r.club.league_group_id == r.competition.league_group_id
+
+    fixture_count = worker.session.scalar(
+        select(func.count(FixtureDB.id)).where(FixtureDB.season_id == season.id)
+    )
+    # double round robin of 6 clubs is 30 fixtures per league
+    assert fixture_count == world.league_count * 30
+
+    engine.advance_to_post_season()
+    engine.advance_game()
+    assert len(worker.get_league_registrations_for_current_season()) == len(
+        registrations
+    )
+    engine.game_worker.close()
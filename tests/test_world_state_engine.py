@@ -0,0 +1,104 @@
+from sqlalchemy import select, update
+
+from src.core.db.models import ContractDB, PersonDB, PlayerDB
+from src.core.db.utils import create_read_session
+from src.core.game_events import (
+    ResultsAdded,
+    SquadsChanged,
+    StandingsChanged,
+    WeekAdvanced,
+)
+from src.core.game_types import MatchEventType
+from src.core.world_state_engine import WorldState
+
+from conftest import advance_to_results
+
+
+def advance_to_fixtures(engine):
+    """Advance to the AwaitingContinue page before a matchweek."""
+    while not (
+        engine.state == WorldState.AwaitingContinue
+        and engine.game_worker.current_fixtures()
+    ):
+        engine.advance_game()
+
+
+def test_presimulated_week_is_committed(game_engine):
+    advance_to_fixtures(game_engine)
+    presimulated = game_engine.presimulate()
+    assert presimulated is not None
+    assert game_engine.presimulate() is presimulated
+
+    results = advance_to_results(game_engine)
+    assert game_engine.presimulated is None
+    assert {r.id: (r.home_score, r.away_score) for r in results} == (
+        presimulated.scores
+    )
+
+    fixture_id = results[0].id
+    events = game_engine.game_worker.worker.get_fixture_events(fixture_id)
+    expected = [e for e in presimulated.events if e["fixture_id"] == fixture_id]
+    assert len(events) == len(expected)
+    goals = [e for e in events if e.event_type == MatchEventType.Goal.value]
+    assert len(goals) == sum(presimulated.scores[fixture_id])
+
+
+def test_discarded_presimulation_is_not_used(game_engine):
+    advance_to_fixtures(game_engine)
+    game_engine.presimulate()
+    game_engine.discard_presimulation()
+    assert game_engine.presimulated is None
+
+    results = advance_to_results(game_engine)
+    assert results
+
+
+def test_change_events(game_engine):
+    events = []
+    game_engine.events.subscribe(events.append)
+    results = advance_to_results(game_engine)
+
+    assert any(isinstance(e, WeekAdvanced) for e in events)
+    added = [e for e in events if isinstance(e, ResultsAdded)]
+    assert len(added) == 1
+    assert added[0].scores == {r.id: (r.home_score, r.away_score) for r in results}
+
+    leagues = game_engine.game_worker.worker.get_leagues()
+    assert sorted(
+        e.competition_id for e in events if isinstance(e, StandingsChanged)
+    ) == sorted(lg.id for lg in leagues)
+
+    game_engine.events.unsubscribe(events.append)
+
+
+def test_events_are_published_after_commit(game_engine):
+    worker = game_engine.game_worker.worker
+    person_id, club_id = worker.session.execute(
+        select(ContractDB.person_id, ContractDB.club_id).join(
+            PlayerDB, PlayerDB.person_id == ContractDB.person_id
+        )
+    ).first()
+    # released when the contract expires next week
+    worker.session.execute(
+        update(ContractDB)
+        .where(ContractDB.person_id == person_id)
+        .values(expiry_date=worker.get_game_week() + 1)
+    )
+    worker.session.execute(
+        update(PersonDB).where(PersonDB.id == person_id).values(age=40)
+    )
+    worker.session.commit()
+
+    seen = {}
+
+    def on_event(event):
+        if isinstance(event, SquadsChanged) and club_id in event.club_ids:
+            with create_read_session(worker.db_path) as session:
+                seen["contract"] = session.get(ContractDB, person_id)
+
+    game_engine.events.subscribe(on_event)
+    game_engine.advance_to_new_week()
+    game_engine.events.unsubscribe(on_event)
+
+    assert "contract" in seen
+    assert seen["contract"] is None
@@ -0,0 +1,46 @@
+import numpy as np
+from sqlalchemy import select
+
+from src.core.db.models import ContractDB, PersonDB, PlayerDB
+from src.core.db.youth_db_functions import (
+    MAX_INTAKE,
+    MIN_INTAKE,
+    YOUTH_MAX_AGE,
+    YOUTH_MIN_AGE,
+    club_reputations,
+    intake_sizes,
+    youth_intake,
+)
+from src.core.people import PersonFactory
+
+
+def test_random_males_batch():
+    people = PersonFactory.random_males(500, min_age=16, max_age=18, average=17)
+    assert len(people) == 500
+    assert {p.age for p in people} <= {16, 17, 18}
+    assert all(p.name.first_name and p.name.last_name for p in people)
+
+
+def test_intake_sizes_follow_reputation():
+    assert intake_sizes([0, 0.5, 1]).tolist() == [MIN_INTAKE, 2, MAX_INTAKE]
+
+
+def test_youth_intake_contracts_new_players(game_engine):
+    session = game_engine.game_worker.worker.session
+    club_ids, reputations, _ = club_reputations(session)
+    assert ((reputations >= 0) & (reputations <= 1)).all()
+
+    intake = youth_intake(session, week=1)
+    assert len(intake.person_ids) == intake_sizes(reputations).sum()
+    assert intake.club_ids == sorted(club_ids.tolist())
+
+    rows = session.execute(
+        select(PersonDB.age, PlayerDB.potential, ContractDB.club_id)
+        .join(PlayerDB, PlayerDB.person_id == PersonDB.id)
+        .join(ContractDB, ContractDB.person_id == PersonDB.id)
+        .where(PersonDB.id.in_(intake.person_ids))
+    ).all()
+    assert len(rows) == len(intake.person_ids)
+    ages = np.array([age for age, _, _ in rows])
+    assert ages.min() >= YOUTH_MIN_AGE and ages.max() <= YOUTH_MAX_AGE
+    assert all(potential is not None for _, potential, _ in rows)